@@ -0,0 +1,71 @@
+"""CPU throughput of the NumPy MLP agent.
+
+Reports samples per second for:
+
+- ``act``: batched greedy inference with legal-action masking;
+- ``train_batch``: one Adam step per batch;
+- ``self-play``: act + step + TD targets + train on a NimVectorEnv.
+
+Usage::
+
+    python benchmarks/bench_mlp.py [--batch-sizes 1 64 1024 8192] [--seconds 1]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.agents import MLPAgent  # noqa: E402
+from gym_nim.encoding import action_masks  # noqa: E402
+from gym_nim.envs import NimVectorEnv  # noqa: E402
+
+
+def rate(func, samples, seconds):
+    """Samples per second of ``func`` (processing ``samples`` per call)."""
+    func()  # warm-up, sizes the buffers
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        func()
+        calls += 1
+    return calls * samples / (time.perf_counter() - start)
+
+
+def self_play(agent, envs, state):
+    obs = state['obs']
+    masks = envs.action_masks()
+    actions = agent.act(obs['board'], masks, epsilon=0.1)
+    next_obs, rewards, terminated, truncated, info = envs.step(actions)
+    targets = agent.td_targets(rewards, next_obs['board'], terminated, envs.action_masks())
+    agent.train_batch(obs['board'], actions, targets)
+    state['obs'] = next_obs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64, 1024, 8192])
+    parser.add_argument('--seconds', type=float, default=1.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>6s} {'act/s':>12s} {'train/s':>12s} {'self-play/s':>12s}")
+    for n in args.batch_sizes:
+        agent = MLPAgent(seed=0)
+        boards = rng.integers(0, 8, size=(n, 3))
+        masks = action_masks(boards)
+        actions = agent.act(boards, masks)
+        targets = rng.standard_normal(n).astype(np.float32)
+        envs = NimVectorEnv(n)
+        state = {'obs': envs.reset(seed=0)[0]}
+        print(f"{n:6d} "
+              f"{rate(lambda: agent.act(boards, masks), n, args.seconds):12,.0f} "
+              f"{rate(lambda: agent.train_batch(boards, actions, targets), n, args.seconds):12,.0f} "
+              f"{rate(lambda: self_play(agent, envs, state), n, args.seconds):12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
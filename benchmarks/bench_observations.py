@@ -0,0 +1,53 @@
+"""Cost of getting a safe observation snapshot per step.
+
+Compares ``copy.deepcopy`` of the default (live) observation dict, the
+usual defensive pattern, against NimEnv's snapshot observation modes,
+which need no copy.
+
+Usage::
+
+    python benchmarks/bench_observations.py [--games 20000]
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.envs import NimEnv  # noqa: E402
+
+GAME = [[0, 3], [1, 3], [2, 2], [0, 3], [1, 2], [2, 1], [0, 1]]
+
+
+def time_mode(mode, games, snapshot=None):
+    """Seconds per step, storing every observation in a list."""
+    env = NimEnv(observation_mode=mode)
+    reset, step = env.reset, env.step
+    kept = []
+    start = time.perf_counter()
+    for _ in range(games):
+        reset()
+        for move in GAME:
+            observation = step(move)[0]
+            kept.append(snapshot(observation) if snapshot else observation)
+        kept.clear()
+    return (time.perf_counter() - start) / (games * len(GAME))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=20000)
+    args = parser.parse_args()
+
+    baseline = time_mode('dict', args.games, copy.deepcopy)
+    results = [('dict + deepcopy', baseline)]
+    results += [(mode, time_mode(mode, args.games)) for mode in ('tuple', 'ring', 'packed')]
+    results.append(('dict (unsafe)', time_mode('dict', args.games)))
+    for name, seconds in results:
+        print(f"{name:16s} {seconds * 1e9:8.0f} ns/step  ({baseline / seconds:.2f}x vs deepcopy)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Memory per game and self-play throughput of packed batches.
+
+Compares, for random legal self-play at each batch size:
+
+- ``PackedNimBatch``: one uint16 word per game, stepped through lookup
+  tables;
+- ``PackedNimBatch[bitwise]``: the same words stepped with shifts and masks
+  (the path used for boards too big for tables);
+- ``NimVectorEnv``: int32 boards and players, drawing actions from
+  ``action_masks()``;
+- ``NimEnv`` objects: measured per instance at the smallest size only.
+
+Bytes per game are the persistent state (arrays kept between steps) and the
+peak allocated during one sample-and-step, both measured with
+``tracemalloc``. Steps per second count one move in one game as one step.
+
+Usage::
+
+    python benchmarks/bench_packed.py [--sizes 10000 100000 1000000] [--steps 50]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.envs import NimEnv, NimVectorEnv, PackedNimBatch  # noqa: E402
+
+
+class VectorSelfPlay:
+    """NimVectorEnv with random legal actions drawn from its masks."""
+
+    def __init__(self, n):
+        self.envs = NimVectorEnv(n)
+        self.rng = np.random.default_rng(0)
+        self.envs.reset(seed=0)
+
+    def play(self):
+        masks = self.envs.action_masks()
+        scores = np.where(masks, self.rng.random(masks.shape, dtype=np.float32), -1)
+        self.envs.step(scores.argmax(axis=1))
+
+
+class PackedSelfPlay:
+    """PackedNimBatch sampling its own legal actions."""
+
+    def __init__(self, n, tables):
+        self.games = PackedNimBatch(n, tables=tables)
+        self.games.reset(seed=0)
+
+    def play(self):
+        self.games.step(self.games.sample_actions())
+
+
+def measure(build, n, steps):
+    """``(state bytes/game, peak bytes/game per step, steps/s)``."""
+    tracemalloc.start()
+    runner = build(n)
+    state = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    runner.play()
+    peak = tracemalloc.get_traced_memory()[1] - state
+    tracemalloc.stop()
+    runner.play()  # warm up
+    start = time.perf_counter()
+    for _ in range(steps):
+        runner.play()
+    seconds = time.perf_counter() - start
+    return state / n, peak / n, n * steps / seconds
+
+
+def nim_env_bytes(n=1000):
+    """Bytes per reset ``NimEnv`` instance."""
+    tracemalloc.start()
+    envs = [NimEnv() for _ in range(n)]
+    for env in envs:
+        env.reset()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+
+    backends = [
+        ('PackedNimBatch', lambda n: PackedSelfPlay(n, tables=True)),
+        ('PackedNimBatch[bitwise]', lambda n: PackedSelfPlay(n, tables=False)),
+        ('NimVectorEnv', VectorSelfPlay),
+    ]
+    print(f"NimEnv: {nim_env_bytes():,.0f} bytes/game")
+    print(f"{'backend':24s} {'games':>9s} {'state B/game':>13s} {'step peak B/game':>17s} {'steps/s':>14s}")
+    for n in args.sizes:
+        for name, build in backends:
+            state, peak, rate = measure(build, n, args.steps)
+            print(f"{name:24s} {n:9d} {state:13.1f} {peak:17.1f} {rate:14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
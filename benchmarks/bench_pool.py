@@ -0,0 +1,91 @@
+"""Env construction, teardown and reuse costs.
+
+Each "job" needs one env, plays one short game and is done with it:
+
+- ``gym.make``: build with ``gym.make('nim-v0')``, play, ``close()``;
+- ``NimEnv()``: build the class directly, play, ``close()``;
+- ``pool``: acquire from ``make_pool(fast=False)``, play, release;
+- ``pool (fast)``: the same with ``make_pool(fast=True)``.
+
+Also reports the one-off time to build and close a pool of ``--size`` envs.
+
+Usage::
+
+    python benchmarks/bench_pool.py [--jobs 5000] [--size 1000]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import gymnasium as gym  # noqa: E402
+
+import gym_nim  # noqa: E402
+from gym_nim.envs import NimEnv  # noqa: E402
+
+GAME = [[0, 3], [1, 3], [2, 2], [0, 3], [1, 2], [2, 1], [0, 1]]
+
+
+def play(env):
+    for move in GAME:
+        env.step(move)
+
+
+def per_job(build, close, jobs):
+    """Seconds per job for a build/close pair."""
+    start = time.perf_counter()
+    for _ in range(jobs):
+        env = build()
+        play(env)
+        close(env)
+    return (time.perf_counter() - start) / jobs
+
+
+def fresh(factory):
+    def build():
+        env = factory()
+        env.reset()
+        return env
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--size', type=int, default=1000)
+    args = parser.parse_args()
+    # The env checker's one-off warnings would clutter the table
+    warnings.filterwarnings('ignore', module='gymnasium')
+
+    start = time.perf_counter()
+    pool = gym_nim.make_pool(args.size)
+    build_checked = time.perf_counter() - start
+    start = time.perf_counter()
+    fast_pool = gym_nim.make_pool(args.size, fast=True)
+    build_fast = time.perf_counter() - start
+
+    baseline = per_job(fresh(lambda: gym.make('nim-v0')), lambda env: env.close(), args.jobs)
+    results = [
+        ('gym.make', baseline),
+        ('NimEnv()', per_job(fresh(NimEnv), lambda env: env.close(), args.jobs)),
+        ('pool', per_job(pool.acquire, pool.release, args.jobs)),
+        ('pool (fast)', per_job(fast_pool.acquire, fast_pool.release, args.jobs)),
+    ]
+    for name, seconds in results:
+        print(f"{name:12s} {seconds * 1e6:8.1f} us/job  ({baseline / seconds:.1f}x vs gym.make)")
+
+    start = time.perf_counter()
+    pool.close()
+    close_checked = time.perf_counter() - start
+    start = time.perf_counter()
+    fast_pool.close()
+    close_fast = time.perf_counter() - start
+    print(f"\npool of {args.size}: build {build_checked * 1e3:.1f} ms, close {close_checked * 1e3:.1f} ms")
+    print(f"fast pool of {args.size}: build {build_fast * 1e3:.1f} ms, close {close_fast * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
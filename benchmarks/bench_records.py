@@ -0,0 +1,83 @@
+"""Game-record import throughput.
+
+Writes ``--games`` random legal games to a temporary JSONL file, converts
+them to the columnar format, and times replaying each into training arrays
+with :class:`gym_nim.records.GameReplayer`. Reports MB/s of input and
+moves/s, next to a plain read of the JSONL file for reference.
+
+Usage::
+
+    python benchmarks/bench_records.py [--games 200000] [--chunk-size 8192]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.encoding import index_to_action  # noqa: E402
+from gym_nim.envs import NimVectorEnv  # noqa: E402
+from gym_nim.records import GameReplayer, to_columnar  # noqa: E402
+
+
+def write_games(path, n, seed=0):
+    """Write ``n`` random legal games to ``path`` as JSONL."""
+    rng = np.random.default_rng(seed)
+    envs = NimVectorEnv(n)
+    envs.reset()
+    moves = [[] for _ in range(n)]
+    done = np.zeros(n, dtype=bool)
+    while not done.all():
+        masks = envs.action_masks()
+        actions = np.where(masks, rng.random(masks.shape), -1).argmax(axis=1)
+        terminated = envs.step(actions)[2]
+        for i in np.flatnonzero(~done):
+            moves[i].append(index_to_action(actions[i]))
+        done |= terminated
+    with open(path, 'w') as f:
+        for game in moves:
+            f.write(json.dumps({'moves': game}) + '\n')
+
+
+def size_of(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=200000)
+    parser.add_argument('--chunk-size', type=int, default=8192)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl = os.path.join(directory, 'games.jsonl')
+        columns = os.path.join(directory, 'columns')
+        write_games(jsonl, args.games)
+        to_columnar(jsonl, columns, chunk_size=args.chunk_size)
+
+        start = time.perf_counter()
+        with open(jsonl, 'rb') as f:
+            while f.read(1 << 20):
+                pass
+        read_time = time.perf_counter() - start
+        print(f"{'raw read':10s} {size_of(jsonl) / read_time / 1e6:10.1f} MB/s")
+
+        for name, path in (('jsonl', jsonl), ('columnar', columns)):
+            replayer = GameReplayer()
+            start = time.perf_counter()
+            for _ in replayer.replay(path, chunk_size=args.chunk_size):
+                pass
+            seconds = time.perf_counter() - start
+            print(f"{name:10s} {size_of(path) / seconds / 1e6:10.1f} MB/s  "
+                  f"{replayer.moves / seconds:14,.0f} moves/s  ({replayer.games} games)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Latency and throughput of the asyncio game server over a Unix socket.
+
+Plays ``--games`` concurrent random games per client connection and reports
+total steps/s plus per-request latency percentiles.
+
+Usage::
+
+    python benchmarks/bench_server.py [--games 1000] [--clients 4] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.server import NimClient, NimServer  # noqa: E402
+
+
+async def play(client, game_id, rounds, rng, latencies):
+    game = client.game(game_id)
+    steps = 0
+    clock = time.perf_counter
+    for _ in range(rounds):
+        state, info = await game.reset()
+        terminated = False
+        while not terminated:
+            board = state['board']
+            pile = rng.choice([i for i in range(len(board)) if board[i] > 0])
+            action = [pile, rng.randint(1, min(3, board[pile]))]
+            start = clock()
+            state, reward, terminated, truncated, info = await game.step(action)
+            latencies.append(clock() - start)
+            steps += 1
+    return steps
+
+
+async def run(games, clients, rounds):
+    path = os.path.join(tempfile.mkdtemp(), 'nim.sock')
+    server = await NimServer().start_unix(path)
+    conns = [await NimClient.open_unix(path) for _ in range(clients)]
+    rng = random.Random(0)
+    latencies = []
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(
+        play(conn, game_id, rounds, rng, latencies)
+        for conn in conns for game_id in range(games)
+    ))
+    elapsed = time.perf_counter() - start
+    for conn in conns:
+        await conn.close()
+    await server.close()
+    os.unlink(path)
+    return sum(counts), elapsed, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=1000, help='concurrent games per client')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=5, help='games played per game id')
+    args = parser.parse_args()
+
+    steps, elapsed, latencies = asyncio.run(run(args.games, args.clients, args.rounds))
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f"{args.clients * args.games} concurrent games, {steps} steps in {elapsed:.2f}s")
+    print(f"throughput: {steps / elapsed:10.0f} steps/s")
+    print(f"latency:    p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
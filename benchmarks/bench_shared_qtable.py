@@ -0,0 +1,121 @@
+"""Throughput of concurrent Q-learning workers sharing one SharedQTable.
+
+Each worker plays self-play Q-learning episodes on NimEnv (the same update
+rule as ``examples/qtable.py``) against a single shared table. The baseline
+is one process with a private ``np.zeros`` table.
+
+Usage::
+
+    python benchmarks/bench_shared_qtable.py [--episodes N] [--workers 1 2 4]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.agents import SharedQTable  # noqa: E402
+from gym_nim.encoding import action_index, state_index  # noqa: E402
+from gym_nim.envs import NimEnv  # noqa: E402
+
+LR = .85
+Y = .99
+
+
+def play(Q, episodes, seed):
+    """Run ``episodes`` self-play Q-learning episodes against table ``Q``."""
+    rng = random.Random(seed)
+    env = NimEnv()
+    shared = isinstance(Q, SharedQTable)
+    for _ in range(episodes):
+        s, _ = env.reset()
+        hs = state_index(s)
+        while True:
+            om = s['on_move']
+            a = rng.choice(env.move_generator())
+            ai = action_index(a)
+            s, reward, terminated, _, _ = env.step(a)
+            hs1 = state_index(s)
+            if om == 2:
+                reward = -reward
+            future = Q.max(hs1) if om == 1 else Q.min(hs1)
+            if shared:
+                Q.update(hs, ai, reward + Y * future, LR)
+            else:
+                Q[hs, ai] += LR * (reward + Y * future - Q[hs, ai])
+            hs = hs1
+            if terminated:
+                break
+
+
+def _worker(table, episodes, seed):
+    play(table, episodes, seed)
+    table.close()
+
+
+def run_shared(workers, episodes, locking):
+    table = SharedQTable(1024, 9, locking=locking)
+    per_worker = episodes // workers
+    procs = [
+        multiprocessing.Process(target=_worker, args=(table, per_worker, seed))
+        for seed in range(workers)
+    ]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - start
+    table.unlink()
+    return per_worker * workers / elapsed
+
+
+def run_private(episodes):
+    Q = np.zeros([1024, 9])
+    start = time.perf_counter()
+    play(_PrivateTable(Q), episodes, 0)
+    return episodes / (time.perf_counter() - start)
+
+
+class _PrivateTable:
+    """Adapter giving a plain array the max/min interface used by play()."""
+
+    def __init__(self, Q):
+        self.Q = Q
+
+    def max(self, s):
+        return self.Q[s].max()
+
+    def min(self, s):
+        return self.Q[s].min()
+
+    def __getitem__(self, key):
+        return self.Q[key]
+
+    def __setitem__(self, key, value):
+        self.Q[key] = value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--episodes', type=int, default=4000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    baseline = run_private(args.episodes)
+    print(f"private table, 1 process:      {baseline:10.0f} episodes/s")
+    for locking in ('striped', None):
+        for workers in args.workers:
+            rate = run_shared(workers, args.episodes, locking)
+            label = f"{locking or 'hogwild'}, {workers} workers:"
+            print(f"{label:31s} {rate:10.0f} episodes/s  ({rate / baseline:.2f}x)")
+    print(f"(cpu count: {os.cpu_count()})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Per-step latency of the single-game engines.
+
+Compares, on the same fixed game played over and over:
+
+- ``numpy step``: the original NumPy-backed ``NimEnv.step`` logic
+  (:class:`gym_nim.envs.reference.NumpyStep`, ``board[pile] -= count`` on an
+  int32 array and a check of every pile for the end);
+- ``NimEnv.step``: the env as shipped, driven by the pure-Python core;
+- ``NimCore.play``: the core alone, with no NumPy observation;
+- ``RuleSetCore.play``: the core stepping through the misère rule-set
+  tables (see :mod:`gym_nim.rules`), which every variant uses.
+
+Usage::
+
+    python benchmarks/bench_step.py [--games 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gym_nim.envs import NimEnv  # noqa: E402
+from gym_nim.envs.core import NimCore, RuleSetCore  # noqa: E402
+from gym_nim.envs.reference import NumpyStep  # noqa: E402
+from gym_nim.rules import make_rules  # noqa: E402
+
+GAME = [[0, 3], [1, 3], [2, 2], [0, 3], [1, 2], [2, 1], [0, 1]]
+
+
+def time_env(env, games):
+    """Seconds per step, excluding the time spent in reset()."""
+    reset, step = env.reset, env.step
+    start = time.perf_counter()
+    for _ in range(games):
+        reset()
+    reset_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(games):
+        reset()
+        for move in GAME:
+            step(move)
+    return (time.perf_counter() - start - reset_time) / (games * len(GAME))
+
+
+class CoreOnly:
+    """Adapter timing NimCore.play through the same loop as the envs."""
+
+    def __init__(self, core=None):
+        self.core = NimCore() if core is None else core
+        self.step = lambda move: self.core.play(move[0], move[1])
+
+    def reset(self):
+        self.core.set((7, 5, 3), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=20000)
+    args = parser.parse_args()
+
+    baseline = time_env(NumpyStep(), args.games)
+    results = [
+        ('numpy step', baseline),
+        ('NimEnv.step', time_env(NimEnv(), args.games)),
+        ('NimCore.play', time_env(CoreOnly(), args.games)),
+        ('RuleSetCore.play', time_env(CoreOnly(RuleSetCore(make_rules())), args.games)),
+    ]
+    for name, seconds in results:
+        print(f"{name:16s} {seconds * 1e9:8.0f} ns/step  ({baseline / seconds:.2f}x vs numpy step)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,3 +4,5 @@ register(
     id='nim-v0',
     entry_point='gym_nim.envs:NimEnv',
 )
+
+from gym_nim.pool import EnvPool, make_pool  # noqa: E402
@@ -0,0 +1,4 @@
+from gym_nim.agents.compiled import CompiledPolicy, compile_policy
+from gym_nim.agents.mlp import MLPAgent
+from gym_nim.agents.shared_qtable import SharedQTable
+from gym_nim.agents.sparse_qtable import SparseQTable
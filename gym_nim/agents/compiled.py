@@ -0,0 +1,125 @@
+import numpy as np
+
+from gym_nim.encoding import (
+    MAX_TAKE, PILE_BITS, action_masks, index_to_action, num_states, pack_board, unpack_boards
+)
+from gym_nim.solver import NimSolver
+
+
+class CompiledPolicy:
+    """A frozen policy: one precomputed action index per packed state.
+
+    ``best_action[state_index(state)]`` is the action to play, with -1 for
+    states that have no legal move. Lookups are a single array index, the
+    table can be saved with :meth:`save` and memory-mapped by several
+    processes with :meth:`load`, and two policies can be compared with
+    :meth:`diff`.
+
+    Parameters
+    ----------
+    best_action : numpy.ndarray of int8 or int16
+        Action index per packed state (see :mod:`gym_nim.encoding`); int16
+        when there are more than 127 actions.
+    n_piles : int, optional
+        Number of piles the states were packed with (default 3).
+    bits : int, optional
+        Bits per pile the states were packed with (default 3).
+    max_take : int, optional
+        Largest number of pieces per move (default 3).
+    """
+
+    def __init__(self, best_action, n_piles=3, bits=PILE_BITS, max_take=MAX_TAKE):
+        self.best_action = best_action
+        self.n_piles = n_piles
+        self.bits = bits
+        self.max_take = max_take
+
+    def __call__(self, state):
+        """Return the ``[pile, count]`` move for an observation dict, or None."""
+        action = self.best_action[pack_board(state['board'], state['on_move'], self.bits)]
+        return None if action < 0 else index_to_action(action, self.max_take)
+
+    def act_index(self, indices):
+        """Action indices for packed state index(es); vectorized over arrays."""
+        return self.best_action[indices]
+
+    def diff(self, other):
+        """Packed state indices where this policy and ``other`` disagree."""
+        return np.flatnonzero(self.best_action != other.best_action)
+
+    def save(self, path):
+        """Save the table as a ``.npy`` file."""
+        np.save(path, self.best_action)
+
+    @classmethod
+    def load(cls, path, mmap=True, n_piles=3, bits=PILE_BITS, max_take=MAX_TAKE):
+        """Load a saved table, memory-mapped read-only by default.
+
+        Memory-mapped tables share one copy in the OS page cache between
+        every process that loads the same file.
+        """
+        return cls(np.load(path, mmap_mode='r' if mmap else None), n_piles, bits, max_take)
+
+
+def compile_policy(policy, n_piles=3, bits=PILE_BITS, max_take=MAX_TAKE):
+    """Freeze ``policy`` into a :class:`CompiledPolicy` over all states.
+
+    Illegal moves are never selected: legality is applied while compiling,
+    so the result can be played without consulting ``move_generator``.
+
+    Parameters
+    ----------
+    policy : NimSolver, numpy.ndarray or callable
+        - a :class:`NimSolver` plays its best move under its rule set;
+        - a Q-table of shape ``(num_states, n_actions)`` indexed like the
+          Q-table example plays the legal action with the highest value;
+        - a callable ``policy(state, moves)`` receiving an observation dict
+          and the list of legal ``[pile, count]`` moves and returning one of
+          them, e.g. a search.
+    n_piles : int, optional
+        Number of piles (default 3).
+    bits : int, optional
+        Bits per pile in the state encoding (default 3).
+    max_take : int, optional
+        Largest number of pieces per move (default 3).
+
+    Returns
+    -------
+    CompiledPolicy
+
+    Examples
+    --------
+    >>> frozen = compile_policy(Q)
+    >>> frozen({'board': np.array([2, 1, 1]), 'on_move': 1})
+    [0, 2]
+    """
+    indices = np.arange(num_states(n_piles, bits))
+    boards, on_move = unpack_boards(indices, n_piles, bits)
+    legal = action_masks(boards, max_take)
+    has_move = legal.any(axis=1)
+
+    if isinstance(policy, NimSolver):
+        if policy.max_pile < (1 << bits) - 1 or policy.n_piles != n_piles:
+            raise ValueError(f"Solver does not cover {n_piles} piles of up to {(1 << bits) - 1} pieces")
+        positions = boards @ policy.radix
+        best = policy.best_action[positions]
+        # The solver's rule set decides which positions have moves
+        has_move = best >= 0
+        max_take = policy.max_take
+    elif isinstance(policy, np.ndarray):
+        values = np.where(legal, policy[indices], -np.inf)
+        best = values.argmax(axis=1)
+    else:
+        best = np.empty(len(indices), dtype=np.int64)
+        for i in indices:
+            moves = [index_to_action(a, max_take) for a in np.flatnonzero(legal[i])]
+            if moves:
+                state = {'board': boards[i].astype(np.int32), 'on_move': int(on_move[i])}
+                move = policy(state, moves)
+                best[i] = move[0] * max_take + move[1] - 1
+                if not legal[i, best[i]]:
+                    raise ValueError(f"Policy chose illegal move {move} for board {boards[i].tolist()}")
+    n_actions = policy.n_actions if isinstance(policy, NimSolver) else legal.shape[1]
+    action_dtype = np.int8 if n_actions <= np.iinfo(np.int8).max else np.int16
+    best_action = np.where(has_move, best, -1).astype(action_dtype)
+    return CompiledPolicy(best_action, n_piles, bits, max_take)
@@ -0,0 +1,211 @@
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE
+from gym_nim.rules import resolve_rules
+
+
+class MLPAgent:
+    """A small NumPy multilayer perceptron that estimates action values.
+
+    The network maps a board to one Q-value per action, always from the
+    point of view of the player on move. Because Nim is symmetric, one
+    network plays both seats. It is trained with negamax TD targets:
+    ``reward`` for a move that ends the game, otherwise ``-gamma * max Q``
+    of the opponent's position (see :meth:`td_targets`).
+
+    Everything runs in float32 over batches of boards, e.g. the
+    ``obs['board']`` array of a :class:`~gym_nim.envs.NimVectorEnv`.
+    Activations, gradients and Adam moments live in buffers that are
+    preallocated and reused, and only grow when a larger batch arrives.
+
+    Parameters
+    ----------
+    n_piles : int, optional
+        Number of piles (default 3).
+    max_pile : int, optional
+        Largest pile size; piles are one-hot encoded (default 7).
+    max_take : int, optional
+        Largest number of pieces per move (default 3).
+    hidden : sequence of int, optional
+        Widths of the ReLU hidden layers (default ``(64, 64)``).
+    lr : float, optional
+        Adam learning rate (default 1e-3).
+    gamma : float, optional
+        Discount factor for :meth:`td_targets` (default 0.99).
+    batch_size : int, optional
+        Initial buffer capacity in boards (default 1024).
+    rules : RuleSet or str, optional
+        Take ``n_piles``, ``max_pile`` and the action layout from a rule
+        set instead (see :mod:`gym_nim.rules`).
+    seed : int, optional
+        Seed for weight initialization and exploration.
+
+    Examples
+    --------
+    >>> agent = MLPAgent(seed=0)
+    >>> envs = NimVectorEnv(1024)
+    >>> obs, info = envs.reset()
+    >>> actions = agent.act(obs['board'], envs.action_masks(), epsilon=0.1)
+    >>> next_obs, rewards, terminated, truncated, info = envs.step(actions)
+    >>> targets = agent.td_targets(rewards, next_obs['board'], terminated, envs.action_masks())
+    >>> loss = agent.train_batch(obs['board'], actions, targets)
+    """
+
+    def __init__(self, n_piles=3, max_pile=7, max_take=MAX_TAKE, hidden=(64, 64),
+                 lr=1e-3, gamma=0.99, batch_size=1024, rules=None, seed=None):
+        rules = resolve_rules(rules)
+        if rules is not None:
+            n_piles, max_pile, max_take = rules.n_piles, rules.max_pile, rules.max_take
+            n_actions = rules.n_actions
+        else:
+            n_actions = n_piles * max_take
+        self.n_piles = n_piles
+        self.max_pile = max_pile
+        self.max_take = max_take
+        self.n_inputs = n_piles * (max_pile + 1)
+        self.n_actions = n_actions
+        self.lr = lr
+        self.gamma = gamma
+        self.rng = np.random.default_rng(seed)
+
+        sizes = [self.n_inputs, *hidden, n_actions]
+        self.weights = []
+        self.biases = []
+        for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+            scale = np.sqrt(2.0 / fan_in)
+            self.weights.append((self.rng.standard_normal((fan_in, fan_out)) * scale).astype(np.float32))
+            self.biases.append(np.zeros(fan_out, dtype=np.float32))
+        self._params = self.weights + self.biases
+        self._grads = [np.zeros_like(p) for p in self._params]
+        self._m = [np.zeros_like(p) for p in self._params]
+        self._v = [np.zeros_like(p) for p in self._params]
+        self._t = 0
+        self._sizes = sizes
+        self._offsets = np.arange(n_piles) * (max_pile + 1)
+        self._capacity = 0
+        self._allocate(batch_size)
+
+    def _allocate(self, capacity):
+        self._capacity = capacity
+        # _acts[0] is the input; _acts[i] the output of layer i
+        self._acts = [np.zeros((capacity, size), dtype=np.float32) for size in self._sizes]
+        self._deltas = [np.zeros((capacity, size), dtype=np.float32) for size in self._sizes[1:]]
+
+    def _forward(self, boards):
+        boards = np.asarray(boards)
+        n = len(boards)
+        if n > self._capacity:
+            self._allocate(n)
+        x = self._acts[0][:n]
+        x.fill(0.0)
+        x[np.arange(n)[:, None], boards + self._offsets] = 1.0
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            out = self._acts[i + 1][:n]
+            np.matmul(self._acts[i][:n], w, out=out)
+            out += b
+            if i < last:
+                np.maximum(out, 0.0, out=out)
+        return self._acts[-1][:n]
+
+    def q_values(self, boards):
+        """Q-values of a batch of boards, float32 of shape ``(n, n_actions)``."""
+        return self._forward(boards).copy()
+
+    def act(self, boards, masks, epsilon=0.0):
+        """Pick one legal action index per board.
+
+        Parameters
+        ----------
+        boards : array-like of int, shape (n, n_piles)
+            Boards of the games, each from the view of its player on move.
+        masks : array-like of bool, shape (n, n_actions)
+            Legal-action masks, e.g. ``envs.action_masks()``.
+        epsilon : float, optional
+            Probability of playing a uniformly random legal action instead
+            of the greedy one (default 0).
+
+        Returns
+        -------
+        numpy.ndarray of int64, shape (n,)
+            Action indices; 0 for boards without a legal move.
+        """
+        masks = np.asarray(masks, dtype=bool)
+        q = np.where(masks, self._forward(boards), -np.inf)
+        actions = q.argmax(axis=1)
+        if epsilon > 0:
+            explore = self.rng.random(len(actions)) < epsilon
+            if explore.any():
+                scores = np.where(masks[explore], self.rng.random((explore.sum(), self.n_actions)), -1.0)
+                actions[explore] = scores.argmax(axis=1)
+        return actions
+
+    def td_targets(self, rewards, next_boards, terminated, next_masks):
+        """Negamax TD targets ``r`` or ``-gamma * max_a' Q(s', a')``.
+
+        ``rewards`` and ``terminated`` are those returned by the step that
+        led to ``next_boards``, whose masks are ``next_masks``.
+        """
+        rewards = np.asarray(rewards, dtype=np.float32)
+        terminated = np.asarray(terminated, dtype=bool)
+        next_masks = np.asarray(next_masks, dtype=bool)
+        q = np.where(next_masks, self._forward(next_boards), -np.inf).max(axis=1)
+        bootstrap = ~terminated & next_masks.any(axis=1)
+        return np.where(bootstrap, -self.gamma * q, rewards).astype(np.float32)
+
+    def train_batch(self, boards, actions, targets):
+        """One Adam step on the squared error of the taken actions' Q-values.
+
+        Parameters
+        ----------
+        boards : array-like of int, shape (n, n_piles)
+        actions : array-like of int, shape (n,)
+        targets : array-like of float, shape (n,)
+
+        Returns
+        -------
+        float
+            The mean squared error before the update.
+        """
+        actions = np.asarray(actions)
+        targets = np.asarray(targets, dtype=np.float32)
+        n = len(actions)
+        rows = np.arange(n)
+        q = self._forward(boards)
+        error = q[rows, actions] - targets
+
+        delta = self._deltas[-1][:n]
+        delta.fill(0.0)
+        delta[rows, actions] = error * (2.0 / n)
+        n_layers = len(self.weights)
+        for i in reversed(range(n_layers)):
+            np.matmul(self._acts[i][:n].T, delta, out=self._grads[i])
+            delta.sum(axis=0, out=self._grads[n_layers + i])
+            if i > 0:
+                below = self._deltas[i - 1][:n]
+                np.matmul(delta, self.weights[i].T, out=below)
+                below *= self._acts[i][:n] > 0
+                delta = below
+        self._adam()
+        return float(np.mean(error ** 2))
+
+    def _adam(self, beta1=0.9, beta2=0.999, eps=1e-8):
+        self._t += 1
+        step = self.lr * np.sqrt(1 - beta2 ** self._t) / (1 - beta1 ** self._t)
+        for param, grad, m, v in zip(self._params, self._grads, self._m, self._v):
+            m *= beta1
+            m += (1 - beta1) * grad
+            v *= beta2
+            v += (1 - beta2) * grad * grad
+            param -= step * m / (np.sqrt(v) + eps)
+
+    def save(self, path):
+        """Write the weights to an ``.npz`` file."""
+        np.savez(path, *self._params)
+
+    def load(self, path):
+        """Read weights written by :meth:`save` into this (same-shaped) agent."""
+        with np.load(path) as data:
+            for i, param in enumerate(self._params):
+                param[...] = data[f'arr_{i}']
+        return self
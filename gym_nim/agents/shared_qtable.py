@@ -0,0 +1,189 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedQTable:
+    """A Q-table in shared memory that many worker processes update at once.
+
+    The table is a ``(n_states, n_actions)`` array living in a
+    ``multiprocessing.shared_memory`` block. Passing the object to a worker
+    process (as a ``Process`` argument or ``Pool`` initializer argument)
+    re-attaches to the same block instead of copying the data.
+
+    Two update disciplines are supported:
+
+    - ``locking='striped'`` (default): rows are partitioned into ``stripes``
+      groups, each guarded by its own lock, so writers only contend when
+      they touch states in the same stripe.
+    - ``locking=None``: Hogwild-style lock-free updates. Concurrent writes to
+      the same entry may occasionally lose an update, which tabular
+      Q-learning tolerates in exchange for no synchronization cost.
+
+    Parameters
+    ----------
+    n_states : int
+        Number of rows, e.g. ``env.observation_space.n``.
+    n_actions : int
+        Number of columns, e.g. ``env.action_space.n``.
+    locking : {'striped', None}, optional
+        Update discipline (default 'striped').
+    stripes : int, optional
+        Number of locks when ``locking='striped'`` (default 64).
+    dtype : numpy dtype, optional
+        Element type (default float64).
+    context : multiprocessing context, optional
+        Context used to create the locks; must match the one used to start
+        the workers.
+
+    Examples
+    --------
+    >>> table = SharedQTable(env.observation_space.n, env.action_space.n)
+    >>> workers = [Process(target=learn, args=(table,)) for _ in range(4)]
+    >>> # ... in each worker:
+    >>> table.update(s, a, reward + y * table.max(s1), lr=.85)
+    >>> # ... once all workers are done:
+    >>> Q = table.to_numpy()
+    >>> table.unlink()
+    """
+
+    def __init__(self, n_states, n_actions, locking='striped', stripes=64,
+                 dtype=np.float64, context=None):
+        if locking not in ('striped', None):
+            raise ValueError(f"Unknown locking mode: {locking!r}. Expected 'striped' or None")
+        self.shape = (n_states, n_actions)
+        self.dtype = np.dtype(dtype)
+        self.locking = locking
+        size = max(1, n_states * n_actions * self.dtype.itemsize)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._owner = True
+        if locking == 'striped':
+            context = context or multiprocessing.get_context()
+            self._locks = [context.Lock() for _ in range(stripes)]
+        else:
+            self._locks = None
+        self._bind()
+        self.table[:] = 0
+
+    def _bind(self):
+        self.table = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @property
+    def name(self):
+        """Name of the underlying shared memory block."""
+        return self._shm.name
+
+    def __getstate__(self):
+        return {
+            'name': self._shm.name,
+            'shape': self.shape,
+            'dtype': self.dtype.str,
+            'locking': self.locking,
+            'locks': self._locks,
+        }
+
+    def __setstate__(self, state):
+        self.shape = state['shape']
+        self.dtype = np.dtype(state['dtype'])
+        self.locking = state['locking']
+        self._locks = state['locks']
+        self._shm = shared_memory.SharedMemory(name=state['name'])
+        self._owner = False
+        self._bind()
+
+    def __getitem__(self, key):
+        return self.table[key]
+
+    def __setitem__(self, key, value):
+        self.table[key] = value
+
+    def lock_for(self, state):
+        """Return the lock guarding row ``state``, or None when lock-free."""
+        if self._locks is None:
+            return None
+        return self._locks[state % len(self._locks)]
+
+    def max(self, state):
+        """Largest Q value in row ``state``."""
+        return self.table[state].max()
+
+    def min(self, state):
+        """Smallest Q value in row ``state``."""
+        return self.table[state].min()
+
+    def argmax(self, state):
+        """Index of the largest Q value in row ``state``."""
+        return int(self.table[state].argmax())
+
+    def update(self, state, action, target, lr):
+        """Move ``Q[state, action]`` towards ``target`` by step size ``lr``.
+
+        Returns
+        -------
+        float
+            The new value of ``Q[state, action]``.
+        """
+        table = self.table
+        lock = self.lock_for(state)
+        if lock is None:
+            value = table[state, action]
+            value += lr * (target - value)
+            table[state, action] = value
+            return value
+        with lock:
+            value = table[state, action]
+            value += lr * (target - value)
+            table[state, action] = value
+        return value
+
+    def update_batch(self, states, actions, targets, lr):
+        """Apply :meth:`update` for arrays of states, actions and targets.
+
+        Duplicate ``(state, action)`` pairs within a batch are applied in
+        order, as if :meth:`update` had been called for each one.
+        """
+        states = np.asarray(states, dtype=np.intp)
+        actions = np.asarray(actions, dtype=np.intp)
+        targets = np.asarray(targets, dtype=self.dtype)
+        if self._locks is None:
+            self._apply(states, actions, targets, lr)
+            return
+        stripe_of = states % len(self._locks)
+        for stripe in np.unique(stripe_of):
+            selected = stripe_of == stripe
+            with self._locks[stripe]:
+                self._apply(states[selected], actions[selected], targets[selected], lr)
+
+    def _apply(self, states, actions, targets, lr):
+        table = self.table
+        pairs = states * self.shape[1] + actions
+        if len(np.unique(pairs)) == len(pairs):
+            table[states, actions] += lr * (targets - table[states, actions])
+            return
+        for s, a, t in zip(states, actions, targets):
+            table[s, a] += lr * (t - table[s, a])
+
+    def to_numpy(self):
+        """Return a private copy of the table."""
+        return self.table.copy()
+
+    def close(self):
+        """Detach this process from the shared block."""
+        self.table = None
+        self._shm.close()
+
+    def unlink(self):
+        """Close and destroy the shared block; call once, from the creator."""
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
@@ -0,0 +1,117 @@
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE
+from gym_nim.sparse import SparseStateIndex, board_key, board_keys
+
+
+class SparseQTable:
+    """A Q-table with rows only for visited boards, for boards too big to tabulate.
+
+    Rows are allocated on first update through a :class:`~gym_nim.sparse.
+    SparseStateIndex`, so memory is ``capacity * n_actions`` values however
+    many piles there are or however big they get. When the table is full,
+    the least recently used rows are evicted (CLOCK policy) and reused.
+
+    Boards are stored canonically, with the piles sorted ascending: boards
+    that only differ by pile order share one row, and the row's actions are
+    permuted back to the caller's pile order on the way in and out. Values
+    are from the point of view of the player on move, as for
+    :class:`~gym_nim.agents.MLPAgent`, so one table plays both seats.
+
+    Parameters
+    ----------
+    n_piles : int
+        Number of piles.
+    capacity : int
+        Maximum number of boards held.
+    max_take : int, optional
+        Largest number of pieces per move (default 3); actions are
+        ``max_take * pile + count - 1``.
+    initial : float, optional
+        Value of every action of a board not in the table (default 0).
+    dtype : numpy dtype, optional
+        Element type (default float64).
+    max_load, evict
+        Passed to :class:`~gym_nim.sparse.SparseStateIndex`.
+
+    Examples
+    --------
+    >>> Q = SparseQTable(n_piles=40, capacity=100000)
+    >>> a = Q.argmax(board, mask)
+    >>> Q.update(board, a, reward - y * Q.max(next_board, next_mask), lr=.85)
+    """
+
+    def __init__(self, n_piles, capacity, max_take=MAX_TAKE, initial=0.0, dtype=np.float64,
+                 max_load=0.5, evict=True):
+        self.n_piles = n_piles
+        self.max_take = max_take
+        self.n_actions = n_piles * max_take
+        self.initial = initial
+        self.index = SparseStateIndex(capacity, max_load=max_load, evict=evict)
+        self.values = np.full((capacity, self.n_actions), initial, dtype=dtype)
+        self._counts = np.arange(max_take)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, board):
+        return board_key(board) in self.index
+
+    def _columns(self, board):
+        # Column of the canonical row that holds each of the caller's actions
+        rank = np.empty(self.n_piles, dtype=np.int64)
+        rank[np.argsort(board, kind='stable')] = np.arange(self.n_piles)
+        return (rank[:, None] * self.max_take + self._counts).ravel()
+
+    def row(self, board):
+        """Q-values of ``board`` in its own action order (a copy)."""
+        row = self.index.get(board_key(board))
+        if row < 0:
+            return np.full(self.n_actions, self.initial, dtype=self.values.dtype)
+        return self.values[row, self._columns(board)]
+
+    def max(self, board, mask=None):
+        """Largest Q-value of ``board``, over legal actions if ``mask`` is given."""
+        values = self.row(board)
+        if mask is not None:
+            values = values[np.asarray(mask, dtype=bool)]
+        return values.max(initial=-np.inf)
+
+    def argmax(self, board, mask=None):
+        """Greedy action index of ``board``, restricted to ``mask`` if given."""
+        values = self.row(board)
+        if mask is not None:
+            values = np.where(mask, values, -np.inf)
+        return int(values.argmax())
+
+    def update(self, board, action, target, lr):
+        """Move ``Q(board, action)`` towards ``target`` by a fraction ``lr``.
+
+        The board gets a row if it has none, possibly evicting another.
+        """
+        key = board_key(board)
+        row = self.index.get(key)
+        if row < 0:
+            row = self.index.insert(key)[0]
+            self.values[row] = self.initial
+        column = self._columns(board)[action]
+        self.values[row, column] += lr * (target - self.values[row, column])
+
+    def q_values(self, boards):
+        """Q-values of a batch of boards, shape ``(n, n_actions)``."""
+        boards = np.asarray(boards, dtype=np.int64)
+        n = len(boards)
+        rows = self.index.lookup(board_keys(boards))
+        canonical = np.full((n, self.n_actions), self.initial, dtype=self.values.dtype)
+        found = rows >= 0
+        canonical[found] = self.values[rows[found]]
+        ranks = np.empty_like(boards)
+        np.put_along_axis(ranks, np.argsort(boards, axis=1, kind='stable'),
+                          np.broadcast_to(np.arange(self.n_piles), boards.shape), axis=1)
+        columns = (ranks[:, :, None] * self.max_take + self._counts).reshape(n, -1)
+        return np.take_along_axis(canonical, columns, axis=1)
+
+    def act(self, boards, masks):
+        """Greedy legal action of every board in a batch; 0 where none is legal."""
+        masks = np.asarray(masks, dtype=bool)
+        return np.where(masks, self.q_values(boards), -np.inf).argmax(axis=1)
@@ -0,0 +1,143 @@
+"""Curriculum of start positions ordered by difficulty.
+
+Every non-terminal board is ranked by the exact solver's depth-to-end, then by
+Grundy value, and the ranking is cut into ``n_levels`` equally sized levels.
+The curriculum starts at level 0 (the shortest games) and moves up a level
+whenever the agent's win rate over the last ``window`` games reaches
+``promote_at``.
+
+Example
+-------
+>>> curriculum = Curriculum()
+>>> state, info = env.reset(options=curriculum.options())
+>>> # ... play the game, then:
+>>> curriculum.record(agent_won)
+
+For vector envs, sample a whole batch of boards at once:
+
+>>> obs, info = envs.reset(options={'board': curriculum.sample(envs.num_envs)})
+>>> curriculum.record_batch(wins)
+"""
+import numpy as np
+
+from gym_nim.solver import NimSolver
+
+
+class Curriculum:
+    """Serves start positions of increasing difficulty based on win rate.
+
+    Parameters
+    ----------
+    solver : NimSolver, optional
+        Solver providing the positions and their depth and Grundy value;
+        defaults to ``NimSolver()`` (3 piles of up to 7).
+    n_levels : int, optional
+        Number of difficulty levels (default 10), at most one per candidate
+        board so that no level is empty.
+    promote_at : float, optional
+        Win rate over the last ``window`` games needed to move up a level
+        (default 0.8).
+    window : int, optional
+        Number of recent games the win rate is measured over (default 200).
+    review : float, optional
+        Fraction of samples drawn from easier levels, so that earlier
+        positions are not forgotten (default 0.2).
+    seed : int, optional
+        Seed for the sampling random number generator.
+
+    Raises
+    ------
+    ValueError
+        If ``n_levels`` is below 1 or above the number of candidate boards.
+
+    Attributes
+    ----------
+    boards : numpy.ndarray, shape (n_boards, n_piles)
+        All candidate start boards, easiest first.
+    level : int
+        Current difficulty level.
+    """
+
+    def __init__(self, solver=None, n_levels=10, promote_at=0.8, window=200,
+                 review=0.2, seed=None):
+        self.solver = solver if solver is not None else NimSolver()
+        self.promote_at = promote_at
+        self.review = review
+        self.rng = np.random.default_rng(seed)
+
+        nonempty = np.flatnonzero(~self.solver.terminal)
+        order = np.lexsort((self.solver.grundy[nonempty], self.solver.depth[nonempty]))
+        ranked = nonempty[order]
+        if not 1 <= n_levels <= len(ranked):
+            raise ValueError(f"n_levels must be between 1 and the {len(ranked)} candidate boards, got {n_levels}")
+        self.boards = self.solver.boards[ranked].astype(np.int32)
+        self.depth = self.solver.depth[ranked]
+        self.grundy = self.solver.grundy[ranked]
+        # Level k covers boards[bounds[k]:bounds[k + 1]]
+        self.bounds = np.linspace(0, len(ranked), n_levels + 1).astype(np.int64)
+        self.n_levels = n_levels
+        self.level = 0
+
+        self._results = np.zeros(window, dtype=bool)
+        self._count = 0
+
+    @property
+    def win_rate(self):
+        """Win rate over the games recorded since the last level change."""
+        n = min(self._count, len(self._results))
+        return float(self._results[:n].mean()) if n else 0.0
+
+    def sample(self, n=None):
+        """Draw start boards for the current level.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of boards. If omitted, a single board is returned.
+
+        Returns
+        -------
+        numpy.ndarray
+            Shape ``(n_piles,)`` if ``n`` is None, else ``(n, n_piles)``.
+        """
+        size = 1 if n is None else n
+        lo, hi = self.bounds[self.level], self.bounds[self.level + 1]
+        picks = self.rng.integers(lo, hi, size=size)
+        if self.level > 0 and self.review > 0:
+            reviewing = self.rng.random(size) < self.review
+            picks[reviewing] = self.rng.integers(0, lo, size=reviewing.sum())
+        boards = self.boards[picks]
+        return boards[0] if n is None else boards
+
+    def options(self):
+        """A ``reset(options=...)`` dict with one freshly sampled board."""
+        return {'board': self.sample()}
+
+    def record(self, won):
+        """Record the outcome of one game; returns True if the level changed."""
+        return self.record_batch([won])
+
+    def record_batch(self, wins):
+        """Record many game outcomes at once; returns True if the level changed."""
+        wins = np.asarray(wins, dtype=bool)
+        window = len(self._results)
+        positions = (self._count + np.arange(len(wins))) % window
+        self._results[positions[-window:]] = wins[-window:]
+        self._count += len(wins)
+        if self._count >= window and self.win_rate >= self.promote_at:
+            return self.set_level(self.level + 1)
+        return False
+
+    def set_level(self, level):
+        """Jump to ``level`` (clipped to the valid range) and clear the win history.
+
+        Returns
+        -------
+        bool
+            True if the level changed.
+        """
+        level = int(np.clip(level, 0, self.n_levels - 1))
+        changed = level != self.level
+        self.level = level
+        self._count = 0
+        return changed
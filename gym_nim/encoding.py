@@ -0,0 +1,256 @@
+"""Integer encodings of Nim states and actions.
+
+These match the layout used by ``examples/qtable.py`` so that tables indexed
+with them are interchangeable with the ones built by the examples:
+
+- a state packs the player on move into bit 0 and each pile into a
+  ``PILE_BITS``-wide field above it, giving ``2 ** (1 + 3 * PILE_BITS)``
+  (1024) indices for the default 3-pile board;
+- an action ``[pile, count]`` maps to ``3 * pile + count - 1``, giving the
+  9 indices of ``NimEnv.action_space``.
+"""
+from math import comb
+
+import numpy as np
+
+PILE_BITS = 3
+MAX_TAKE = 3
+
+
+def pack_board(board, on_move, bits=PILE_BITS):
+    """Pack a board and the player on move into a single int.
+
+    Parameters
+    ----------
+    board : sequence of int
+        Pile sizes; each must fit in ``bits`` bits.
+    on_move : int
+        1 or 2.
+    bits : int, optional
+        Width of each pile field (default 3).
+
+    Examples
+    --------
+    >>> pack_board([7, 5, 3], 1)
+    478
+    """
+    index = 1 if on_move == 2 else 0
+    shift = 1
+    for pile in board:
+        index |= int(pile) << shift
+        shift += bits
+    return index
+
+
+def unpack_board(index, n_piles=3, bits=PILE_BITS):
+    """Inverse of :func:`pack_board`; returns ``(board, on_move)``."""
+    mask = (1 << bits) - 1
+    on_move = 2 if index & 1 else 1
+    index >>= 1
+    board = []
+    for _ in range(n_piles):
+        board.append(index & mask)
+        index >>= bits
+    return board, on_move
+
+
+def state_index(state, bits=PILE_BITS):
+    """Pack an observation dict (``{'board': ..., 'on_move': ...}``)."""
+    return pack_board(state['board'], state['on_move'], bits)
+
+
+def num_states(n_piles=3, bits=PILE_BITS):
+    """Number of indices produced by :func:`pack_board` for ``n_piles``."""
+    return 1 << (1 + n_piles * bits)
+
+
+def action_index(move, max_take=MAX_TAKE):
+    """Map ``[pile, count]`` to its index in ``NimEnv.action_space``."""
+    return max_take * move[0] + move[1] - 1
+
+
+def index_to_action(index, max_take=MAX_TAKE):
+    """Inverse of :func:`action_index`; returns ``[pile, count]``."""
+    return [int(index) // max_take, int(index) % max_take + 1]
+
+
+def pack_boards(boards, on_move, bits=PILE_BITS):
+    """Vectorized :func:`pack_board` over a batch.
+
+    Parameters
+    ----------
+    boards : array-like, shape (n, n_piles)
+        Pile sizes of each game.
+    on_move : array-like, shape (n,)
+        Player on move (1 or 2) of each game.
+
+    Returns
+    -------
+    numpy.ndarray of int64, shape (n,)
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    index = (np.asarray(on_move) == 2).astype(np.int64)
+    shifts = 1 + bits * np.arange(boards.shape[1], dtype=np.int64)
+    return index | np.bitwise_or.reduce(boards << shifts, axis=1)
+
+
+def unpack_boards(indices, n_piles=3, bits=PILE_BITS):
+    """Vectorized :func:`unpack_board`; returns ``(boards, on_move)`` arrays."""
+    indices = np.asarray(indices, dtype=np.int64)
+    shifts = 1 + bits * np.arange(n_piles, dtype=np.int64)
+    boards = (indices[:, None] >> shifts) & ((1 << bits) - 1)
+    on_move = 1 + (indices & 1)
+    return boards, on_move
+
+
+def action_masks(boards, max_take=MAX_TAKE):
+    """Legal-action masks for a batch of boards.
+
+    Parameters
+    ----------
+    boards : array-like, shape (n, n_piles)
+        Pile sizes of each game.
+    max_take : int, optional
+        Largest number of pieces per move (default 3).
+
+    Returns
+    -------
+    numpy.ndarray of bool, shape (n, n_piles * max_take)
+        ``mask[i, action_index([pile, count])]`` is True when taking
+        ``count`` pieces from ``pile`` is legal in game ``i``.
+    """
+    boards = np.asarray(boards)
+    counts = np.arange(1, max_take + 1)
+    return (boards[:, :, None] >= counts).reshape(len(boards), -1)
+
+
+def num_multisets(n_piles, max_pile):
+    """Number of boards of ``n_piles`` piles of up to ``max_pile`` up to pile order.
+
+    This is ``C(max_pile + n_piles, n_piles)``, the size of the index space
+    of :func:`rank_multiset`; e.g. 120 for 3 piles of up to 7 instead of
+    the 512 ordered boards.
+    """
+    return comb(max_pile + n_piles, n_piles)
+
+
+def rank_multiset(board):
+    """Rank of a board among all boards with the same number of piles, ignoring order.
+
+    Piles are sorted ascending, ``a_0 <= a_1 <= ...``, and ranked with the
+    combinatorial number system as ``sum(C(a_i + i, i + 1))``. The rank
+    does not depend on ``max_pile``, and every board with piles of up to
+    ``max_pile`` gets a distinct rank below
+    ``num_multisets(len(board), max_pile)``. Ranks are Python ints, so
+    they are exact for any number or size of piles.
+
+    Examples
+    --------
+    >>> rank_multiset([7, 5, 3]) == rank_multiset([3, 7, 5])
+    True
+    >>> unrank_multiset(rank_multiset([7, 5, 3]), 3)
+    [3, 5, 7]
+    """
+    rank = 0
+    for i, pile in enumerate(sorted(int(pile) for pile in board)):
+        rank += comb(pile + i, i + 1)
+    return rank
+
+
+def unrank_multiset(rank, n_piles):
+    """Inverse of :func:`rank_multiset`; returns the sorted board."""
+    board = []
+    for i in range(n_piles, 0, -1):
+        # Largest value v with C(v, i) <= rank
+        value = i - 1
+        step = 1
+        while comb(value + step, i) <= rank:
+            step *= 2
+        low, high = value + step // 2, value + step
+        while high - low > 1:
+            middle = (low + high) // 2
+            if comb(middle, i) <= rank:
+                low = middle
+            else:
+                high = middle
+        value = low if comb(low, i) <= rank else value
+        rank -= comb(value, i)
+        board.append(value - (i - 1))
+    return board[::-1]
+
+
+def rank_multisets(boards, max_pile):
+    """Vectorized :func:`rank_multiset` for boards with piles of up to ``max_pile``.
+
+    Returns
+    -------
+    numpy.ndarray of uint64, shape (n,)
+
+    Raises
+    ------
+    ValueError
+        If the ranks would not fit in 64 bits; use :func:`rank_multiset`.
+    """
+    boards = np.sort(np.asarray(boards, dtype=np.int64), axis=1)
+    n_piles = boards.shape[1]
+    if num_multisets(n_piles, max_pile) > _MASK64:
+        raise ValueError(f"Ranks of {n_piles} piles of up to {max_pile} exceed 64 bits")
+    table = np.array([[comb(value, k) for k in range(n_piles + 1)]
+                      for value in range(max_pile + n_piles + 1)], dtype=np.uint64)
+    offsets = np.arange(n_piles)
+    return table[boards + offsets, offsets + 1].sum(axis=1, dtype=np.uint64)
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(x):
+    z = (x + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class ZobristTable:
+    """Deterministic 64-bit Zobrist keys for Nim positions.
+
+    The hash of a position is the XOR of ``key(pile, count)`` over all piles,
+    XORed with :attr:`side` when player 2 is on move. A move from ``old`` to
+    ``new`` pieces on one pile therefore updates the hash in O(1) with
+    ``h ^= key(pile, old) ^ key(pile, new)``.
+
+    Keys are derived from ``seed`` with splitmix64 instead of drawn from a
+    random stream, so they are identical in every process and can be
+    extended lazily to any pile count or size. Empty piles have key 0, so
+    boards that differ only by trailing empty piles hash alike.
+    """
+
+    def __init__(self, seed=0x6E696D):
+        self.seed = seed
+        self.side = _splitmix64(seed)
+        self.keys = []
+
+    def key(self, pile, count):
+        """Key for ``count`` pieces on ``pile``."""
+        try:
+            return self.keys[pile][count]
+        except IndexError:
+            self._grow(pile, count)
+            return self.keys[pile][count]
+
+    def _grow(self, pile, count):
+        while len(self.keys) <= pile:
+            self.keys.append([0])
+        keys = self.keys[pile]
+        while len(keys) <= count:
+            keys.append(_splitmix64(self.seed ^ (pile << 32 | len(keys))))
+
+    def hash(self, board, on_move):
+        """Hash of a whole position, computed from scratch."""
+        h = self.side if on_move == 2 else 0
+        for pile, count in enumerate(board):
+            h ^= self.key(pile, int(count))
+        return h
+
+
+ZOBRIST = ZobristTable()
@@ -1 +1,4 @@
 from gym_nim.envs.nim_env import NimEnv
+from gym_nim.envs.vector_nim_env import NimVectorEnv
+from gym_nim.envs.multi_agent import NimAECEnv, NimParallelEnv
+from gym_nim.envs.packed import PackedNimBatch
@@ -0,0 +1,203 @@
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, PILE_BITS, ZOBRIST, pack_board
+
+
+class NimCore:
+    """Pure-Python Nim game state and move logic.
+
+    The board is a list of plain ints, so stepping avoids NumPy scalar
+    overhead entirely; the number of pieces left, the Zobrist hash and the
+    nim-sum are maintained incrementally. NumPy observations are only built
+    when :meth:`observation` is called.
+
+    :class:`NimEnv` uses a NimCore as its engine, and :meth:`play` follows
+    ``NimEnv.step`` exactly: an illegal move returns reward -2 and ends the
+    game without changing the board, taking the last piece returns -1, and
+    ``on_move`` only switches when the game continues.
+
+    Parameters
+    ----------
+    board : sequence of int, optional
+        Pile sizes (default ``(7, 5, 3)``).
+    on_move : int, optional
+        Player on move, 1 or 2 (default 1).
+
+    Examples
+    --------
+    >>> core = NimCore()
+    >>> core.play(0, 2)
+    (0, False)
+    >>> core.board, core.on_move
+    ([5, 5, 3], 2)
+    """
+    __slots__ = ('board', 'on_move', 'remaining', 'zobrist_hash', 'nim_sum')
+
+    def __init__(self, board=(7, 5, 3), on_move=1):
+        self.set(board, on_move)
+
+    def set(self, board, on_move=1):
+        """Replace the position and recompute the derived values."""
+        self.board = [int(pile_count) for pile_count in board]
+        self.on_move = on_move
+        self.remaining = sum(self.board)
+        self.zobrist_hash = ZOBRIST.hash(self.board, on_move)
+        nim_sum = 0
+        for pile_count in self.board:
+            nim_sum ^= pile_count
+        self.nim_sum = nim_sum
+
+    def copy(self):
+        """Return an independent copy of this game."""
+        other = self.__class__.__new__(self.__class__)
+        other.board = self.board[:]
+        other.on_move = self.on_move
+        other.remaining = self.remaining
+        other.zobrist_hash = self.zobrist_hash
+        other.nim_sum = self.nim_sum
+        return other
+
+    def is_legal(self, pile, count):
+        """True if taking ``count`` pieces from ``pile`` is allowed."""
+        board = self.board
+        return 0 <= pile < len(board) and 0 < count <= board[pile]
+
+    def play(self, pile, count):
+        """Take ``count`` pieces from ``pile``.
+
+        Returns
+        -------
+        reward : int
+            -1 if the mover took the last piece, -2 for an illegal move,
+            0 otherwise.
+        done : bool
+            True if the game has ended.
+        """
+        board = self.board
+        if not (0 <= pile < len(board) and 0 < count <= board[pile]):
+            return -2, True
+        old = board[pile]
+        board[pile] = new = int(old - count)
+        keys = ZOBRIST.keys
+        try:
+            pile_keys = keys[pile]
+            self.zobrist_hash ^= pile_keys[old] ^ pile_keys[new]
+        except IndexError:
+            self.zobrist_hash ^= ZOBRIST.key(pile, old) ^ ZOBRIST.key(pile, new)
+        self.nim_sum ^= old ^ new
+        self.remaining -= old - new
+        if self.remaining == 0:
+            return -1, True
+        self.on_move = 3 - self.on_move
+        self.zobrist_hash ^= ZOBRIST.side
+        return 0, False
+
+    def play_index(self, action):
+        """:meth:`play` for an ``action_space`` index (``3 * pile + count - 1``)."""
+        return self.play(action // MAX_TAKE, action % MAX_TAKE + 1)
+
+    def legal_moves(self):
+        """All legal ``[pile, count]`` moves, in ``NimEnv.move_generator`` order."""
+        moves = []
+        for pile_idx, pile_count in enumerate(self.board):
+            for take_count in range(1, min(MAX_TAKE, pile_count) + 1):
+                moves.append([pile_idx, take_count])
+        return moves
+
+    def packed(self, bits=PILE_BITS):
+        """The position as a packed int (see :func:`gym_nim.encoding.pack_board`)."""
+        return pack_board(self.board, self.on_move, bits)
+
+    def observation(self):
+        """Materialize a ``NimEnv``-style observation dict with a NumPy board."""
+        return {'board': np.array(self.board, dtype=np.int32), 'on_move': self.on_move}
+
+
+class RuleSetCore(NimCore):
+    """:class:`NimCore` driven by the lookup tables of a :class:`~gym_nim.rules.RuleSet`.
+
+    Moves are checked and applied through ``rules.next_position`` instead of
+    the fixed Nim checks, so misère, normal-play, subtraction and Wythoff
+    games all step at the same cost. The game ends when the reached
+    position has no legal move, with ``rules.terminal_reward`` for the
+    player who made the last move.
+
+    Parameters
+    ----------
+    rules : RuleSet
+        The variant to play.
+    board : sequence of int, optional
+        Pile sizes (default ``rules.start``).
+    on_move : int, optional
+        Player on move, 1 or 2 (default 1).
+    """
+    __slots__ = ('rules', 'position')
+
+    def __init__(self, rules, board=None, on_move=1):
+        self.rules = rules
+        self.set(rules.start if board is None else board, on_move)
+
+    def set(self, board, on_move=1):
+        """Replace the position; raises ValueError if it is outside the tables."""
+        self.position = self.rules.index(board)
+        super().set(board, on_move)
+
+    def copy(self):
+        """Return an independent copy of this game."""
+        other = super().copy()
+        other.rules = self.rules
+        other.position = self.position
+        return other
+
+    def is_legal(self, pile, count):
+        """True if ``[pile, count]`` is allowed by the rules here."""
+        action = self.rules.action_lookup.get((pile, count), -1)
+        return action >= 0 and self.rules.next_lists[self.position][action] >= 0
+
+    def play(self, pile, count):
+        """Play ``[pile, count]``; for Wythoff rules ``pile == 2`` takes from both.
+
+        Returns
+        -------
+        reward : int
+            ``rules.terminal_reward`` if the move ended the game, -2 for an
+            illegal move, 0 otherwise.
+        done : bool
+            True if the game has ended.
+        """
+        rules = self.rules
+        action = rules.action_lookup.get((pile, count), -1)
+        if action < 0:
+            return -2, True
+        child = rules.next_lists[self.position][action]
+        if child < 0:
+            return -2, True
+        board = self.board
+        keys = ZOBRIST.keys
+        for pile, count in rules.decrements[action]:
+            old = board[pile]
+            board[pile] = new = old - count
+            try:
+                pile_keys = keys[pile]
+                self.zobrist_hash ^= pile_keys[old] ^ pile_keys[new]
+            except IndexError:
+                self.zobrist_hash ^= ZOBRIST.key(pile, old) ^ ZOBRIST.key(pile, new)
+            self.nim_sum ^= old ^ new
+            self.remaining -= count
+        self.position = child
+        if rules.terminal_list[child]:
+            return rules.terminal_reward, True
+        self.on_move = 3 - self.on_move
+        self.zobrist_hash ^= ZOBRIST.side
+        return 0, False
+
+    def play_index(self, action):
+        """:meth:`play` for an action index of ``rules``."""
+        max_take = self.rules.max_take
+        return self.play(action // max_take, action % max_take + 1)
+
+    def legal_moves(self):
+        """All legal ``[pile, count]`` moves, in action order."""
+        max_take = self.rules.max_take
+        return [[action // max_take, action % max_take + 1]
+                for action, child in enumerate(self.rules.next_lists[self.position]) if child >= 0]
@@ -0,0 +1,276 @@
+"""Two-agent Nim in the PettingZoo AEC and parallel styles.
+
+``NimEnv`` folds both players into one agent, so self-play loops have to
+negate rewards for player 2 themselves. The environments here give each
+player its own reward, termination flag and observation instead:
+
+- :class:`NimAECEnv` follows PettingZoo's agent-environment-cycle API
+  (``agent_iter``, ``last``, ``step``) on top of a single :class:`NimEnv`;
+- :class:`NimParallelEnv` steps a batch of games on top of
+  :class:`NimVectorEnv`, taking one action array per seat and returning
+  per-seat reward arrays.
+
+Nim is a perfect-information game, so both players see the same board. The
+observation is therefore built once per move and the same cached, read-only
+object is handed to both agents.
+
+PettingZoo is optional: when it is installed, :class:`NimAECEnv` subclasses
+``pettingzoo.AECEnv`` so that PettingZoo tooling accepts it.
+"""
+from gymnasium import spaces
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, action_masks, index_to_action
+from gym_nim.envs.nim_env import NimEnv
+from gym_nim.envs.vector_nim_env import NimVectorEnv
+
+try:
+    from pettingzoo import AECEnv as _AECBase  # type: ignore[import-not-found]
+except ImportError:  # pettingzoo is optional
+    _AECBase = object
+
+AGENTS = ('player_1', 'player_2')
+
+
+def _observation_space(env):
+    return spaces.Dict({
+        'observation': env.observation_space['board'],
+        'action_mask': spaces.Box(low=0, high=1, shape=(env.action_space.n,), dtype=np.int8),
+    })
+
+
+class NimAECEnv(_AECBase):
+    """Nim as a two-agent, turn-based PettingZoo-style environment.
+
+    The agents are ``'player_1'`` and ``'player_2'``. When a move ends the
+    game, the mover gets the NimEnv reward (-1 for taking the last piece,
+    or ``rules.terminal_reward``) and the opponent gets its negation. An
+    illegal move ends the game with -2 for the mover and 0 for the
+    opponent. Both agents are then terminated, and each must be stepped
+    once more with ``None`` to leave the game, as in PettingZoo.
+
+    Observations are ``{'observation': board, 'action_mask': mask}`` dicts.
+    The dict is built at most once per move and shared by both agents, and
+    its arrays are read-only.
+
+    Parameters
+    ----------
+    rules : RuleSet or str, optional
+        Variant to play (see :mod:`gym_nim.rules`).
+    render_mode : str, optional
+        ``'human'`` to print the board with :meth:`render`.
+
+    Examples
+    --------
+    >>> env = NimAECEnv()
+    >>> env.reset()
+    >>> for agent in env.agent_iter():
+    ...     observation, reward, terminated, truncated, info = env.last()
+    ...     action = None if terminated else policy(observation)
+    ...     env.step(action)
+    """
+    metadata = {'render_modes': ['human'], 'name': 'nim_aec_v0', 'is_parallelizable': True}
+
+    def __init__(self, rules=None, render_mode=None):
+        self.env = NimEnv(rules)
+        self.render_mode = render_mode
+        self.possible_agents = list(AGENTS)
+        self.agents = []
+        self._observation_spaces = {agent: _observation_space(self.env) for agent in AGENTS}
+        self._action_spaces = {agent: self.env.action_space for agent in AGENTS}
+        rules = self.env.rules
+        self._max_take = MAX_TAKE if rules is None else rules.max_take
+        self._observation = None
+
+    def observation_space(self, agent):
+        """Observation space of ``agent`` (the same for both players)."""
+        return self._observation_spaces[agent]
+
+    def action_space(self, agent):
+        """Action space of ``agent``: ``max_take * pile + count - 1`` indices."""
+        return self._action_spaces[agent]
+
+    @property
+    def num_agents(self):
+        return len(self.agents)
+
+    @property
+    def max_num_agents(self):
+        return len(self.possible_agents)
+
+    def reset(self, seed=None, options=None):
+        """Start a new game; ``options`` are passed on to ``NimEnv.reset``."""
+        state, _ = self.env.reset(seed=seed, options=options)
+        self.agents = list(AGENTS)
+        self.rewards = {agent: 0 for agent in AGENTS}
+        self._cumulative_rewards = {agent: 0 for agent in AGENTS}
+        self.terminations = {agent: False for agent in AGENTS}
+        self.truncations = {agent: False for agent in AGENTS}
+        self.infos = {agent: {} for agent in AGENTS}
+        self.agent_selection = AGENTS[state['on_move'] - 1]
+        self._observation = None
+
+    def observe(self, agent):
+        """The current observation, shared by both agents."""
+        if self._observation is None:
+            board = self.env.state['board'].copy()
+            board.flags.writeable = False
+            rules = self.env.rules
+            mask = action_masks(board[None])[0] if rules is None else rules.mask(board)
+            mask = mask.astype(np.int8)
+            mask.flags.writeable = False
+            self._observation = {'observation': board, 'action_mask': mask}
+        return self._observation
+
+    def state(self):
+        """Global state: the board, a copy."""
+        return self.env.state['board'].copy()
+
+    def last(self, observe=True):
+        """``(observation, reward, terminated, truncated, info)`` of the agent to act."""
+        agent = self.agent_selection
+        return (self.observe(agent) if observe else None, self._cumulative_rewards[agent],
+                self.terminations[agent], self.truncations[agent], self.infos[agent])
+
+    def agent_iter(self, max_iter=2 ** 63):
+        """Yield the agent to act until every agent has left the game."""
+        for _ in range(max_iter):
+            if not self.agents:
+                return
+            yield self.agent_selection
+
+    def step(self, action):
+        """Play ``action`` for :attr:`agent_selection`.
+
+        Parameters
+        ----------
+        action : int, [pile, count] or None
+            An action index or a move; must be None for an agent that is
+            already terminated.
+        """
+        agent = self.agent_selection
+        if self.terminations[agent] or self.truncations[agent]:
+            if action is not None:
+                raise ValueError(f"{agent} is done; step it with None, not {action}")
+            self.agents.remove(agent)
+            self._cumulative_rewards[agent] = 0
+            if self.agents:
+                self.agent_selection = self.agents[0]
+            return
+        if np.isscalar(action):
+            action = index_to_action(action, self._max_take)
+        opponent = AGENTS[1] if agent == AGENTS[0] else AGENTS[0]
+        self._cumulative_rewards[agent] = 0
+
+        _, reward, terminated, _, _ = self.env.step(list(action))
+        self.rewards = {agent: reward, opponent: 0}
+        if terminated:
+            if reward != -2:
+                self.rewards[opponent] = -reward
+            self.terminations = {agent: True, opponent: True}
+        for each in AGENTS:
+            self._cumulative_rewards[each] += self.rewards[each]
+        self.agent_selection = opponent
+        self._observation = None
+        if self.render_mode == 'human':
+            self.render()
+
+    def render(self):
+        """Print the board."""
+        self.env.render()
+
+    def close(self):
+        pass
+
+
+class NimParallelEnv:
+    """Batched two-agent Nim, PettingZoo parallel style.
+
+    Wraps a :class:`NimVectorEnv`. ``step()`` takes one action array per
+    seat, ``{'player_1': actions, 'player_2': actions}``, and in each game
+    plays the action of the seat on move; the other seat's entry is
+    ignored. A single array may be passed instead to play it for whoever is
+    on move. Rewards come back per seat with the same zero-sum convention
+    as :class:`NimAECEnv`, so trainers never negate rewards themselves.
+
+    All returned per-agent dicts map both agents to the same arrays where
+    the values coincide: one observation dict (boards, players on move and
+    action masks) and one termination array serve both seats.
+
+    Parameters
+    ----------
+    num_envs : int
+        Number of games.
+    rules : RuleSet or str, optional
+        Variant to play (see :mod:`gym_nim.rules`).
+
+    Examples
+    --------
+    >>> envs = NimParallelEnv(1024)
+    >>> observations, infos = envs.reset(seed=0)
+    >>> actions = {agent: policy[agent](observations[agent]) for agent in envs.agents}
+    >>> observations, rewards, terminations, truncations, infos = envs.step(actions)
+    >>> rewards['player_1'] + rewards['player_2']  # zero unless an illegal move
+    """
+    metadata = {'render_modes': [], 'name': 'nim_parallel_v0'}
+
+    def __init__(self, num_envs, rules=None):
+        self.envs = NimVectorEnv(num_envs, rules)
+        self.num_envs = num_envs
+        self.possible_agents = list(AGENTS)
+        self.agents = list(AGENTS)
+        self._observation_space = spaces.Dict({
+            'board': self.envs.observation_space['board'],
+            'on_move': self.envs.observation_space['on_move'],
+            'action_mask': spaces.MultiBinary((num_envs, self.envs.single_action_space.n)),
+        })
+
+    def observation_space(self, agent):
+        """Batched observation space (the same for both seats)."""
+        return self._observation_space
+
+    def action_space(self, agent):
+        """Batched action space (the same for both seats)."""
+        return self.envs.action_space
+
+    def _observations(self, obs):
+        obs['action_mask'] = self.envs.action_masks()
+        return {agent: obs for agent in AGENTS}
+
+    def reset(self, seed=None, options=None):
+        """Reset every game; ``options`` are passed on to ``NimVectorEnv.reset``."""
+        obs, info = self.envs.reset(seed=seed, options=options)
+        return self._observations(obs), {agent: info for agent in AGENTS}
+
+    def step(self, actions):
+        """Play the action of the seat on move in every game.
+
+        Parameters
+        ----------
+        actions : dict or numpy.ndarray
+            Per-seat action arrays keyed by agent, or one array for whoever
+            is on move. Actions are indices or ``[pile, count]`` rows.
+
+        Returns
+        -------
+        observations, rewards, terminations, truncations, infos : dict
+            Keyed by agent. Rewards are int32 arrays: the mover's NimEnv
+            reward for the mover and its negation for the other seat, except
+            that an illegal move gives the other seat 0.
+        """
+        player_1 = self.envs.on_move == 1
+        if isinstance(actions, dict):
+            first, second = np.asarray(actions[AGENTS[0]]), np.asarray(actions[AGENTS[1]])
+            mask = player_1 if first.ndim == 1 else player_1[:, None]
+            actions = np.where(mask, first, second)
+        obs, rewards, terminated, truncated, info = self.envs.step(actions)
+        other = np.where(rewards == -2, 0, -rewards)
+        per_agent = {AGENTS[0]: np.where(player_1, rewards, other),
+                     AGENTS[1]: np.where(player_1, other, rewards)}
+        return (self._observations(obs), per_agent,
+                {agent: terminated for agent in AGENTS},
+                {agent: truncated for agent in AGENTS},
+                {agent: info for agent in AGENTS})
+
+    def close(self):
+        self.envs.close()
@@ -2,6 +2,13 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 
+from gym_nim.encoding import PILE_BITS, num_states, pack_board
+from gym_nim.envs.core import NimCore, RuleSetCore
+from gym_nim.rules import resolve_rules
+
+# Starting position, copied on every reset() instead of being rebuilt
+_START = NimCore((7, 5, 3), 1)
+
 class NimEnv(gym.Env):
     """A Nim game environment for reinforcement learning.
     
@@ -32,6 +39,44 @@ class NimEnv(gym.Env):
         - -2: for making an illegal move
         - 0: for all other moves
     
+    Rule Sets
+    ---------
+    Pass ``rules`` (a :class:`gym_nim.rules.RuleSet` or a variant name such
+    as ``'normal'``) to play another variant through precomputed move
+    tables: normal play (the last mover gets +1), subtraction sets other
+    than {1, 2, 3}, or Wythoff's game. The action space then has
+    ``rules.n_actions`` entries and the board ``rules.n_piles`` piles of at
+    most ``rules.max_pile``. Without ``rules`` the original game is played
+    unchanged, where any count up to the pile size is accepted.
+    
+    Observation Modes
+    -----------------
+    By default ``step()`` and ``reset()`` return ``self.state``, the same
+    dict and board array the env mutates on the next step, so stored
+    observations change under the caller. Other modes return snapshots
+    that stay valid without a deep copy per step:
+    
+        - 'dict' (default): the live ``self.state`` dict, as before
+        - 'tuple': an immutable ``(board_tuple, on_move)`` tuple
+        - 'ring': a dict whose read-only board is one slot of a ring of
+          ``ring_size`` preallocated arrays; it stays unchanged for the next
+          ``ring_size - 1`` steps
+        - 'packed': the position as one int (see
+          :func:`gym_nim.encoding.pack_board`)
+    
+    ``self.state`` always holds the live dict, whatever the mode.
+    
+    Parameters
+    ----------
+    rules : RuleSet or str, optional
+        Variant to play, e.g. ``gym.make('nim-v0', rules='normal')``.
+    observation_mode : {'dict', 'tuple', 'ring', 'packed'}, optional
+        What ``step()`` and ``reset()`` return (default 'dict').
+    ring_size : int, optional
+        Number of buffers in 'ring' mode (default 64).
+    verbose : bool, optional
+        Print a message for every illegal move (default True).
+    
     Example
     -------
     >>> env = gym.make('nim-v0')
@@ -47,22 +92,72 @@ class NimEnv(gym.Env):
     """
     metadata = {'render_modes': ['human']}
 
-    def __init__(self):
+    observation_modes = ('dict', 'tuple', 'ring', 'packed')
+
+    def __init__(self, rules=None, observation_mode='dict', ring_size=64, verbose=True):
+        if observation_mode not in self.observation_modes:
+            raise ValueError(f"Unknown observation_mode {observation_mode!r}. "
+                             f"Expected one of {self.observation_modes}")
+        self.rules = rules = resolve_rules(rules)
+        n_piles, max_pile = (3, 7) if rules is None else (rules.n_piles, rules.max_pile)
+        
         # Action space: tuple of (pile_index, pieces_to_take)
         # We'll validate actions manually since gym doesn't support tuple actions directly
-        self.action_space = spaces.Discrete(9)  # Placeholder, we'll validate manually
+        n_actions = 9 if rules is None else rules.n_actions
+        self.action_space = spaces.Discrete(n_actions)  # Placeholder, we'll validate manually
         
         # Observation space: Dict with board state and current player
         self.observation_space = spaces.Dict({
-            'board': spaces.Box(low=0, high=7, shape=(3,), dtype=np.int32),
+            'board': spaces.Box(low=0, high=max_pile, shape=(n_piles,), dtype=np.int32),
             'on_move': spaces.Discrete(3, start=1)  # Player 1 or 2
         })
         
         # For backward compatibility with Q-learning example that expects .n attribute
-        # This represents the flattened state space size
-        self.observation_space.n = 8 * 8 * 8 * 2  # All possible board states * players
+        # This represents the flattened state space size: every packed board and player
+        self._bits = max(PILE_BITS, max_pile.bit_length())
+        self.observation_space.n = num_states(n_piles, self._bits)
+        
+        self.observation_mode = observation_mode
+        self.verbose = verbose
+        if observation_mode == 'tuple':
+            self.observation_space = spaces.Tuple((
+                spaces.MultiDiscrete([max_pile + 1] * n_piles),
+                spaces.Discrete(3, start=1),
+            ))
+        elif observation_mode == 'packed':
+            self.observation_space = spaces.Discrete(num_states(n_piles, self._bits))
+        elif observation_mode == 'ring':
+            # Writes go through self._ring; callers only see read-only views
+            self._ring = np.zeros((ring_size, n_piles), dtype=np.int32)
+            self._ring_obs = []
+            for row in self._ring:
+                view = row.view()
+                view.flags.writeable = False
+                self._ring_obs.append({'board': view, 'on_move': 1})
+            self._ring_pos = 0
         
         self.state = None
+        # Pure-Python engine; self.state mirrors it as the NumPy observation
+        self._core = None
+    
+    @property
+    def zobrist_hash(self):
+        """64-bit Zobrist hash of the current position, or None before reset().
+        
+        Maintained incrementally by step(), so reading it costs nothing. The
+        hash covers both the board and the player on move; keys come from
+        gym_nim.encoding.ZOBRIST and are the same in every process.
+        """
+        return None if self._core is None else self._core.zobrist_hash
+    
+    @property
+    def nim_sum(self):
+        """XOR of all pile sizes, or None before reset().
+        
+        Maintained incrementally by step().
+        """
+        return None if self._core is None else self._core.nim_sum
+    
     def step(self, action):
         """Execute one time step within the environment.
         
@@ -100,9 +195,6 @@ class NimEnv(gym.Env):
         if self.state is None:
             raise ValueError("Cannot step before reset()")
         
-        done = False
-        reward = 0
-        
         # Validate action format
         if not isinstance(action, (tuple, list)) or len(action) != 2:
             raise ValueError(f"Invalid action format: {action}. Expected a tuple or list of (pile, count)")
@@ -110,41 +202,64 @@ class NimEnv(gym.Env):
         pile, count = action
         # count is already 1-3 from the examples
         
-        # Check move legality
-        board = self.state['board']
+        core = self._core
+        reward, done = core.play(pile, count)
+        if reward == -2:
+            if self.verbose:
+                self._report_illegal_move(action)
+        else:
+            # Mirror the move into the observation
+            state = self.state
+            if self.rules is None:
+                state['board'][pile] = core.board[pile]
+            else:
+                state['board'][:] = core.board
+            state['on_move'] = core.on_move
         
-        # Validate pile index
-        if pile < 0 or pile >= len(board):
+        # In gymnasium: (observation, reward, terminated, truncated, info)
+        if self.observation_mode == 'dict':
+            return self.state, reward, done, False, {}
+        return self._observe(), reward, done, False, {}
+
+    def _observe(self):
+        core = self._core
+        mode = self.observation_mode
+        if mode == 'tuple':
+            return tuple(core.board), core.on_move
+        if mode == 'packed':
+            return pack_board(core.board, core.on_move, self._bits)
+        if mode == 'ring':
+            pos = self._ring_pos = (self._ring_pos + 1) % len(self._ring)
+            self._ring[pos] = core.board
+            observation = self._ring_obs[pos]
+            observation['on_move'] = core.on_move
+            return observation
+        return self.state
+    def _report_illegal_move(self, action):
+        pile, count = action
+        board = self.state['board']
+        n_kinds = len(board) if self.rules is None else self.rules.n_kinds
+        if pile < 0 or pile >= n_kinds:
             print(f"Illegal move {action}: invalid pile {pile}")
-            done = True
-            reward = -2
-        # Validate count
         elif count <= 0:
             print(f"Illegal move {action}: count must be positive")
-            done = True
-            reward = -2
-        # Check if trying to take too many pieces
-        elif count > board[pile]:
-            print(f"Illegal move {action}: trying to take {count} from pile {pile} with only {board[pile]} pieces")
-            done = True
-            reward = -2
+        elif self.rules is not None:
+            print(f"Illegal move {action}: not allowed under {self.rules.name} rules on {list(board)}")
         else:
-            # Valid move - execute it
-            board[pile] -= count
-            
-            # Check if game is over (all piles empty)
-            if all(pile_count == 0 for pile_count in board):
-                done = True
-                reward = -1  # Current player loses (took the last piece)
-            else:
-                # Game continues, switch player
-                self.state['on_move'] = 3 - self.state['on_move']
-        
-        # In gymnasium: (observation, reward, terminated, truncated, info)
-        return self.state, reward, done, False, {}
+            print(f"Illegal move {action}: trying to take {count} from pile {pile} with only {board[pile]} pieces")
     def reset(self, seed=None, options=None):
         """Reset the environment to the initial state.
         
+        Parameters
+        ----------
+        seed : int, optional
+            Unused; the game itself is deterministic.
+        options : dict, optional
+            ``{'board': [...]}`` starts from a custom board instead of
+            [7, 5, 3] (or ``rules.start``), and ``{'on_move': 2}`` (default 1) sets the
+            player to move, with or without a board.
+            Curricula use this to pick start positions.
+        
         Returns
         -------
         state : dict
@@ -157,13 +272,18 @@ class NimEnv(gym.Env):
         >>> state = env.reset()
         >>> print(state)
         {'board': array([7, 5, 3]), 'on_move': 1}
+        >>> state, info = env.reset(options={'board': [2, 1, 1]})
         """
-        self.state = {
-            'board': np.array([7, 5, 3], dtype=np.int32),
-            'on_move': 1
-        }
+        options = options or {}
+        if self.rules is not None:
+            self._core = RuleSetCore(self.rules, options.get('board'), options.get('on_move', 1))
+        elif 'board' in options or 'on_move' in options:
+            self._core = NimCore(options.get('board', _START.board), options.get('on_move', 1))
+        else:
+            self._core = _START.copy()
+        self.state = self._core.observation()
         # In gymnasium: reset returns (observation, info)
-        return self.state, {}
+        return self._observe(), {}
     
     def set_board(self, board):
         """Set a custom board configuration.
@@ -184,6 +304,10 @@ class NimEnv(gym.Env):
         if self.state is None:
             self.state = {'board': None, 'on_move': 1}
         self.state['board'] = np.array(board, dtype=np.int32)
+        if self.rules is None:
+            self._core = NimCore(self.state['board'], self.state['on_move'])
+        else:
+            self._core = RuleSetCore(self.rules, self.state['board'], self.state['on_move'])
     
     def render(self):
         """Render the current game state to the console.
@@ -234,15 +358,4 @@ class NimEnv(gym.Env):
         if self.state is None:
             return []
         
-        moves = []
-        board = self.state['board']
-        
-        for pile_idx in range(len(board)):
-            pile_count = board[pile_idx]
-            # Can take 1 to min(3, pile_count) pieces
-            for take_count in range(1, min(4, pile_count + 1)):
-                moves.append([pile_idx, take_count])
-        
-        return moves
-    
-    
\ No newline at end of file
+        return self._core.legal_moves()
@@ -0,0 +1,262 @@
+"""Batches of Nim games stored as one packed word per game.
+
+:class:`NimVectorEnv` keeps an int32 board row, an int32 player and an
+autoreset flag per game, and copies all of them into every observation. At a
+million games that is tens of megabytes moved per step. :class:`PackedNimBatch`
+stores each game as one :func:`~gym_nim.encoding.pack_board` word instead
+(player on move in bit 0, one ``bits``-wide field per pile above it). That is
+a uint16 for the default 3 piles of 3 bits, and a uint32 or uint64 for bigger
+boards. Stepping, masking and sampling read and write the words directly:
+
+- small boards (at most 16 board bits, or any rule set) step through lookup
+  tables indexed by the board bits, one gather per step;
+- bigger boards without rules step with shifts and masks on the words.
+
+The words are the same integers as :func:`~gym_nim.encoding.pack_boards`
+produces, so they index Q-tables and compiled policies as they are.
+
+Example
+-------
+>>> games = PackedNimBatch(1_000_000)
+>>> words, info = games.reset(seed=0)
+>>> words.dtype, games.nbytes / games.num_games
+(dtype('uint16'), 5.0)
+>>> words, rewards, terminated, truncated, info = games.step(games.sample_actions())
+"""
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, PILE_BITS, pack_boards, unpack_boards
+from gym_nim.rules import make_rules, resolve_rules
+
+# Largest number of board bits that is stepped through lookup tables
+TABLE_BITS = 16
+
+
+def _word_dtype(n_bits):
+    for dtype in (np.uint16, np.uint32, np.uint64):
+        if n_bits <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    raise ValueError(f"{n_bits} bits per game do not fit in a 64-bit word")
+
+
+class PackedNimBatch:
+    """Many Nim games, one packed integer each, stepped together with NumPy.
+
+    Games follow :class:`NimVectorEnv`: an illegal move ends the game with
+    -2 and leaves the board unchanged, the move that ends the game gets -1
+    (or ``rules.terminal_reward``), ``on_move`` only switches when the game
+    continues, and a finished game restarts on the following step, ignoring
+    that step's action.
+
+    Persistent state is the word array plus a one-byte autoreset flag per
+    game, and the reward and termination buffers that :meth:`step` fills.
+    These buffers and the word array are returned as they are, not copied,
+    so they are overwritten by the next step; copy what you keep.
+
+    Parameters
+    ----------
+    num_games : int
+        Number of games.
+    rules : RuleSet or str, optional
+        Variant to play (see :mod:`gym_nim.rules`). Rule sets always step
+        through tables.
+    n_piles : int, optional
+        Number of piles without rules (default 3).
+    bits : int, optional
+        Bits per pile field (default 3, or what ``rules.max_pile`` needs).
+    max_take : int, optional
+        Largest number of pieces per move without rules (default 3).
+    start : sequence of int, optional
+        Starting board (default ``(7, 5, 3)`` or ``rules.start``).
+    tables : bool, optional
+        Force (True) or forbid (False) the lookup-table path. By default it
+        is used up to :data:`TABLE_BITS` board bits.
+
+    Attributes
+    ----------
+    words : numpy.ndarray, shape (num_games,)
+        The packed games, in the smallest of uint16, uint32 and uint64 that
+        fits ``1 + n_piles * bits`` bits.
+    """
+
+    def __init__(self, num_games, rules=None, n_piles=3, bits=None, max_take=MAX_TAKE,
+                 start=None, tables=None):
+        self.rules = rules = resolve_rules(rules)
+        if rules is not None:
+            n_piles, max_take = rules.n_piles, rules.max_take
+            self.n_actions = rules.n_actions
+            bits = bits or max(PILE_BITS, rules.max_pile.bit_length())
+            start = rules.start if start is None else start
+        else:
+            self.n_actions = n_piles * max_take
+            bits = bits or PILE_BITS
+            start = (7, 5, 3) if start is None else start
+        self.num_games = num_games
+        self.n_piles = n_piles
+        self.bits = bits
+        self.max_take = max_take
+        self.dtype = _word_dtype(1 + n_piles * bits)
+        board_bits = n_piles * bits
+        self.tables = board_bits <= TABLE_BITS if tables is None else tables
+        if rules is not None and not self.tables:
+            raise ValueError("Rule sets need the lookup-table path")
+        if self.tables:
+            self._build_tables(rules or make_rules('misere', n_piles=n_piles, max_pile=(1 << bits) - 1,
+                                                   takes=tuple(range(1, max_take + 1))))
+        else:
+            self._pile_mask = self.dtype.type((1 << bits) - 1)
+            self._board_mask = self.dtype.type((1 << board_bits) - 1)
+            self._shifts = (1 + bits * np.arange(n_piles)).astype(self.dtype)
+
+        self.start_words = self.pack([start], [1])[0]
+        self.words = np.full(num_games, self.start_words, dtype=self.dtype)
+        self._autoreset = np.zeros(num_games, dtype=bool)
+        self._rewards = np.zeros(num_games, dtype=np.int8)
+        self._terminated = np.zeros(num_games, dtype=bool)
+        # Never true, so one shared byte serves every game
+        self._truncated = np.broadcast_to(np.False_, (num_games,))
+        self.np_random = np.random.default_rng()
+
+    def _build_tables(self, rules):
+        n_codes = 1 << (self.n_piles * self.bits)
+        codes = pack_boards(rules.boards, np.ones(rules.n_positions), self.bits) >> 1
+        code_dtype = np.int32 if n_codes <= 1 << 31 else np.int64
+        # next_code[code, action]: board bits after the move, -1 if illegal
+        self._next_code = np.full((n_codes, self.n_actions), -1, dtype=code_dtype)
+        self._next_code[codes] = np.where(rules.next_position >= 0, codes[np.maximum(rules.next_position, 0)], -1)
+        self._terminal = np.zeros(n_codes, dtype=bool)
+        self._terminal[codes] = rules.terminal
+        self._terminal_reward = rules.terminal_reward
+        legal = self._next_code >= 0
+        action_dtype = np.int8 if self.n_actions <= np.iinfo(np.int8).max else np.int32
+        self._n_legal = legal.sum(axis=1).astype(action_dtype)
+        # Legal actions of every board first, in action order
+        self._legal_actions = np.argsort(~legal, axis=1, kind='stable').astype(action_dtype)
+
+    @property
+    def nbytes(self):
+        """Bytes held per batch for the games' state and step outputs."""
+        return sum(array.nbytes for array in (self.words, self._autoreset, self._rewards, self._terminated))
+
+    def pack(self, boards, on_move):
+        """Pack boards and players into words of this batch's dtype."""
+        return pack_boards(boards, on_move, self.bits).astype(self.dtype)
+
+    def unpack(self, words=None):
+        """``(boards, on_move)`` arrays of ``words`` (default every game)."""
+        return unpack_boards(self.words if words is None else words, self.n_piles, self.bits)
+
+    @property
+    def on_move(self):
+        """Player on move in every game, 1 or 2."""
+        return 1 + (self.words & 1)
+
+    def reset(self, seed=None, options=None):
+        """Reset every game to its starting position.
+
+        Parameters
+        ----------
+        seed : int, optional
+            Seed for :meth:`sample_actions`.
+        options : dict, optional
+            ``{'board': boards, 'on_move': players}`` sets new starting
+            positions, one for all games or one per game. They are kept for
+            later autoresets until the next reset with either option.
+
+        Returns
+        -------
+        words : numpy.ndarray
+            The live :attr:`words`.
+        info : dict
+            Empty dictionary for compatibility.
+        """
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+        if options and ('board' in options or 'on_move' in options):
+            starts = self.unpack(np.atleast_1d(self.start_words))[0]
+            boards = np.asarray(options.get('board', starts[0] if len(starts) == 1 else starts))
+            on_move = np.asarray(options.get('on_move', 1))
+            if boards.ndim == 1 and on_move.ndim == 0:
+                self.start_words = self.pack([boards], [on_move])[0]
+            else:
+                boards = np.broadcast_to(boards, (self.num_games, self.n_piles))
+                self.start_words = self.pack(boards, np.broadcast_to(on_move, self.num_games))
+        self.words[:] = self.start_words
+        self._autoreset[:] = False
+        return self.words, {}
+
+    def step(self, actions):
+        """Play one action index (``max_take * pile + count - 1``) in every game.
+
+        Returns
+        -------
+        words : numpy.ndarray
+            The live :attr:`words` after the moves.
+        rewards : numpy.ndarray of int8
+        terminated : numpy.ndarray of bool
+        truncated : numpy.ndarray of bool
+            Always False.
+        info : dict
+            Empty dictionary for compatibility.
+        """
+        actions = np.asarray(actions)
+        words = self.words
+        in_range = (actions >= 0) & (actions < self.n_actions)
+        playing = ~self._autoreset
+        if self.tables:
+            child = self._next_code[words >> 1, np.where(in_range, actions, 0)]
+            legal = playing & in_range & (child >= 0)
+            ended = legal & self._terminal[np.maximum(child, 0)]
+            reward = self._terminal_reward
+            moved = child.astype(self.dtype) << 1
+        else:
+            pile = np.where(in_range, actions // self.max_take, 0).astype(self.dtype)
+            count = (actions % self.max_take + 1).astype(self.dtype)
+            shift = self._shifts[pile]
+            legal = playing & in_range & (((words >> shift) & self._pile_mask) >= count)
+            moved = words - (count << shift)
+            ended = legal & (((moved >> 1) & self._board_mask) == 0)
+            moved &= ~self.dtype.type(1)
+            reward = -1
+        continues = legal & ~ended
+        moved |= (words & 1) ^ continues
+        np.copyto(words, moved, where=legal)
+        illegal = playing & ~legal
+
+        rewards, terminated = self._rewards, self._terminated
+        rewards.fill(0)
+        rewards[ended] = reward
+        rewards[illegal] = -2
+        np.logical_or(ended, illegal, out=terminated)
+        if not playing.all():
+            np.copyto(words, np.broadcast_to(self.start_words, words.shape), where=self._autoreset)
+        self._autoreset[:] = terminated
+        return words, rewards, terminated, self._truncated, {}
+
+    def action_masks(self):
+        """Legal-action mask of every game, shape ``(num_games, n_actions)``."""
+        if self.tables:
+            return self._next_code[self.words >> 1] >= 0
+        boards, _ = self.unpack()
+        counts = np.arange(1, self.max_take + 1)
+        return (boards[:, :, None] >= counts).reshape(self.num_games, -1)
+
+    def sample_actions(self):
+        """One uniformly random legal action per game (0 where there is none).
+
+        Uses :attr:`np_random`, seeded by ``reset(seed=...)``.
+        """
+        rng = self.np_random
+        uniform = rng.random(self.num_games, dtype=np.float32)
+        if self.tables:
+            codes = self.words >> 1
+            n_legal = self._n_legal[codes]
+            choice = (uniform * n_legal).astype(np.intp)
+            return np.where(n_legal > 0, self._legal_actions[codes, np.minimum(choice, self.n_actions - 1)], 0)
+        boards, _ = self.unpack()
+        # Random non-empty pile, then a random count it allows
+        scores = np.where(boards > 0, rng.random(boards.shape, dtype=np.float32), -1)
+        pile = scores.argmax(axis=1)
+        most = np.minimum(boards[np.arange(self.num_games), pile], self.max_take)
+        count = 1 + (uniform * most).astype(np.int64)
+        return np.where(most > 0, pile * self.max_take + count - 1, 0)
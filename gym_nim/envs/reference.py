@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class NumpyStep:
+    """The original NumPy-backed ``NimEnv.step`` logic, kept as a reference.
+
+    This is the step ``NimEnv`` had before it moved onto
+    :class:`~gym_nim.envs.core.NimCore`: ``board[pile] -= count`` on an int32
+    array and a check of every pile for the end of the game. It shares no
+    code with the engines, so :mod:`gym_nim.parity` tests all of them against
+    it, and ``benchmarks/bench_step.py`` uses it as the speed baseline.
+
+    Variants are checked from the rule set's definition (its subtraction
+    set, Wythoff moves and misère flag), not from its lookup tables.
+
+    Parameters
+    ----------
+    rules : RuleSet, optional
+        Variant to play; without rules any positive count up to the pile
+        size is allowed, as in ``NimEnv``.
+
+    Examples
+    --------
+    >>> env = NumpyStep()
+    >>> state, info = env.reset()
+    >>> env.step([0, 2])[:3]
+    ({'board': array([5, 5, 3], dtype=int32), 'on_move': 2}, 0, False)
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules
+        self.state = None
+
+    def reset(self, board=(7, 5, 3), on_move=1):
+        """Start a game from ``board`` with ``on_move`` to play."""
+        self.state = {'board': np.array(board, dtype=np.int32), 'on_move': on_move}
+        return self.state, {}
+
+    def _targets(self, pile, count):
+        # Piles a move takes from, or None if no move of the variant matches
+        board = self.state['board']
+        rules = self.rules
+        if rules is None:
+            return [pile] if 0 <= pile < len(board) and count > 0 else None
+        if count not in rules.takes:
+            return None
+        if 0 <= pile < rules.n_piles:
+            return [pile]
+        if rules.wythoff and pile == rules.n_piles:
+            return list(range(rules.n_piles))
+        return None
+
+    def _has_move(self):
+        rules = self.rules
+        board = self.state['board']
+        if rules is None:
+            return any(pile_count > 0 for pile_count in board)
+        smallest = min(rules.takes)
+        return any(pile_count >= smallest for pile_count in board) or (
+            rules.wythoff and all(pile_count >= smallest for pile_count in board))
+
+    def step(self, action):
+        pile, count = action
+        board = self.state['board']
+        done = False
+        reward = 0
+        targets = self._targets(pile, count)
+        if targets is None or any(count > board[target] for target in targets):
+            done = True
+            reward = -2
+        else:
+            for target in targets:
+                board[target] -= count
+            if not self._has_move():
+                done = True
+                reward = -1 if self.rules is None else self.rules.terminal_reward
+            else:
+                self.state['on_move'] = 3 - self.state['on_move']
+        return self.state, reward, done, False, {}
@@ -0,0 +1,205 @@
+import gymnasium as gym
+from gymnasium.vector.utils import batch_space
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, action_masks
+from gym_nim.envs.nim_env import NimEnv
+from gym_nim.rules import resolve_rules
+
+try:
+    from gymnasium.vector import AutoresetMode
+    _NEXT_STEP = AutoresetMode.NEXT_STEP
+except ImportError:  # gymnasium < 1.1
+    _NEXT_STEP = 'NextStep'  # type: ignore[assignment]
+
+
+class NimVectorEnv(gym.vector.VectorEnv):
+    """A batch of independent Nim games stepped together with NumPy.
+
+    Every game follows the same rules as :class:`NimEnv`: an illegal move
+    ends the game with reward -2 and leaves the board unchanged, taking the
+    last piece ends it with reward -1, and ``on_move`` only switches when
+    the game continues.
+
+    Actions are either an ``(num_envs,)`` array of ``action_space`` indices
+    (``3 * pile + count - 1``) or an ``(num_envs, 2)`` array of
+    ``[pile, count]`` moves.
+
+    Finished games are reset on the following ``step()`` call, whose action
+    for that game is ignored (Gymnasium's "next step" autoreset).
+
+    With ``rules``, every game steps through the rule set's shared lookup
+    tables instead (see :mod:`gym_nim.rules`), and the terminal reward is
+    ``rules.terminal_reward``.
+
+    Parameters
+    ----------
+    num_envs : int
+        Number of games.
+    rules : RuleSet or str, optional
+        Variant to play, as for :class:`NimEnv`.
+
+    Examples
+    --------
+    >>> envs = NimVectorEnv(1024)
+    >>> obs, info = envs.reset(seed=0)
+    >>> obs['board'].shape
+    (1024, 3)
+    >>> masks = envs.action_masks()
+    >>> obs, rewards, terminated, truncated, info = envs.step(actions)
+    """
+    metadata = {'render_modes': [], 'autoreset_mode': _NEXT_STEP}
+
+    def __init__(self, num_envs, rules=None):
+        self.num_envs = num_envs
+        self.rules = rules = resolve_rules(rules)
+        single = NimEnv(rules)
+        self.single_observation_space = single.observation_space
+        self.single_action_space = single.action_space
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        start = (7, 5, 3) if rules is None else rules.start
+        self.start_boards = np.tile(np.array(start, dtype=np.int32), (num_envs, 1))
+        self.start_on_move = np.ones(num_envs, dtype=np.int32)
+
+        self.boards = np.zeros_like(self.start_boards)
+        self.on_move = np.ones(num_envs, dtype=np.int32)
+        self._autoreset = np.zeros(num_envs, dtype=bool)
+        self._rows = np.arange(num_envs)
+        # Rule-table position of every game, only used with rules
+        self.positions = np.zeros(num_envs, dtype=np.int64)
+
+    def _observation(self):
+        return {'board': self.boards.copy(), 'on_move': self.on_move.copy()}
+
+    def reset(self, seed=None, options=None):
+        """Reset every game to its starting position.
+
+        Parameters
+        ----------
+        seed : int, optional
+            Seed for ``np_random``.
+        options : dict, optional
+            ``{'board': boards}`` sets new starting positions, either one
+            board for all games or an ``(num_envs, 3)`` array, e.g. from
+            ``Curriculum.sample(num_envs)``, and ``{'on_move': players}``
+            the players to move first (default 1). They are kept for later
+            autoresets until the next reset with either option.
+
+        Returns
+        -------
+        observation : dict
+            ``'board'`` of shape ``(num_envs, 3)`` and ``'on_move'`` of shape
+            ``(num_envs,)``.
+        info : dict
+            Empty dictionary for compatibility.
+        """
+        if seed is not None:
+            self._np_random, self._np_random_seed = gym.utils.seeding.np_random(seed)
+        if options and ('board' in options or 'on_move' in options):
+            if 'board' in options:
+                self.start_boards[:] = options['board']
+            self.start_on_move[:] = options.get('on_move', 1)
+        if self.rules is not None:
+            self._start_positions = self._index(self.start_boards)
+            self.positions[:] = self._start_positions
+        self.boards[:] = self.start_boards
+        self.on_move[:] = self.start_on_move
+        self._autoreset[:] = False
+        return self._observation(), {}
+
+    def _index(self, boards):
+        rules = self.rules
+        if boards.min() < 0 or boards.max() > rules.max_pile:
+            raise ValueError(f"Start boards are outside the {rules.name} rule tables")
+        return boards.astype(np.int64) @ rules.radix
+
+    def _decode(self, actions):
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            return actions[:, 0], actions[:, 1]
+        return actions // MAX_TAKE, actions % MAX_TAKE + 1
+
+    def step(self, actions):
+        """Play one move in every game.
+
+        Returns
+        -------
+        observation : dict
+            Batched boards and players on move after the moves.
+        rewards : numpy.ndarray of int32
+            -1 for taking the last piece (``rules.terminal_reward`` with
+            rules), -2 for an illegal move, else 0.
+        terminated : numpy.ndarray of bool
+            True for games that ended with this move.
+        truncated : numpy.ndarray of bool
+            Always False.
+        info : dict
+            Empty dictionary for compatibility.
+        """
+        if self.rules is not None:
+            return self._step_rules(actions)
+        pile, count = self._decode(actions)
+        boards = self.boards
+        resetting = self._autoreset
+        playing = ~resetting
+
+        in_range = (pile >= 0) & (pile < boards.shape[1])
+        available = boards[self._rows, np.where(in_range, pile, 0)]
+        legal = playing & in_range & (count > 0) & (count <= available)
+
+        rows = self._rows[legal]
+        boards[rows, pile[legal]] -= count[legal]
+        emptied = legal & ~boards.any(axis=1)
+        continues = legal & ~emptied
+        self.on_move[continues] = 3 - self.on_move[continues]
+
+        rewards = np.zeros(self.num_envs, dtype=np.int32)
+        rewards[emptied] = -1
+        illegal = playing & ~legal
+        rewards[illegal] = -2
+        terminated = emptied | illegal
+
+        if resetting.any():
+            boards[resetting] = self.start_boards[resetting]
+            self.on_move[resetting] = self.start_on_move[resetting]
+        self._autoreset = terminated
+        return self._observation(), rewards, terminated, np.zeros(self.num_envs, dtype=bool), {}
+
+    def _step_rules(self, actions):
+        rules = self.rules
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = rules.action_indices(actions[:, 0], actions[:, 1])
+        resetting = self._autoreset
+        playing = ~resetting
+
+        in_range = (actions >= 0) & (actions < rules.n_actions)
+        children = rules.next_position[self.positions, np.where(in_range, actions, 0)]
+        legal = playing & in_range & (children >= 0)
+        moved = children[legal]
+        self.positions[legal] = moved
+        self.boards[legal] = rules.boards[moved]
+        ended = np.zeros(self.num_envs, dtype=bool)
+        ended[legal] = rules.terminal[moved]
+        continues = legal & ~ended
+        self.on_move[continues] = 3 - self.on_move[continues]
+
+        rewards = np.zeros(self.num_envs, dtype=np.int32)
+        rewards[ended] = rules.terminal_reward
+        illegal = playing & ~legal
+        rewards[illegal] = -2
+        terminated = ended | illegal
+
+        if resetting.any():
+            self.boards[resetting] = self.start_boards[resetting]
+            self.positions[resetting] = self._start_positions[resetting]
+            self.on_move[resetting] = self.start_on_move[resetting]
+        self._autoreset = terminated
+        return self._observation(), rewards, terminated, np.zeros(self.num_envs, dtype=bool), {}
+
+    def action_masks(self):
+        """Legal-action mask of every game, shape ``(num_envs, n_actions)``."""
+        if self.rules is not None:
+            return self.rules.legal[self.positions]
+        return action_masks(self.boards)
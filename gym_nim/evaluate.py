@@ -0,0 +1,209 @@
+"""Score agents against the exact solver in bulk.
+
+Instead of playing thousands of episodes and watching rolling rewards,
+:func:`evaluate` asks the agent for its move in every reachable position
+(or a random sample of them) in one batch, and checks each move against
+:class:`~gym_nim.solver.NimSolver`:
+
+- in a **won** position a move is optimal if it keeps the win;
+- in a **lost** position every move loses, and a move counts as optimal if
+  it holds out as long as possible (the solver's slowest loss).
+
+Accuracy is reported overall and broken down by position class: outcome
+(won/lost), solver depth to the end, and pieces on the board.
+
+Example
+-------
+>>> report = evaluate(compile_policy(Q))
+>>> report['accuracy'], report['illegal']
+(0.93, 0.0)
+>>> print(format_report(report))
+
+From the command line, for a Q-table or compiled policy saved with
+``np.save``::
+
+    python -m gym_nim.evaluate policy.npy
+"""
+import argparse
+
+import numpy as np
+
+from gym_nim.agents.compiled import CompiledPolicy
+from gym_nim.encoding import PILE_BITS, index_to_action, pack_boards
+from gym_nim.solver import NimSolver
+
+CLASSES = ('outcome', 'depth', 'pieces')
+
+
+def reachable_positions(solver, start=None):
+    """Solver position indices reachable from ``start``, excluding terminal ones.
+
+    Parameters
+    ----------
+    solver : NimSolver
+    start : sequence of int, optional
+        Starting board (default ``solver.rules.start``).
+
+    Returns
+    -------
+    numpy.ndarray of int
+    """
+    start = solver.rules.start if start is None else start
+    seen = np.zeros(solver.n_positions, dtype=bool)
+    seen[solver.index(start)] = True
+    frontier = seen.copy()
+    while frontier.any():
+        children = solver.children[frontier][solver.legal[frontier]]
+        new = np.zeros_like(seen)
+        new[children] = True
+        new &= ~seen
+        seen |= new
+        frontier = new
+    return np.flatnonzero(seen & ~solver.terminal)
+
+
+def choose_actions(agent, boards, on_move, masks, max_take=3):
+    """The action index ``agent`` plays in each position (-1 for no move).
+
+    Parameters
+    ----------
+    agent : NimSolver, CompiledPolicy, numpy.ndarray, agent or callable
+        - a :class:`NimSolver` or :class:`CompiledPolicy`;
+        - a Q-table indexed by packed state (see :mod:`gym_nim.encoding`),
+          played greedily over legal actions;
+        - an object with a batched ``act(boards, masks)`` method, such as
+          :class:`~gym_nim.agents.MLPAgent`;
+        - a callable ``policy(state, moves)`` as accepted by
+          :func:`~gym_nim.agents.compile_policy`, called once per position.
+    boards : numpy.ndarray, shape (n, n_piles)
+    on_move : numpy.ndarray, shape (n,)
+    masks : numpy.ndarray of bool, shape (n, n_actions)
+    max_take : int, optional
+        Action layout used to translate moves for callables (default 3).
+    """
+    if isinstance(agent, NimSolver):
+        return agent.best_action[boards @ agent.radix]
+    if isinstance(agent, CompiledPolicy):
+        return agent.act_index(pack_boards(boards, on_move, agent.bits)).astype(np.int64)
+    if isinstance(agent, np.ndarray):
+        values = np.where(masks, agent[pack_boards(boards, on_move, PILE_BITS)], -np.inf)
+        return np.where(masks.any(axis=1), values.argmax(axis=1), -1)
+    if hasattr(agent, 'act'):
+        return np.where(masks.any(axis=1), agent.act(boards, masks), -1)
+    actions = np.full(len(boards), -1, dtype=np.int64)
+    for i in range(len(boards)):
+        moves = [index_to_action(a, max_take) for a in np.flatnonzero(masks[i])]
+        if moves:
+            state = {'board': boards[i].astype(np.int32), 'on_move': int(on_move[i])}
+            pile, count = agent(state, moves)
+            actions[i] = pile * max_take + count - 1
+    return actions
+
+
+def _summary(mask, correct, illegal):
+    n = int(mask.sum())
+    return {
+        'positions': n,
+        'accuracy': float(correct[mask].mean()) if n else float('nan'),
+        'illegal': float(illegal[mask].mean()) if n else float('nan'),
+    }
+
+
+def evaluate(agent, solver=None, positions='reachable', players=(1, 2), start=None, seed=None):
+    """Compare ``agent``'s moves with the solver's in one vectorized pass.
+
+    Parameters
+    ----------
+    agent
+        Anything :func:`choose_actions` accepts.
+    solver : NimSolver, optional
+        Reference solver (default ``NimSolver()``).
+    positions : {'reachable', 'all'} or int, optional
+        Evaluate every position reachable from ``start`` (default), every
+        non-terminal position, or a random sample of that many reachable
+        positions.
+    players : sequence of int, optional
+        Players on move to evaluate each board for (default both). Only
+        agents that look at ``on_move``, such as Q-tables, can differ.
+    start : sequence of int, optional
+        Starting board for ``'reachable'`` (default the rule set's start).
+    seed : int, optional
+        Seed for sampling.
+
+    Returns
+    -------
+    dict
+        ``positions``, ``accuracy`` and ``illegal`` (rate of illegal or
+        missing moves) over all evaluated positions, plus ``by_class``
+        mapping each of :data:`CLASSES` to ``{value: summary}`` dicts with
+        the same three keys.
+    """
+    solver = NimSolver() if solver is None else solver
+    if isinstance(positions, str):
+        if positions == 'reachable':
+            indices = reachable_positions(solver, start)
+        elif positions == 'all':
+            indices = np.flatnonzero(~solver.terminal)
+        else:
+            raise ValueError(f"Unknown positions {positions!r}; expected 'reachable', 'all' or an int")
+    else:
+        pool = reachable_positions(solver, start)
+        rng = np.random.default_rng(seed)
+        indices = rng.choice(pool, size=positions, replace=positions > len(pool))
+
+    indices = np.tile(indices, len(players))
+    on_move = np.repeat(np.asarray(players), len(indices) // len(players))
+    boards = solver.boards[indices]
+    masks = solver.legal[indices]
+    actions = np.asarray(choose_actions(agent, boards, on_move, masks, solver.max_take))
+
+    rows = np.arange(len(indices))
+    chosen = np.clip(actions, 0, solver.n_actions - 1)
+    legal = (actions >= 0) & (actions < solver.n_actions) & masks[rows, chosen]
+    won = solver.win[indices]
+    child_depth = solver.depth[solver.children[indices]]
+    longest = np.where(masks, child_depth, -1).max(axis=1)
+    correct = legal & np.where(won, solver.winning[indices, chosen], child_depth[rows, chosen] == longest)
+    illegal = ~legal
+
+    report = _summary(np.ones(len(indices), dtype=bool), correct, illegal)
+    values = {
+        'outcome': np.where(won, 'won', 'lost'),
+        'depth': solver.depth[indices],
+        'pieces': boards.sum(axis=1),
+    }
+    report['by_class'] = {
+        name: {value.item(): _summary(column == value, correct, illegal) for value in np.unique(column)}
+        for name, column in values.items()
+    }
+    return report
+
+
+def format_report(report):
+    """Render an :func:`evaluate` report as a text table."""
+    lines = [f"{report['positions']} positions: {report['accuracy']:.1%} optimal, "
+             f"{report['illegal']:.1%} illegal"]
+    for name, classes in report['by_class'].items():
+        lines.append(f"\nby {name}:")
+        for value, summary in classes.items():
+            lines.append(f"  {str(value):>6s}  {summary['positions']:6d}  "
+                         f"{summary['accuracy']:7.1%}  {summary['illegal']:7.1%} illegal")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a saved Q-table or compiled policy against the solver.")
+    parser.add_argument('path', help="A .npy Q-table (2-D) or CompiledPolicy table (1-D)")
+    parser.add_argument('--positions', default='reachable',
+                        help="'reachable', 'all' or a sample size (default: reachable)")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    table = np.load(args.path, mmap_mode='r')
+    agent = CompiledPolicy(table) if table.ndim == 1 else np.asarray(table)
+    positions = int(args.positions) if args.positions.isdigit() else args.positions
+    print(format_report(evaluate(agent, positions=positions, seed=args.seed)))
+
+
+if __name__ == '__main__':
+    main()
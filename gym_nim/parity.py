@@ -0,0 +1,464 @@
+"""Differential testing of every Nim engine against an independent reference.
+
+The reference is :class:`~gym_nim.envs.reference.NumpyStep`, the original
+NumPy step logic of ``NimEnv``, which checks variants from their definition
+rather than from the rule tables and shares no code with the engines. The
+package steps games in several other ways: ``NimEnv``, the
+pure-Python :class:`~gym_nim.envs.core.NimCore`, the table-driven
+:class:`~gym_nim.envs.core.RuleSetCore`, the NumPy-batched
+:class:`~gym_nim.envs.NimVectorEnv` (fed moves or action indices),
+:class:`~gym_nim.envs.NimParallelEnv` and the packed-word
+:class:`~gym_nim.envs.PackedNimBatch` (table and bitwise paths). Each of
+them is a fast path that could drift from the reference semantics: -2 and
+no board change for an illegal move, the terminal reward when the game
+ends, and ``on_move`` switching only when the game continues.
+
+:func:`run_parity` feeds the same games to every backend and compares the
+full trajectories, the position, reward and termination after every move.
+Two kinds of input are generated:
+
+- :func:`exhaustive_transitions`: one move from every position of the rule
+  tables, for both players and every move of the tested domain (piles from
+  -1 to one past the last, counts from 0 to ``max_take``);
+- :func:`random_games`: games from random start positions, mostly legal
+  moves with an occasional random (often illegal) one.
+
+Games are split into shards of at most :data:`SHARD_GAMES`. Each shard is
+replayed on the reference and every backend inside one task, in a worker
+process when ``workers > 1``, and compared there, so only timings and
+mismatches travel back. The report includes each backend's speed relative
+to the reference.
+
+Counts stay within ``0 .. max_take``: without rules, ``NimEnv`` also
+accepts larger counts, but action indices and the rule tables cannot
+express them.
+
+Example
+-------
+>>> report = run_parity(random_games(100000, seed=0), workers=4)
+>>> report['ok']
+True
+>>> print(format_report(report))
+
+From the command line::
+
+    python -m gym_nim.parity --games 1000000 --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE
+from gym_nim.envs import NimEnv, NimParallelEnv, NimVectorEnv, PackedNimBatch
+from gym_nim.envs.core import NimCore, RuleSetCore
+from gym_nim.envs.reference import NumpyStep
+from gym_nim.rules import make_rules, resolve_rules
+
+REFERENCE = 'NumpyStep'
+# Largest number of games replayed and compared in one task
+SHARD_GAMES = 100000
+FIELDS = ('boards', 'on_move', 'rewards', 'terminated')
+
+
+class Games:
+    """A batch of games to replay on every backend.
+
+    Attributes
+    ----------
+    starts : numpy.ndarray, shape (n_games, n_piles)
+        Starting boards.
+    first : numpy.ndarray, shape (n_games,)
+        Player to move first.
+    moves : numpy.ndarray, shape (n_games, n_plies, 2)
+        ``[pile, count]`` moves. Every game ends within ``n_plies`` moves;
+        moves after its end are ignored.
+    """
+
+    def __init__(self, starts, first, moves):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.first = np.asarray(first, dtype=np.int64)
+        self.moves = np.asarray(moves, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.first)
+
+    @property
+    def n_plies(self):
+        return self.moves.shape[1]
+
+    def split(self, n):
+        """Split into up to ``n`` batches of consecutive games."""
+        bounds = np.linspace(0, len(self), n + 1).astype(int)
+        return [Games(self.starts[a:b], self.first[a:b], self.moves[a:b])
+                for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def _tables(rules):
+    # Legal moves of the action-space domain match the misère tables
+    return resolve_rules(rules) or make_rules()
+
+
+def _domain(rules):
+    piles = np.arange(-1, rules.n_kinds + 1)
+    counts = np.arange(0, rules.max_take + 1)
+    return np.stack(np.meshgrid(piles, counts, indexing='ij'), axis=-1).reshape(-1, 2)
+
+
+def exhaustive_transitions(rules=None):
+    """Every move of the domain from every position, for both players.
+
+    Returns
+    -------
+    Games
+        One-move games.
+    """
+    tables = _tables(rules)
+    domain = _domain(tables)
+    positions = np.arange(tables.n_positions)
+    position, player, move = (grid.ravel() for grid in np.meshgrid(
+        positions, [1, 2], np.arange(len(domain)), indexing='ij'))
+    return Games(tables.boards[position], player, domain[move][:, None, :])
+
+
+def random_games(n_games, rules=None, illegal_rate=0.05, seed=None):
+    """Random games from random start positions.
+
+    Each move is a uniformly random legal one, except that with probability
+    ``illegal_rate`` it is drawn from the whole domain instead (and is then
+    usually illegal, which ends the game).
+
+    Parameters
+    ----------
+    n_games : int
+    rules : RuleSet or str, optional
+        Rules whose tables drive the generator (default the ``NimEnv`` game).
+    illegal_rate : float, optional
+        Probability of a random move from the domain (default 0.05).
+    seed : int, optional
+
+    Returns
+    -------
+    Games
+    """
+    tables = _tables(rules)
+    rng = np.random.default_rng(seed)
+    domain = _domain(tables)
+    playable = np.flatnonzero(~tables.terminal)
+    position = rng.choice(playable, n_games)
+    starts = tables.boards[position]
+    first = rng.integers(1, 3, n_games)
+    n_plies = int(tables.boards.sum(axis=1).max()) + 1
+    moves = np.zeros((n_games, n_plies, 2), dtype=np.int64)
+    moves[:, :, 1] = 1
+    live = np.ones(n_games, dtype=bool)
+    actions = np.arange(tables.n_actions)
+    for ply in range(n_plies):
+        if not live.any():
+            break
+        rows = np.flatnonzero(live)
+        legal = tables.legal[position[rows]]
+        action = np.where(legal, rng.random(legal.shape), -1.0).argmax(axis=1)
+        move = np.stack([actions[action] // tables.max_take, actions[action] % tables.max_take + 1], axis=1)
+        wild = rng.random(len(rows)) < illegal_rate
+        move[wild] = domain[rng.integers(len(domain), size=wild.sum())]
+        moves[rows, ply] = move
+        action = tables.action_indices(move[:, 0], move[:, 1])
+        child = tables.next_position[position[rows], np.maximum(action, 0)]
+        ok = (action >= 0) & (child >= 0)
+        position[rows[ok]] = child[ok]
+        live[rows[~ok]] = False
+        live[rows[ok]] = ~tables.terminal[child[ok]]
+    return Games(starts, first, moves)
+
+
+def _empty(games):
+    n, n_plies = len(games), games.n_plies
+    return {
+        'boards': np.full((n, n_plies, games.starts.shape[1]), -1, dtype=np.int16),
+        'on_move': np.zeros((n, n_plies), dtype=np.int8),
+        'rewards': np.zeros((n, n_plies), dtype=np.int8),
+        'terminated': np.zeros((n, n_plies), dtype=bool),
+    }
+
+
+def _run_reference(games, rules):
+    out = _empty(games)
+    env = NumpyStep(resolve_rules(rules))
+    for i in range(len(games)):
+        env.reset(games.starts[i], int(games.first[i]))
+        for ply, (pile, count) in enumerate(games.moves[i].tolist()):
+            state, reward, terminated, _, _ = env.step([pile, count])
+            out['boards'][i, ply] = state['board']
+            out['on_move'][i, ply] = state['on_move']
+            out['rewards'][i, ply] = reward
+            out['terminated'][i, ply] = terminated
+            if terminated:
+                break
+    return out
+
+
+def _run_env(games, rules):
+    out = _empty(games)
+    env = NimEnv(rules, verbose=False)
+    for i in range(len(games)):
+        env.reset(options={'board': games.starts[i], 'on_move': int(games.first[i])})
+        for ply, (pile, count) in enumerate(games.moves[i].tolist()):
+            state, reward, terminated, _, _ = env.step([pile, count])
+            out['boards'][i, ply] = state['board']
+            out['on_move'][i, ply] = state['on_move']
+            out['rewards'][i, ply] = reward
+            out['terminated'][i, ply] = terminated
+            if terminated:
+                break
+    return out
+
+
+def _run_core(games, rules):
+    out = _empty(games)
+    rules = resolve_rules(rules)
+    for i in range(len(games)):
+        board, first = games.starts[i].tolist(), int(games.first[i])
+        core = NimCore(board, first) if rules is None else RuleSetCore(rules, board, first)
+        for ply, (pile, count) in enumerate(games.moves[i].tolist()):
+            reward, done = core.play(pile, count)
+            out['boards'][i, ply] = core.board
+            out['on_move'][i, ply] = core.on_move
+            out['rewards'][i, ply] = reward
+            out['terminated'][i, ply] = done
+            if done:
+                break
+    return out
+
+
+def _record_batch(out, ply, boards, on_move, rewards, terminated, live):
+    out['boards'][live, ply] = boards[live]
+    out['on_move'][live, ply] = on_move[live]
+    out['rewards'][live, ply] = rewards[live]
+    out['terminated'][live, ply] = terminated[live]
+    return live & ~terminated
+
+
+def _as_indices(moves, rules):
+    pile, count = moves[:, 0], moves[:, 1]
+    if rules is not None:
+        return rules.action_indices(pile, count)
+    # Moves without an index are played as -1, which is illegal
+    encodable = (pile >= 0) & (count >= 1) & (count <= MAX_TAKE)
+    return np.where(encodable, pile * MAX_TAKE + count - 1, -1)
+
+
+def _run_vector(games, rules, indices=False):
+    out = _empty(games)
+    rules = resolve_rules(rules)
+    envs = NimVectorEnv(len(games), rules)
+    envs.reset(options={'board': games.starts, 'on_move': games.first})
+    live = np.ones(len(games), dtype=bool)
+    for ply in range(games.n_plies):
+        moves = games.moves[:, ply]
+        actions = _as_indices(moves, rules) if indices else moves
+        obs, rewards, terminated, _, _ = envs.step(actions)
+        live = _record_batch(out, ply, obs['board'], obs['on_move'], rewards, terminated, live)
+        if not live.any():
+            break
+    return out
+
+
+def _run_parallel(games, rules):
+    out = _empty(games)
+    envs = NimParallelEnv(len(games), rules)
+    observations, _ = envs.reset(options={'board': games.starts, 'on_move': games.first})
+    live = np.ones(len(games), dtype=bool)
+    for ply in range(games.n_plies):
+        mover = observations['player_1']['on_move'].copy()
+        observations, rewards, terminations, _, _ = envs.step(games.moves[:, ply])
+        obs = observations['player_1']
+        own = np.where(mover == 1, rewards['player_1'], rewards['player_2'])
+        live = _record_batch(out, ply, obs['board'], obs['on_move'], own, terminations['player_1'], live)
+        if not live.any():
+            break
+    return out
+
+
+def _run_packed(games, rules, tables=None):
+    if rules is not None and tables is False:
+        return None  # bit arithmetic only plays the NimEnv game
+    out = _empty(games)
+    rules = resolve_rules(rules)
+    batch = PackedNimBatch(len(games), rules, tables=tables)
+    batch.reset(options={'board': games.starts, 'on_move': games.first})
+    live = np.ones(len(games), dtype=bool)
+    for ply in range(games.n_plies):
+        _, rewards, terminated, _, _ = batch.step(_as_indices(games.moves[:, ply], rules))
+        boards, on_move = batch.unpack()
+        live = _record_batch(out, ply, boards, on_move, rewards, terminated, live)
+        if not live.any():
+            break
+    return out
+
+
+BACKENDS = {
+    'NumpyStep': _run_reference,
+    'NimEnv': _run_env,
+    'NimCore': _run_core,
+    'NimVectorEnv': _run_vector,
+    'NimVectorEnv[index]': lambda games, rules: _run_vector(games, rules, indices=True),
+    'NimParallelEnv': _run_parallel,
+    'PackedNimBatch': _run_packed,
+    'PackedNimBatch[bitwise]': lambda games, rules: _run_packed(games, rules, tables=False),
+}
+"""Backend name to ``runner(games, rules)`` returning trajectory arrays.
+
+``NimCore`` stands for :class:`RuleSetCore` when rules are given. A runner
+returns None for rules it does not support, and is left out of the report.
+"""
+
+
+def run_backend(name, games, rules=None):
+    """Replay ``games`` on one backend.
+
+    Returns
+    -------
+    trajectories : dict of numpy.ndarray
+        ``boards``, ``on_move``, ``rewards`` and ``terminated`` after every
+        move, shape ``(n_games, n_plies, ...)``, with fill values after the
+        end of each game.
+    seconds : float
+        Time spent replaying.
+    """
+    start = time.perf_counter()
+    trajectories = BACKENDS[name](games, rules)
+    return trajectories, time.perf_counter() - start
+
+
+def _task(args):
+    # Replay one shard on the reference and each backend, comparing in place
+    names, games, rules = args
+    reference, reference_seconds = run_backend(REFERENCE, games, rules)
+    results = {REFERENCE: (reference_seconds, None)}
+    for name in names:
+        if name == REFERENCE:
+            continue
+        trajectories, seconds = run_backend(name, games, rules)
+        if trajectories is not None:
+            results[name] = (seconds, compare(reference, trajectories))
+    return int((reference['on_move'] > 0).sum()), results
+
+
+def compare(reference, trajectories):
+    """First mismatch between two trajectory dicts, or None if identical.
+
+    Returns
+    -------
+    dict or None
+        ``{'game', 'ply', 'field', 'expected', 'actual'}``.
+    """
+    for field in FIELDS:
+        expected, actual = reference[field], trajectories[field]
+        differs = expected != actual
+        if differs.ndim == 3:
+            differs = differs.any(axis=2)
+        if differs.any():
+            game, ply = (int(i) for i in np.argwhere(differs)[0])
+            return {'game': game, 'ply': ply, 'field': field,
+                    'expected': expected[game, ply].tolist(), 'actual': actual[game, ply].tolist()}
+    return None
+
+
+def run_parity(games, backends=None, rules=None, workers=1, shards=None):
+    """Replay ``games`` on every backend and compare with the reference.
+
+    Parameters
+    ----------
+    games : Games
+        E.g. from :func:`random_games` or :func:`exhaustive_transitions`.
+    backends : sequence of str, optional
+        Names from :data:`BACKENDS` (default all).
+    rules : RuleSet or str, optional
+        Variant to play; the games must fit its tables.
+    workers : int, optional
+        Worker processes (default 1, which runs everything in this process).
+    shards : int, optional
+        Batches the games are split into (default enough for
+        :data:`SHARD_GAMES` games each, and at least ``workers``).
+
+    Returns
+    -------
+    dict
+        ``ok``, ``games``, ``moves`` (moves played by the reference), and
+        ``backends`` mapping each name to ``{'seconds', 'moves_per_second',
+        'speedup', 'mismatch'}``, where ``speedup`` is relative to the
+        reference and ``mismatch`` is None or a :func:`compare` result
+        with ``game`` counted in ``games``.
+    """
+    names = list(BACKENDS) if backends is None else list(backends)
+    if REFERENCE not in names:
+        names.insert(0, REFERENCE)
+    parts = games.split(shards or max(workers, -(-len(games) // SHARD_GAMES)))
+    tasks = [(names, part, rules) for part in parts]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_task, tasks))
+    else:
+        results = [_task(task) for task in tasks]
+
+    n_moves = sum(moves for moves, _ in results)
+    merged = {}
+    offset = 0
+    for part, (_, shard) in zip(parts, results):
+        for name, (seconds, mismatch) in shard.items():
+            total, first = merged.get(name, (0.0, None))
+            if first is None and mismatch is not None:
+                first = dict(mismatch, game=mismatch['game'] + offset)
+            merged[name] = (total + seconds, first)
+        offset += len(part)
+
+    reference_seconds = merged[REFERENCE][0]
+    report = {'games': len(games), 'moves': n_moves, 'backends': {}}
+    for name in names:
+        if name not in merged:
+            continue
+        seconds, mismatch = merged[name]
+        report['backends'][name] = {
+            'seconds': seconds,
+            'moves_per_second': n_moves / seconds if seconds else float('inf'),
+            'speedup': reference_seconds / seconds if seconds else float('inf'),
+            'mismatch': mismatch,
+        }
+    report['ok'] = all(result['mismatch'] is None for result in report['backends'].values())
+    return report
+
+
+def format_report(report):
+    """Render a :func:`run_parity` report as a text table."""
+    lines = [f"{report['games']} games, {report['moves']} moves: "
+             f"{'all backends match' if report['ok'] else 'MISMATCH'}"]
+    for name, result in report['backends'].items():
+        status = 'ok' if result['mismatch'] is None else f"differs: {result['mismatch']}"
+        lines.append(f"  {name:24s} {result['moves_per_second']:12,.0f} moves/s  "
+                     f"{result['speedup']:7.2f}x  {status}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that every engine backend matches the reference step.")
+    parser.add_argument('--games', type=int, default=100000, help="Random games (default 100000)")
+    parser.add_argument('--rules', default=None, help="Variant name, e.g. 'normal' (default: NimEnv's game)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--backends', nargs='*', default=None, choices=list(BACKENDS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rules = make_rules(args.rules) if args.rules else None
+    ok = True
+    for title, games in [('exhaustive transitions', exhaustive_transitions(rules)),
+                         ('random games', random_games(args.games, rules, seed=args.seed))]:
+        report = run_parity(games, args.backends, rules, workers=args.workers)
+        print(f"{title}: {format_report(report)}")
+        ok &= report['ok']
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+"""Pools of ready-made Nim environments.
+
+``gym.make('nim-v0')`` looks the id up in the registry, builds the spaces
+and wraps the env in ``PassiveEnvChecker`` and ``OrderEnforcing``. That is
+negligible once, but evaluation jobs that create and discard thousands of
+envs spend most of their time there. An :class:`EnvPool` builds its envs
+once and hands them out again and again, at the cost of a ``reset()``.
+
+Example
+-------
+>>> pool = make_pool(32, fast=True)
+>>> with pool.lease(4) as envs:
+...     for env in envs:
+...         state, reward, terminated, truncated, info = env.step([0, 1])
+>>> pool.available
+32
+"""
+from collections import deque
+from contextlib import contextmanager
+
+import gymnasium as gym
+
+from gym_nim.envs import NimEnv
+
+
+class EnvPool:
+    """A fixed set of Nim envs that are reused instead of rebuilt.
+
+    Parameters
+    ----------
+    n : int
+        Number of envs to build up front.
+    fast : bool, optional
+        If True, build :class:`NimEnv` instances directly, skipping the
+        registry and the ``PassiveEnvChecker``/``OrderEnforcing`` wrappers.
+        Meant for trusted code that already uses the env correctly. If
+        False (default), envs come from ``gym.make(env_id)``.
+    env_id : str, optional
+        Registered id used when ``fast`` is False (default ``'nim-v0'``).
+    **kwargs
+        Passed to ``NimEnv`` (or ``gym.make``), e.g. ``rules='normal'`` or
+        ``observation_mode='tuple'``.
+
+    Attributes
+    ----------
+    envs : list
+        Every env owned by the pool, whether leased or not.
+    """
+
+    def __init__(self, n, fast=False, env_id='nim-v0', **kwargs):
+        self.fast = fast
+        self.env_id = env_id
+        self.kwargs = kwargs
+        self.envs = [self._build() for _ in range(n)]
+        self._free = deque(self.envs)
+        # Envs (and gym wrappers) hash by identity
+        self._leased = set()
+
+    def _build(self):
+        if self.fast:
+            return NimEnv(**self.kwargs)
+        return gym.make(self.env_id, **self.kwargs)
+
+    def __len__(self):
+        return len(self.envs)
+
+    def __iter__(self):
+        return iter(self.envs)
+
+    def __getitem__(self, index):
+        return self.envs[index]
+
+    @property
+    def available(self):
+        """Number of envs not currently leased."""
+        return len(self._free)
+
+    def acquire(self, seed=None, options=None):
+        """Take an env out of the pool, freshly reset.
+
+        If every env is leased, one more is built and added to the pool.
+
+        Parameters
+        ----------
+        seed, options
+            Passed to ``reset()``, e.g. ``options={'board': [...]}``. If
+            ``reset()`` raises, the env stays in the pool.
+        """
+        if self._free:
+            env = self._free.popleft()
+        else:
+            env = self._build()
+            self.envs.append(env)
+        try:
+            env.reset(seed=seed, options=options)
+        except BaseException:
+            self._free.appendleft(env)
+            raise
+        self._leased.add(env)
+        return env
+
+    def release(self, env):
+        """Return an env obtained from :meth:`acquire` to the pool.
+
+        Raises
+        ------
+        ValueError
+            If ``env`` is not currently leased from this pool, e.g. when it
+            is released twice.
+        """
+        if env not in self._leased:
+            raise ValueError("Env is not leased from this pool; it was released already or never acquired")
+        self._leased.remove(env)
+        self._free.append(env)
+
+    @contextmanager
+    def lease(self, k=1, seed=None, options=None):
+        """Acquire ``k`` reset envs for the duration of a ``with`` block.
+
+        If one of them fails to reset, the envs acquired so far are released.
+        """
+        envs = []
+        try:
+            for _ in range(k):
+                envs.append(self.acquire(seed=seed, options=options))
+            yield envs
+        finally:
+            for env in envs:
+                self.release(env)
+
+    def reset_all(self, seed=None, options=None):
+        """Reset every env in the pool; returns the list of observations."""
+        return [env.reset(seed=seed, options=options)[0] for env in self.envs]
+
+    def close(self):
+        """Close every env and empty the pool."""
+        for env in self.envs:
+            env.close()
+        self.envs = []
+        self._free.clear()
+        self._leased.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def make_pool(n, fast=False, **kwargs):
+    """Build an :class:`EnvPool` of ``n`` Nim envs.
+
+    Parameters
+    ----------
+    n : int
+        Number of envs.
+    fast : bool, optional
+        Skip ``gym.make`` and its checker wrappers (default False).
+    **kwargs
+        Passed on to :class:`EnvPool`.
+
+    Examples
+    --------
+    >>> pool = gym_nim.make_pool(1000, fast=True, observation_mode='tuple')
+    >>> env = pool.acquire(options={'board': [3, 2, 1]})
+    >>> pool.release(env)
+    """
+    return EnvPool(n, fast=fast, **kwargs)
@@ -0,0 +1,220 @@
+"""Opt-in profiling hooks for the Nim environment.
+
+Profiling is enabled per environment instance by attaching an
+:class:`EnvProfiler`. Attaching shadows ``step``, ``reset`` and
+``move_generator`` with timed versions on the instance only, so environments
+that are never attached run the plain class methods and pay nothing.
+
+Example
+-------
+>>> env = gym.make('nim-v0')
+>>> profiler = EnvProfiler().attach(env)
+>>> state, info = env.reset()
+>>> with profiler.section('agent'):
+...     moves = env.unwrapped.move_generator()
+>>> state, reward, terminated, truncated, info = env.step(moves[0])
+>>> profiler.to_dict()['calls']['step']
+1
+>>> pstats.Stats(profiler).sort_stats('cumulative').print_stats()
+"""
+import json
+import marshal
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class EnvProfiler:
+    """Collects call counts, timings and game statistics from a NimEnv.
+
+    Parameters
+    ----------
+    clock : callable, optional
+        Zero-argument function returning the current time in seconds.
+        Defaults to ``time.perf_counter``.
+
+    Attributes
+    ----------
+    illegal_moves : int
+        Number of steps that were rejected as illegal (reward -2).
+    episode_lengths : collections.Counter
+        Histogram mapping episode length in steps to number of episodes.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._patched = []
+        self._keys = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Discard all collected statistics, keeping attached hooks in place."""
+        self.calls = Counter()
+        self.total_time = Counter()
+        self.own_time = Counter()
+        self.callers = {}
+        self.illegal_moves = 0
+        self.episode_lengths = Counter()
+        self._episode_steps = 0
+        self._stack = []
+
+    def attach(self, env):
+        """Instrument ``env`` and, if it is wrapped, its outermost wrapper.
+
+        The unwrapped NimEnv reports under ``step``, ``reset`` and
+        ``move_generator``. A wrapped env additionally reports
+        ``wrapper.step`` and ``wrapper.reset``, whose own time is the
+        overhead added by the wrapper stack.
+
+        Returns
+        -------
+        EnvProfiler
+            The profiler itself, for chaining.
+        """
+        core = env.unwrapped
+        self._patch(core, 'step', 'step', self._timed_step)
+        self._patch(core, 'reset', 'reset', self._timed_episode_start)
+        self._patch(core, 'move_generator', 'move_generator', self._timed)
+        if env is not core:
+            self._patch(env, 'step', 'wrapper.step', self._timed)
+            self._patch(env, 'reset', 'wrapper.reset', self._timed)
+        return self
+
+    def detach(self):
+        """Remove every hook installed by :meth:`attach`."""
+        for obj, attr, previous in reversed(self._patched):
+            if previous is None:
+                del obj.__dict__[attr]
+            else:
+                setattr(obj, attr, previous)
+        self._patched = []
+
+    def _patch(self, obj, attr, name, make_timed):
+        previous = obj.__dict__.get(attr)
+        func = getattr(obj, attr)
+        code = getattr(func, '__code__', None)
+        if code is not None:
+            self._keys[name] = (code.co_filename, code.co_firstlineno, name)
+        else:
+            self._keys[name] = ('~', 0, name)
+        setattr(obj, attr, make_timed(func, name))
+        self._patched.append((obj, attr, previous))
+
+    def _enter(self, name):
+        parent = self._stack[-1][0] if self._stack else None
+        self._stack.append([name, 0.0])
+        self.calls[name] += 1
+        callers = self.callers.setdefault(name, Counter())
+        callers[parent] += 1
+
+    def _exit(self, elapsed):
+        name, child_time = self._stack.pop()
+        self.total_time[name] += elapsed
+        self.own_time[name] += elapsed - child_time
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def _timed(self, func, name):
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            self._enter(name)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(clock() - start)
+        return timed
+
+    def _timed_step(self, func, name):
+        timed = self._timed(func, name)
+
+        def step(action):
+            result = timed(action)
+            self._episode_steps += 1
+            if result[1] == -2:
+                self.illegal_moves += 1
+            if result[2] or result[3]:
+                self.episode_lengths[self._episode_steps] += 1
+                self._episode_steps = 0
+            return result
+        return step
+
+    def _timed_episode_start(self, func, name):
+        timed = self._timed(func, name)
+
+        def reset(*args, **kwargs):
+            self._episode_steps = 0
+            return timed(*args, **kwargs)
+        return reset
+
+    @contextmanager
+    def section(self, name):
+        """Time an arbitrary block of code, such as agent move selection.
+
+        Examples
+        --------
+        >>> with profiler.section('agent'):
+        ...     action = agent.act(state)
+        """
+        self._keys.setdefault(name, ('~', 0, name))
+        self._enter(name)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._exit(self.clock() - start)
+
+    def wrap(self, func, name=None):
+        """Return ``func`` timed under ``name`` (defaults to its qualified name)."""
+        name = name or getattr(func, '__qualname__', repr(func))
+        code = getattr(func, '__code__', None)
+        if code is not None:
+            self._keys.setdefault(name, (code.co_filename, code.co_firstlineno, name))
+        else:
+            self._keys.setdefault(name, ('~', 0, name))
+        return self._timed(func, name)
+
+    def to_dict(self):
+        """Export the collected statistics as plain, JSON-serializable data.
+
+        Returns
+        -------
+        dict
+            Keys ``calls``, ``total_time``, ``own_time`` (per hook name),
+            ``illegal_moves``, ``episodes`` and ``episode_lengths``.
+        """
+        return {
+            'calls': dict(self.calls),
+            'total_time': dict(self.total_time),
+            'own_time': dict(self.own_time),
+            'illegal_moves': self.illegal_moves,
+            'episodes': sum(self.episode_lengths.values()),
+            'episode_lengths': {str(k): v for k, v in sorted(self.episode_lengths.items())},
+        }
+
+    def to_json(self, **kwargs):
+        """Export :meth:`to_dict` as a JSON string; kwargs go to ``json.dumps``."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def create_stats(self):
+        """Build ``self.stats`` in the format used by ``cProfile.Profile``.
+
+        This makes the profiler directly usable as ``pstats.Stats(profiler)``.
+        """
+        stats = {}
+        for name, calls in self.calls.items():
+            callers = {}
+            for parent, count in self.callers.get(name, {}).items():
+                if parent is not None:
+                    callers[self._keys[parent]] = count
+            stats[self._keys[name]] = (
+                calls, calls, self.own_time[name], self.total_time[name], callers
+            )
+        self.stats = stats
+        return stats
+
+    def dump_stats(self, filename):
+        """Write a ``cProfile``-compatible stats file readable by ``pstats``."""
+        with open(filename, 'wb') as f:
+            marshal.dump(self.create_stats(), f)
@@ -0,0 +1,336 @@
+"""Import and replay recorded Nim games.
+
+Game records come in two formats:
+
+- **JSONL**, one game per line (optionally gzip-compressed)::
+
+      {"board": [7, 5, 3], "on_move": 1, "moves": [[0, 2], [1, 3], ...]}
+
+  ``board`` and ``on_move`` default to the rule set's start position and
+  player 1; ``moves`` holds ``[pile, count]`` pairs or action indices.
+- **columnar**, a directory of flat binary arrays (``actions.bin``,
+  ``offsets.bin``, ``starts.bin``, ``on_move.bin``) plus ``meta.json``,
+  written by :func:`to_columnar` and read through ``np.memmap``.
+
+Both are read lazily in chunks of games, so memory use depends on the chunk
+size, not on the file size. :class:`GameReplayer` replays each chunk in one
+vectorized pass over a rule set's tables (see :mod:`gym_nim.rules`): it
+checks every move, and emits ``(state, action, outcome)`` arrays ready for
+training.
+
+Example
+-------
+>>> replayer = GameReplayer()
+>>> for batch in replayer.replay('games.jsonl.gz', chunk_size=10000):
+...     buffer.add_batch(batch['states'], batch['actions'], ...)
+>>> replayer.games, replayer.moves, replayer.skipped
+"""
+import gzip
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+from gym_nim.encoding import PILE_BITS, pack_boards
+from gym_nim.rules import make_rules, resolve_rules
+
+COLUMNS = {'actions': np.int16, 'offsets': np.int64, 'starts': np.int16, 'on_move': np.int8}
+
+
+def _open_text(path):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_records(path, chunk_size=4096):
+    """Yield lists of up to ``chunk_size`` parsed game dicts from a JSONL file.
+
+    Blank lines are skipped. Reading is lazy, so only one chunk is held in
+    memory at a time.
+    """
+    with _open_text(path) as lines:
+        while True:
+            chunk = [line for line in islice(lines, chunk_size) if line.strip()]
+            if not chunk:
+                return
+            # One parser call per chunk is much faster than one per line
+            yield json.loads('[' + ','.join(chunk) + ']')
+
+
+class Chunk:
+    """A batch of games as flat arrays.
+
+    Attributes
+    ----------
+    starts : numpy.ndarray, shape (n_games, n_piles)
+        Starting boards.
+    on_move : numpy.ndarray, shape (n_games,)
+        Player to move first.
+    offsets : numpy.ndarray, shape (n_games + 1,)
+        Game ``i`` owns ``actions[offsets[i]:offsets[i + 1]]``.
+    actions : numpy.ndarray, shape (n_moves,)
+        Action indices, -1 where a move matches no action of the rules.
+    malformed : dict
+        Reason per game index for records that could not be parsed; those
+        games have a start board of -1 and no moves.
+    """
+
+    def __init__(self, starts, on_move, offsets, actions, malformed=None):
+        self.starts = starts
+        self.on_move = on_move
+        self.offsets = offsets
+        self.actions = actions
+        self.malformed = malformed or {}
+
+    @classmethod
+    def from_records(cls, records, rules):
+        """Build a chunk from parsed JSONL game dicts.
+
+        Records whose board, player or moves do not have the expected shape
+        are listed in :attr:`malformed` instead of failing the whole chunk.
+        """
+        try:
+            starts = np.array([record.get('board', rules.start) for record in records], dtype=np.int64)
+            on_move = np.array([record.get('on_move', 1) for record in records], dtype=np.int8)
+            moves = np.array([move for record in records for move in record['moves']], dtype=np.int64)
+            lengths = np.array([len(record['moves']) for record in records], dtype=np.int64)
+            moves_ok = moves.ndim == 1 or moves.shape[1:] == (2,)
+            uniform = moves_ok and on_move.ndim == 1 and starts.shape == (len(records), rules.n_piles)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            uniform = False
+        if not uniform:
+            # Pairs in some records, indices in others, or malformed records
+            return cls._from_mixed_records(records, rules)
+        pairs = cls._as_pairs(moves, rules)
+        actions = rules.action_indices(pairs[:, 0], pairs[:, 1])
+        return cls(starts, on_move, np.concatenate([[0], np.cumsum(lengths)]), actions)
+
+    @classmethod
+    def _from_mixed_records(cls, records, rules):
+        starts = np.full((len(records), rules.n_piles), -1, dtype=np.int64)
+        on_move = np.ones(len(records), dtype=np.int8)
+        pairs = [np.zeros((0, 2), dtype=np.int64)]
+        lengths = np.zeros(len(records), dtype=np.int64)
+        malformed = {}
+        for game, record in enumerate(records):
+            try:
+                board = np.asarray(record.get('board', rules.start), dtype=np.int64)
+                player = int(record.get('on_move', 1))
+                moves = np.asarray(record['moves'], dtype=np.int64)
+            except (AttributeError, KeyError, TypeError, ValueError) as error:
+                malformed[game] = f"malformed record ({type(error).__name__}: {error})"
+                continue
+            if board.shape != (rules.n_piles,):
+                malformed[game] = f"board {board.tolist()} does not have {rules.n_piles} piles"
+            elif not (moves.ndim == 1 or (moves.ndim == 2 and moves.shape[1] == 2)):
+                malformed[game] = f"moves of shape {moves.shape} are neither action indices nor [pile, count] pairs"
+            else:
+                starts[game], on_move[game] = board, player
+                pairs.append(cls._as_pairs(moves, rules))
+                lengths[game] = len(moves)
+        pairs = np.concatenate(pairs)
+        actions = rules.action_indices(pairs[:, 0], pairs[:, 1])
+        return cls(starts, on_move, np.concatenate([[0], np.cumsum(lengths)]), actions, malformed)
+
+    @staticmethod
+    def _as_pairs(moves, rules):
+        if moves.ndim == 2:
+            return moves
+        # Action indices; out-of-range ones map to invalid piles
+        return np.stack([moves // rules.max_take, moves % rules.max_take + 1], axis=1)
+
+    @property
+    def n_games(self):
+        return len(self.on_move)
+
+
+def iter_columnar(directory, chunk_size=4096):
+    """Yield :class:`Chunk` objects from a columnar directory via ``np.memmap``."""
+    with open(os.path.join(directory, 'meta.json')) as f:
+        meta = json.load(f)
+    n_games, n_piles = meta['n_games'], meta['n_piles']
+    columns = {}
+    for name, dtype in COLUMNS.items():
+        columns[name] = np.memmap(os.path.join(directory, f'{name}.bin'), dtype=dtype, mode='r')
+    starts = columns['starts'].reshape(n_games, n_piles)
+    for first in range(0, n_games, chunk_size):
+        last = min(first + chunk_size, n_games)
+        offsets = np.asarray(columns['offsets'][first:last + 1], dtype=np.int64)
+        yield Chunk(np.asarray(starts[first:last], dtype=np.int64),
+                    np.asarray(columns['on_move'][first:last]),
+                    offsets - offsets[0],
+                    np.asarray(columns['actions'][offsets[0]:offsets[-1]], dtype=np.int64))
+
+
+def to_columnar(path, directory, rules=None, chunk_size=4096):
+    """Convert a JSONL record file into the columnar format, chunk by chunk.
+
+    Moves are stored as action indices of ``rules``; moves that match no
+    action are stored as -1 and rejected on replay. Malformed records are
+    stored as games with a start board of -1, also rejected on replay.
+
+    Returns
+    -------
+    dict
+        The metadata written to ``meta.json``.
+    """
+    rules = resolve_rules(rules) or make_rules()
+    os.makedirs(directory, exist_ok=True)
+    files = {name: open(os.path.join(directory, f'{name}.bin'), 'wb') for name in COLUMNS}
+    n_games = n_moves = 0
+    try:
+        files['offsets'].write(np.zeros(1, dtype=COLUMNS['offsets']).tobytes())
+        for records in iter_records(path, chunk_size):
+            chunk = Chunk.from_records(records, rules)
+            files['actions'].write(chunk.actions.astype(COLUMNS['actions']).tobytes())
+            files['offsets'].write((chunk.offsets[1:] + n_moves).astype(COLUMNS['offsets']).tobytes())
+            files['starts'].write(chunk.starts.astype(COLUMNS['starts']).tobytes())
+            files['on_move'].write(chunk.on_move.astype(COLUMNS['on_move']).tobytes())
+            n_games += chunk.n_games
+            n_moves += len(chunk.actions)
+    finally:
+        for f in files.values():
+            f.close()
+    meta = {'n_games': n_games, 'n_moves': n_moves, 'n_piles': rules.n_piles}
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+
+class GameReplayer:
+    """Validate recorded games and turn them into training arrays.
+
+    Each chunk is replayed in one vectorized pass: positions before every
+    move are the start position minus a per-game running sum of move
+    deltas, and each move is checked against ``rules.legal`` (so moves after
+    the game ended are rejected too).
+
+    Parameters
+    ----------
+    rules : RuleSet or str, optional
+        Rules the games were played under (default: ``make_rules()``, the
+        ``NimEnv`` game with 1 to 3 pieces per move).
+    bits : int, optional
+        Bits per pile for the packed ``states`` (default 3, or more if
+        ``rules.max_pile`` needs it).
+    errors : {'raise', 'skip'}, optional
+        Whether a game with an illegal move or a malformed record (a board
+        with the wrong number of piles, moves that are neither indices nor
+        pairs) raises ValueError (default) or is left out and counted in
+        :attr:`skipped`.
+
+    Attributes
+    ----------
+    games, moves : int
+        Games and moves emitted so far.
+    skipped : int
+        Games dropped for illegal moves or malformed records.
+    """
+
+    def __init__(self, rules=None, bits=None, errors='raise'):
+        if errors not in ('raise', 'skip'):
+            raise ValueError(f"Unknown errors mode {errors!r}; expected 'raise' or 'skip'")
+        self.rules = resolve_rules(rules) or make_rules()
+        self.bits = bits or max(PILE_BITS, self.rules.max_pile.bit_length())
+        self.errors = errors
+        self.games = 0
+        self.moves = 0
+        self.skipped = 0
+        self._seen = 0
+
+    def replay_chunk(self, chunk):
+        """Replay one :class:`Chunk`.
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            One row per move of every valid game:
+
+            - ``states``: packed position before the move (int64);
+            - ``boards``, ``on_move``: the same position unpacked;
+            - ``actions``: action index played;
+            - ``outcomes``: +1 if the mover's side went on to win, -1 if it
+              lost, 0 if the record stops before the game ended;
+            - ``games``: index of the game in the input, counting from 0.
+        """
+        rules = self.rules
+        offsets = chunk.offsets
+        lengths = np.diff(offsets)
+        n_games = len(lengths)
+        game_of = np.repeat(np.arange(n_games), lengths)
+        ply = np.arange(len(game_of)) - offsets[:-1][game_of]
+
+        starts = chunk.starts
+        in_tables = ((starts >= 0) & (starts <= rules.max_pile)).all(axis=1)
+        start_positions = np.where(in_tables, np.clip(starts, 0, rules.max_pile) @ rules.radix, 0)
+        actions = chunk.actions
+        known = actions >= 0
+        deltas = rules.moves[np.where(known, actions, 0)] @ rules.radix
+        before = np.cumsum(deltas) - deltas
+        game_base = np.concatenate([[0], np.cumsum(deltas)])[offsets[:-1]]
+        positions = start_positions[game_of] - (before - game_base[game_of])
+        in_range = (positions >= 0) & (positions < rules.n_positions)
+        safe = np.where(in_range, positions, 0)
+        legal = known & in_range & rules.legal[safe, np.where(known, actions, 0)]
+        legal &= in_tables[game_of]
+
+        bad_moves = np.bincount(game_of[~legal], minlength=n_games)
+        valid = (bad_moves == 0) & in_tables
+        valid[list(chunk.malformed)] = False
+        if not valid.all():
+            game = int(np.flatnonzero(~valid)[0])
+            if self.errors == 'raise':
+                where = np.flatnonzero(~legal & (game_of == game))
+                if game in chunk.malformed:
+                    detail = chunk.malformed[game]
+                elif len(where):
+                    detail = f"illegal move at ply {int(ply[where[0]])}"
+                else:
+                    detail = f"start board {starts[game].tolist()} is outside the rule tables"
+                raise ValueError(f"Game {self._seen + game}: {detail}")
+            self.skipped += int((~valid).sum())
+
+        played = lengths > 0
+        final = start_positions.copy()
+        final[played] = (positions - deltas)[offsets[1:][played] - 1]
+        complete = rules.terminal[np.where(valid, final, 0)] & valid
+        mover_is_last = (ply % 2) == ((lengths - 1) % 2)[game_of]
+        reward = np.sign(rules.terminal_reward)
+        outcomes = np.where(complete[game_of], np.where(mover_is_last, reward, -reward), 0)
+        first = chunk.on_move.astype(np.int64)[game_of]
+        on_move = np.where(ply % 2 == 0, first, 3 - first)
+
+        keep = valid[game_of]
+        boards = rules.boards[safe[keep]]
+        batch = {
+            'states': pack_boards(boards, on_move[keep], self.bits),
+            'boards': boards,
+            'on_move': on_move[keep].astype(np.int8),
+            'actions': actions[keep].astype(np.int16),
+            'outcomes': outcomes[keep].astype(np.int8),
+            'games': (self._seen + game_of[keep]).astype(np.int64),
+        }
+        self._seen += n_games
+        self.games += int(valid.sum())
+        self.moves += int(keep.sum())
+        return batch
+
+    def replay(self, path, chunk_size=4096):
+        """Yield one :meth:`replay_chunk` batch per chunk of a JSONL file or columnar directory."""
+        if os.path.isdir(path):
+            chunks = iter_columnar(path, chunk_size)
+        else:
+            chunks = (Chunk.from_records(records, self.rules) for records in iter_records(path, chunk_size))
+        for chunk in chunks:
+            yield self.replay_chunk(chunk)
+
+    def load(self, path, chunk_size=4096):
+        """Replay a whole file and concatenate the batches."""
+        batches = list(self.replay(path, chunk_size))
+        if not batches:
+            return self.replay_chunk(Chunk(np.zeros((0, self.rules.n_piles), dtype=np.int64),
+                                           np.zeros(0, dtype=np.int8), np.zeros(1, dtype=np.int64),
+                                           np.zeros(0, dtype=np.int64)))
+        return {key: np.concatenate([batch[key] for batch in batches]) for key in batches[0]}
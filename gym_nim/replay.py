@@ -0,0 +1,261 @@
+"""Experience replay for Nim agents.
+
+Transitions are stored column-wise in preallocated NumPy ring arrays: states
+and next states as packed integers (see :mod:`gym_nim.encoding`), actions as
+``action_space`` indices, plus rewards and done flags. No Python object is
+created per stored transition.
+
+Example
+-------
+>>> buffer = ReplayBuffer(100000, prioritized=True)
+>>> buffer.add(state, [0, 2], reward, next_state, terminated)
+>>> batch = buffer.sample(32)
+>>> batch['states'], batch['actions'], batch['weights']
+>>> buffer.update_priorities(batch['indices'], td_errors)
+"""
+import os
+
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, PILE_BITS, action_index, pack_board, pack_boards
+
+
+class SumTree:
+    """Array-backed binary sum tree over ``capacity`` non-negative priorities.
+
+    Leaves hold the priorities; every internal node holds the sum of its
+    children, so the total is ``tree[1]`` and prefix-sum lookups descend
+    the tree in ``O(log capacity)``. Both updates and lookups work on whole
+    batches of indices at once.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._leaves = 1 << max(0, int(capacity - 1).bit_length())
+        self.tree = np.zeros(2 * self._leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        """Sum of all priorities."""
+        return self.tree[1]
+
+    def __getitem__(self, indices):
+        return self.tree[self._leaves + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """Set the priorities at ``indices`` and refresh their ancestors."""
+        nodes = self._leaves + np.asarray(indices, dtype=np.int64)
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes >> 1)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes >> 1)
+
+    def find(self, values):
+        """Return the leaf index whose prefix-sum interval contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        tree = self.tree
+        while nodes[0] < self._leaves:
+            left = 2 * nodes
+            left_sum = tree[left]
+            go_right = values >= left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            nodes = left + go_right
+        # Guard against float round-off landing on an empty trailing leaf.
+        return np.minimum(nodes - self._leaves, self.capacity - 1)
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer of Nim transitions with optional prioritization.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of transitions; the oldest are overwritten first.
+    n_piles : int, optional
+        Number of piles per board (default 3).
+    bits : int, optional
+        Bits per pile in the packed state encoding (default 3).
+    prioritized : bool, optional
+        If True, sample proportionally to ``priority ** alpha`` through a
+        :class:`SumTree` and return importance-sampling weights.
+    alpha : float, optional
+        Prioritization exponent (default 0.6).
+    path : str, optional
+        Directory for memory-mapped ``.npy`` storage, for buffers larger
+        than RAM. Arrays are kept in memory when omitted. The write position
+        and size are kept in ``counters.npy`` next to the arrays.
+    resume : bool, optional
+        If True, reopen the buffer already stored in ``path`` and continue
+        from its saved position and size; prioritized buffers restart every
+        stored transition at the maximum priority. If False (default), any
+        buffer in ``path`` is overwritten.
+    seed : int, optional
+        Seed for the sampling random number generator.
+
+    Raises
+    ------
+    ValueError
+        If ``resume`` is set without ``path``, or ``path`` holds arrays of
+        another shape or dtype.
+    """
+
+    def __init__(self, capacity, n_piles=3, bits=PILE_BITS, prioritized=False,
+                 alpha=0.6, path=None, resume=False, seed=None):
+        self.capacity = capacity
+        self.n_piles = n_piles
+        self.bits = bits
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.path = path
+        if resume and path is None:
+            raise ValueError("resume=True needs a path to resume from")
+        self.resume = resume
+        state_dtype = np.uint16 if 1 + n_piles * bits <= 16 else np.uint64
+        self.states = self._allocate('states', state_dtype)
+        self.actions = self._allocate('actions', np.int16)
+        self.rewards = self._allocate('rewards', np.float32)
+        self.next_states = self._allocate('next_states', state_dtype)
+        self.dones = self._allocate('dones', np.bool_)
+        self._pos = 0
+        self._size = 0
+        # Copy of [_pos, _size] on disk, so that the buffer can be resumed
+        self._counters = None if path is None else self._allocate('counters', np.int64, shape=(2,))
+        if resume:
+            self._pos, self._size = (int(counter) for counter in self._counters)
+        self.tree = SumTree(capacity) if prioritized else None
+        self._max_priority = 1.0
+        if self.tree is not None and self._size:
+            self.tree.update(np.arange(self._size), self._max_priority ** self.alpha)
+        self.rng = np.random.default_rng(seed)
+
+    def _allocate(self, name, dtype, shape=None):
+        shape = (self.capacity,) if shape is None else shape
+        if self.path is None:
+            return np.zeros(shape, dtype=dtype)
+        os.makedirs(self.path, exist_ok=True)
+        filename = os.path.join(self.path, name + '.npy')
+        if not (self.resume and os.path.exists(filename)):
+            return np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+        array = np.lib.format.open_memmap(filename, mode='r+')
+        if array.shape != shape or array.dtype != dtype:
+            raise ValueError(f"{filename} holds {array.dtype}{list(array.shape)}, "
+                             f"expected {np.dtype(dtype)}{list(shape)}")
+        return array
+
+    def _sync_counters(self):
+        if self._counters is not None:
+            self._counters[:] = self._pos, self._size
+
+    def __len__(self):
+        return self._size
+
+    def _pack(self, state):
+        if isinstance(state, dict):
+            return pack_board(state['board'], state['on_move'], self.bits)
+        return state
+
+    def _pack_batch(self, states):
+        if isinstance(states, dict):
+            return pack_boards(states['board'], states['on_move'], self.bits)
+        return np.asarray(states)
+
+    def add(self, state, action, reward, next_state, done):
+        """Store one transition.
+
+        States may be observation dicts or packed ints; actions may be
+        ``[pile, count]`` moves or ``action_space`` indices.
+        """
+        i = self._pos
+        self.states[i] = self._pack(state)
+        self.actions[i] = action if np.isscalar(action) else action_index(action)
+        self.rewards[i] = reward
+        self.next_states[i] = self._pack(next_state)
+        self.dones[i] = done
+        if self.tree is not None:
+            self.tree.update([i], self._max_priority ** self.alpha)
+        self._pos = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self._sync_counters()
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Store a batch of transitions, e.g. one step of a vector env.
+
+        ``states`` and ``next_states`` may be batched observation dicts
+        (``{'board': (n, n_piles), 'on_move': (n,)}``) or packed int arrays;
+        ``actions`` may be an ``(n, 2)`` array of moves or ``(n,)`` indices.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = actions[:, 0] * MAX_TAKE + actions[:, 1] - 1
+        n = len(actions)
+        if n > self.capacity:
+            raise ValueError(f"Batch of {n} transitions exceeds capacity {self.capacity}")
+        idx = (self._pos + np.arange(n)) % self.capacity
+        self.states[idx] = self._pack_batch(states)
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = self._pack_batch(next_states)
+        self.dones[idx] = dones
+        if self.tree is not None:
+            self.tree.update(idx, self._max_priority ** self.alpha)
+        self._pos = (self._pos + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        self._sync_counters()
+
+    def sample(self, batch_size, beta=0.4):
+        """Sample a batch of stored transitions.
+
+        Parameters
+        ----------
+        batch_size : int
+            Number of transitions to draw (with replacement).
+        beta : float, optional
+            Importance-sampling exponent; only used when prioritized.
+
+        Returns
+        -------
+        dict
+            Arrays ``states``, ``actions``, ``rewards``, ``next_states``,
+            ``dones`` and ``indices``; prioritized buffers also return
+            ``weights`` normalized to a maximum of 1.
+        """
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        if self.tree is None:
+            indices = self.rng.integers(0, self._size, size=batch_size)
+        else:
+            total = self.tree.total
+            segment = total / batch_size
+            values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+            indices = self.tree.find(np.minimum(values, np.nextafter(total, 0)))
+        batch = {
+            'states': self.states[indices],
+            'actions': self.actions[indices],
+            'rewards': self.rewards[indices],
+            'next_states': self.next_states[indices],
+            'dones': self.dones[indices],
+            'indices': indices,
+        }
+        if self.tree is not None:
+            probs = self.tree[indices] / self.tree.total
+            weights = (self._size * probs) ** -beta
+            batch['weights'] = (weights / weights.max()).astype(np.float32)
+        return batch
+
+    def update_priorities(self, indices, priorities, eps=1e-6):
+        """Set new priorities (typically absolute TD errors) for sampled indices."""
+        if self.tree is None:
+            raise ValueError("update_priorities() requires prioritized=True")
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + eps
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def flush(self):
+        """Write memory-mapped arrays to disk; no-op for in-memory buffers."""
+        if self.path is not None:
+            for array in (self.states, self.actions, self.rewards, self.next_states, self.dones, self._counters):
+                array.flush()
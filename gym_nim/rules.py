@@ -0,0 +1,220 @@
+"""Table-driven rule sets for Nim and its variants.
+
+A :class:`RuleSet` describes which moves are allowed and who wins when no
+move is left, and compiles that into lookup tables over every board with up
+to ``max_pile`` pieces per pile:
+
+- ``legal[position, action]``: whether the action is allowed;
+- ``next_position[position, action]``: the position it leads to, -1 if
+  illegal;
+- ``terminal[position]``: whether no move is left.
+
+:class:`~gym_nim.envs.NimEnv`, :class:`~gym_nim.envs.NimVectorEnv` and
+:class:`~gym_nim.solver.NimSolver` all step through the same tables, so a
+new variant needs no new move logic and costs the same per step as any
+other variant.
+
+Positions are indexed densely in mixed radix, as in the solver: pile ``i``
+contributes ``board[i] * (max_pile + 1) ** i``. Actions keep the
+``NimEnv.action_space`` layout ``max_take * pile + count - 1``. Wythoff
+rule sets add one more "pile", index ``n_piles``, which stands for taking
+``count`` from both piles at once.
+
+Example
+-------
+>>> rules = make_rules('normal')
+>>> rules.terminal_reward
+1
+>>> subtraction = make_rules('misere', takes=(1, 3, 4))
+>>> subtraction.legal_moves([2, 0, 0])
+[[0, 1]]
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from gym_nim.encoding import index_to_action
+
+
+class RuleSet:
+    """Legal moves and terminal conditions of a Nim variant, as lookup tables.
+
+    Parameters
+    ----------
+    name : str
+        Name used in messages.
+    n_piles : int, optional
+        Number of piles (default 3).
+    max_pile : int, optional
+        Largest pile size covered by the tables (default 7).
+    takes : sequence of int, optional
+        Subtraction set: the numbers of pieces a move may take (default
+        ``(1, 2, 3)``, or ``1..max_pile`` for Wythoff).
+    misere : bool, optional
+        If True (default), the player who makes the last move loses, as in
+        ``NimEnv``; otherwise they win (normal play).
+    wythoff : bool, optional
+        Also allow taking the same number from both piles. Requires
+        ``n_piles == 2``.
+    start : sequence of int, optional
+        Starting board, capped at ``max_pile`` (default ``(7, 5, 3)``
+        truncated or padded to ``n_piles`` piles).
+
+    Attributes
+    ----------
+    max_take : int
+        Largest entry of ``takes``; actions are ``max_take * pile + count - 1``.
+    n_actions : int
+        Size of the action space.
+    boards : numpy.ndarray, shape (n_positions, n_piles)
+        The board of every position index.
+    moves : numpy.ndarray, shape (n_actions, n_piles)
+        Pieces removed from each pile by each action.
+    legal : numpy.ndarray of bool, shape (n_positions, n_actions)
+        Legal-action mask of every position.
+    next_position : numpy.ndarray of int, shape (n_positions, n_actions)
+        Position reached by each action, -1 where illegal.
+    terminal : numpy.ndarray of bool, shape (n_positions,)
+        True where no move is legal and the game is over.
+    terminal_reward : int
+        Reward for the move that ends the game: -1 in misère play, +1 in
+        normal play.
+    """
+
+    def __init__(self, name, n_piles=3, max_pile=7, takes=None, misere=True,
+                 wythoff=False, start=None):
+        if wythoff and n_piles != 2:
+            raise ValueError("Wythoff rules need exactly 2 piles")
+        if takes is None:
+            takes = range(1, max_pile + 1) if wythoff else (1, 2, 3)
+        self.name = name
+        self.n_piles = n_piles
+        self.max_pile = max_pile
+        self.takes = tuple(sorted(set(int(take) for take in takes)))
+        if not self.takes or self.takes[0] < 1:
+            raise ValueError(f"Invalid subtraction set: {takes}")
+        self.misere = misere
+        self.wythoff = wythoff
+        self.terminal_reward = -1 if misere else 1
+        if start is None:
+            start = ((7, 5, 3) + (max_pile,) * n_piles)[:n_piles]
+        start = [min(int(pile_count), max_pile) for pile_count in start]
+        self.start = tuple(start)
+
+        self.max_take = self.takes[-1]
+        self.n_kinds = n_piles + 1 if wythoff else n_piles
+        self.n_actions = self.n_kinds * self.max_take
+        self.radix = (max_pile + 1) ** np.arange(n_piles)
+        self.n_positions = (max_pile + 1) ** n_piles
+        self.start_position = self.index(self.start)
+        self._compile()
+
+    def _compile(self):
+        max_take = self.max_take
+        self.moves = np.zeros((self.n_actions, self.n_piles), dtype=np.int64)
+        self.valid_action = np.zeros(self.n_actions, dtype=bool)
+        self.action_lookup = {}
+        for kind in range(self.n_kinds):
+            for count in self.takes:
+                action = kind * max_take + count - 1
+                if kind < self.n_piles:
+                    self.moves[action, kind] = count
+                else:
+                    self.moves[action, :] = count
+                self.valid_action[action] = True
+                self.action_lookup[(kind, count)] = action
+
+        positions = np.arange(self.n_positions)
+        self.boards = (positions[:, None] // self.radix) % (self.max_pile + 1)
+        fits = (self.boards[:, None, :] >= self.moves[None, :, :]).all(axis=2)
+        self.legal = fits & self.valid_action
+        self.next_position = np.where(self.legal, positions[:, None] - self.moves @ self.radix, -1)
+        self.terminal = ~self.legal.any(axis=1)
+
+        # Plain-list copies for the pure-Python core
+        self.decrements = [[(pile, int(count)) for pile, count in enumerate(move) if count]
+                           for move in self.moves]
+        self.next_lists = self.next_position.tolist()
+        self.terminal_list = self.terminal.tolist()
+
+    def index(self, board):
+        """Dense position index of ``board``.
+
+        Raises
+        ------
+        ValueError
+            If the board has the wrong number of piles or a pile outside
+            ``[0, max_pile]``.
+        """
+        board = [int(pile_count) for pile_count in board]
+        if len(board) != self.n_piles or not all(0 <= c <= self.max_pile for c in board):
+            raise ValueError(f"Board {board} is outside the {self.name} rule tables "
+                             f"({self.n_piles} piles of at most {self.max_pile})")
+        return int(np.dot(board, self.radix))
+
+    def action_of(self, pile, count):
+        """Action index of ``[pile, count]``, or -1 if no action matches."""
+        return self.action_lookup.get((pile, count), -1)
+
+    def action_indices(self, piles, counts):
+        """Vectorized :meth:`action_of`."""
+        piles, counts = np.asarray(piles), np.asarray(counts)
+        in_range = (piles >= 0) & (piles < self.n_kinds) & (counts > 0) & (counts <= self.max_take)
+        actions = np.where(in_range, piles * self.max_take + counts - 1, 0)
+        return np.where(in_range & self.valid_action[actions], actions, -1)
+
+    def mask(self, board):
+        """Legal-action mask of ``board``."""
+        return self.legal[self.index(board)]
+
+    def legal_moves(self, board):
+        """All legal ``[pile, count]`` moves on ``board``, in action order."""
+        return [index_to_action(a, self.max_take) for a in np.flatnonzero(self.mask(board))]
+
+    def __repr__(self):
+        return (f"RuleSet({self.name!r}, n_piles={self.n_piles}, max_pile={self.max_pile}, "
+                f"takes={self.takes}, misere={self.misere}, wythoff={self.wythoff})")
+
+
+VARIANTS = {
+    'misere': {'misere': True},
+    'normal': {'misere': False},
+    'wythoff': {'n_piles': 2, 'wythoff': True, 'misere': False},
+    'wythoff-misere': {'n_piles': 2, 'wythoff': True, 'misere': True},
+}
+
+
+@lru_cache(maxsize=None)
+def _cached_rules(name, options):
+    if name not in VARIANTS:
+        raise ValueError(f"Unknown rule set {name!r}; expected one of {sorted(VARIANTS)}")
+    kwargs = dict(VARIANTS[name])
+    kwargs.update(options)
+    return RuleSet(name, **kwargs)
+
+
+def make_rules(name='misere', **options):
+    """Build (or reuse) the rule set of a named variant.
+
+    Rule sets are cached, so envs, vector envs and solvers created with the
+    same arguments share one set of tables.
+
+    Parameters
+    ----------
+    name : str, optional
+        One of :data:`VARIANTS`: ``'misere'`` (default, the ``NimEnv``
+        convention), ``'normal'``, ``'wythoff'`` or ``'wythoff-misere'``.
+    **options
+        Overrides for :class:`RuleSet`, e.g. ``takes=(1, 3, 4)`` for a
+        subtraction game or ``max_pile=15``.
+    """
+    options = {key: tuple(value) if isinstance(value, (list, range)) else value
+               for key, value in options.items()}
+    return _cached_rules(name, tuple(sorted(options.items())))
+
+
+def resolve_rules(rules):
+    """Return ``rules`` as a RuleSet, looking names up with :func:`make_rules`."""
+    if rules is None or isinstance(rules, RuleSet):
+        return rules
+    return make_rules(rules)
@@ -0,0 +1,241 @@
+"""Asyncio game server hosting many Nim games for remote agents.
+
+One event loop multiplexes any number of connections, and each connection
+any number of games, identified by a client-chosen 32-bit game id. Messages
+are fixed-size little-endian binary frames:
+
+Request (7 bytes)::
+
+    op: u8 | game_id: u32 | pile: u8 | count: u8
+
+``op`` is one of :data:`OP_RESET`, :data:`OP_STEP` or :data:`OP_CLOSE`;
+``pile`` and ``count`` are ignored unless stepping.
+
+Response (10 bytes)::
+
+    game_id: u32 | board: 3 x u8 | on_move: u8 | reward: i8 | flags: u8
+
+``flags`` has :data:`FLAG_TERMINATED` set when the game is over and
+:data:`FLAG_ERROR` set when the request referred to a game that does not
+exist or had an unknown ``op``; such requests leave every game untouched.
+Responses are sent in request order, so clients may pipeline requests
+without waiting for each reply.
+
+Example
+-------
+>>> server = NimServer()
+>>> await server.start_unix('/tmp/nim.sock')
+>>> client = await NimClient.open_unix('/tmp/nim.sock')
+>>> game = client.game(1)
+>>> state, info = await game.reset()
+>>> state, reward, terminated, truncated, info = await game.step([0, 2])
+"""
+import asyncio
+import struct
+from collections import deque
+from functools import partial
+
+import numpy as np
+
+from gym_nim.envs.nim_env import NimEnv
+
+OP_RESET = 0
+OP_STEP = 1
+OP_CLOSE = 2
+
+FLAG_TERMINATED = 1
+FLAG_ERROR = 2
+
+REQUEST = struct.Struct('<BIBB')
+RESPONSE = struct.Struct('<I3BBbB')
+
+
+class NimServer:
+    """Serves :class:`NimEnv` games over Unix or TCP sockets.
+
+    Parameters
+    ----------
+    env_factory : callable, optional
+        Zero-argument callable creating a new game; defaults to a
+        ``NimEnv`` that does not print illegal moves.
+    """
+
+    def __init__(self, env_factory=partial(NimEnv, verbose=False)):
+        self.env_factory = env_factory
+        self._server = None
+
+    async def start_unix(self, path):
+        """Start listening on the Unix socket at ``path``."""
+        self._server = await asyncio.start_unix_server(self._handle, path=path)
+        return self
+
+    async def start_tcp(self, host='127.0.0.1', port=0):
+        """Start listening on a TCP port; ``port=0`` picks a free one."""
+        self._server = await asyncio.start_server(self._handle, host=host, port=port)
+        return self
+
+    @property
+    def sockets(self):
+        """Sockets the server listens on."""
+        return self._server.sockets if self._server else ()
+
+    async def close(self):
+        """Stop accepting connections and wait for the listener to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        games = {}
+        pending = b''
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                pending += data
+                usable = len(pending) - len(pending) % REQUEST.size
+                out = bytearray()
+                for offset in range(0, usable, REQUEST.size):
+                    out += self._dispatch(games, *REQUEST.unpack_from(pending, offset))
+                pending = pending[usable:]
+                writer.write(out)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, games, op, game_id, pile, count):
+        if op == OP_RESET:
+            env = games.get(game_id)
+            if env is None:
+                env = games[game_id] = self.env_factory()
+            state, _ = env.reset()
+            return _encode(game_id, state, 0, 0)
+        env = games.get(game_id)
+        if env is None:
+            return RESPONSE.pack(game_id, 0, 0, 0, 0, 0, FLAG_ERROR)
+        if op == OP_STEP:
+            state, reward, terminated, truncated, _ = env.step([pile, count])
+            return _encode(game_id, state, reward, FLAG_TERMINATED if terminated else 0)
+        if op == OP_CLOSE:
+            del games[game_id]
+            return _encode(game_id, env.state, 0, 0)
+        return RESPONSE.pack(game_id, 0, 0, 0, 0, 0, FLAG_ERROR)
+
+
+def _encode(game_id, state, reward, flags):
+    board = state['board']
+    return RESPONSE.pack(game_id, board[0], board[1], board[2], state['on_move'], reward, flags)
+
+
+class NimClient:
+    """Client for :class:`NimServer` multiplexing many games on one connection.
+
+    Any number of coroutines may call :meth:`reset`/:meth:`step` concurrently;
+    requests are pipelined and matched to responses in order.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = deque()
+        self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    @classmethod
+    async def open_unix(cls, path):
+        """Connect to a server listening on the Unix socket at ``path``."""
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+
+    @classmethod
+    async def open_tcp(cls, host, port):
+        """Connect to a server listening on ``host:port``."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        try:
+            while True:
+                frame = await self._reader.readexactly(RESPONSE.size)
+                self._waiting.popleft().set_result(RESPONSE.unpack(frame))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            while self._waiting:
+                self._waiting.popleft().set_exception(ConnectionError(f"Connection lost: {e}"))
+
+    def _request(self, op, game_id, pile=0, count=0):
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append(future)
+        self._writer.write(REQUEST.pack(op, game_id, pile, count))
+        return future
+
+    async def reset(self, game_id):
+        """Start (or restart) game ``game_id``; returns ``(state, info)``."""
+        response = await self._request(OP_RESET, game_id)
+        return _decode(response), {}
+
+    async def step(self, game_id, action):
+        """Play ``action`` in game ``game_id``.
+
+        Returns
+        -------
+        tuple
+            ``(state, reward, terminated, truncated, info)`` as from
+            ``NimEnv.step``.
+
+        Raises
+        ------
+        ValueError
+            If the game was never reset or has been closed.
+        """
+        pile, count = action
+        if not (0 <= pile < 256 and 0 <= count < 256):
+            raise ValueError(f"Invalid action format: {action}. Pile and count must fit in a byte")
+        response = await self._request(OP_STEP, game_id, pile, count)
+        reward, flags = response[5], response[6]
+        if flags & FLAG_ERROR:
+            raise ValueError(f"Unknown game {game_id}; call reset() first")
+        return _decode(response), reward, bool(flags & FLAG_TERMINATED), False, {}
+
+    async def close_game(self, game_id):
+        """Release game ``game_id`` on the server."""
+        await self._request(OP_CLOSE, game_id)
+
+    def game(self, game_id):
+        """Return a :class:`RemoteNimEnv` stub bound to ``game_id``."""
+        return RemoteNimEnv(self, game_id)
+
+    async def close(self):
+        """Close the connection."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
+
+
+def _decode(response):
+    return {
+        'board': np.array(response[1:4], dtype=np.int32),
+        'on_move': response[4],
+    }
+
+
+class RemoteNimEnv:
+    """Async stand-in for a NimEnv hosted on a :class:`NimServer`."""
+
+    def __init__(self, client, game_id):
+        self.client = client
+        self.game_id = game_id
+
+    async def reset(self):
+        return await self.client.reset(self.game_id)
+
+    async def step(self, action):
+        return await self.client.step(self.game_id, action)
+
+    async def close(self):
+        await self.client.close_game(self.game_id)
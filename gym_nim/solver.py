@@ -0,0 +1,147 @@
+"""Exact solver for Nim positions.
+
+The solver uses NimEnv's rules: players alternately take 1 to ``max_take``
+pieces from one pile, and whoever takes the last piece loses. Every board
+with up to ``max_pile`` pieces per pile is solved by retrograde analysis,
+which walks positions level by level in increasing piece count. Each level
+is solved in one vectorized pass per action.
+
+Any :class:`~gym_nim.rules.RuleSet` can be solved instead (normal play,
+other subtraction sets, Wythoff); the solver then reads its legal moves,
+successor positions and terminal positions from the rule set's tables.
+
+Positions are indexed densely in mixed radix: pile ``i`` contributes
+``board[i] * (max_pile + 1) ** i``. Actions use the indices of
+``NimEnv.action_space`` (see :mod:`gym_nim.encoding`).
+
+Example
+-------
+>>> solver = NimSolver()
+>>> solver.wins([7, 5, 3])
+True
+>>> solver.best_move([1, 0, 0])
+[0, 1]
+"""
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, index_to_action
+from gym_nim.rules import make_rules, resolve_rules
+
+
+class NimSolver:
+    """Win/loss, depth-to-end and winning moves for every position.
+
+    Parameters
+    ----------
+    n_piles : int, optional
+        Number of piles (default 3).
+    max_pile : int, optional
+        Largest pile size to solve for (default 7).
+    max_take : int, optional
+        Largest number of pieces per move (default 3).
+    rules : RuleSet or str, optional
+        Variant to solve. If given, the other parameters are ignored and
+        taken from the rule set; by default the misère game with subtraction
+        set ``1..max_take`` is solved.
+
+    Attributes
+    ----------
+    boards : numpy.ndarray, shape (n_positions, n_piles)
+        The board of every position index.
+    win : numpy.ndarray of bool, shape (n_positions,)
+        True when the player to move wins with best play. A terminal
+        position counts as won in misère play, since the opponent made the
+        last move, and as lost in normal play.
+    depth : numpy.ndarray of int, shape (n_positions,)
+        Moves until the game ends when the winner plays to finish fast and
+        the loser to last long.
+    legal : numpy.ndarray of bool, shape (n_positions, n_actions)
+        Legal-action mask of every position.
+    children : numpy.ndarray of int, shape (n_positions, n_actions)
+        Position index reached by each action (undefined where illegal).
+    terminal : numpy.ndarray of bool, shape (n_positions,)
+        True where no move is legal.
+    winning : numpy.ndarray of bool, shape (n_positions, n_actions)
+        True for legal actions that leave the opponent in a lost position.
+    grundy : numpy.ndarray of int, shape (n_positions,)
+        Normal-play Grundy value (the mex of the children's values); for
+        plain Nim this is the XOR of ``pile % (max_take + 1)``. A useful
+        difficulty feature alongside :attr:`depth`.
+    best_action : numpy.ndarray of int, shape (n_positions,)
+        The solver's action per position: the fastest win when winning, the
+        slowest loss otherwise, and -1 when no move is legal.
+    """
+
+    def __init__(self, n_piles=3, max_pile=7, max_take=MAX_TAKE, rules=None):
+        rules = resolve_rules(rules)
+        if rules is None:
+            rules = make_rules('misere', n_piles=n_piles, max_pile=max_pile,
+                               takes=range(1, max_take + 1))
+        self.rules = rules
+        self.n_piles = rules.n_piles
+        self.max_pile = rules.max_pile
+        self.max_take = rules.max_take
+        self.radix = rules.radix
+        self.n_positions = rules.n_positions
+        self.n_actions = rules.n_actions
+
+        self.boards = rules.boards
+        self.legal = rules.legal
+        self.children = np.maximum(rules.next_position, 0)
+        self.terminal = rules.terminal
+        self._solve()
+
+    def _solve(self):
+        totals = self.boards.sum(axis=1)
+        win = np.zeros(self.n_positions, dtype=bool)
+        depth = np.zeros(self.n_positions, dtype=np.int32)
+        grundy = np.zeros(self.n_positions, dtype=np.int64)
+        win[self.terminal] = self.rules.misere
+        values = np.arange(self.n_actions + 1)
+        # Every move removes pieces, so children sit on lower levels
+        for total in range(1, totals.max() + 1):
+            level = np.flatnonzero((totals == total) & ~self.terminal)
+            legal = self.legal[level]
+            children = self.children[level]
+            child_loses = legal & ~win[children]
+            child_depth = depth[children] + 1
+            level_win = child_loses.any(axis=1)
+            fastest_win = np.where(child_loses, child_depth, np.iinfo(np.int32).max).min(axis=1)
+            slowest_loss = np.where(legal, child_depth, 0).max(axis=1)
+            win[level] = level_win
+            depth[level] = np.where(level_win, fastest_win, slowest_loss)
+            # mex: smallest value not taken by any legal child
+            taken = (legal[:, :, None] & (grundy[children][:, :, None] == values)).any(axis=1)
+            grundy[level] = (~taken).argmax(axis=1)
+        self.win = win
+        self.depth = depth
+        self.grundy = grundy
+        self.winning = self.legal & ~win[self.children]
+
+        # Winners take the fastest win, losers the slowest loss; any winning
+        # move scores above every losing one.
+        child_depth = depth[self.children].astype(np.int64)
+        score = np.where(self.winning, -child_depth, child_depth - self.n_positions)
+        score = np.where(self.legal, score, np.iinfo(np.int64).min)
+        self.best_action = np.where(self.legal.any(axis=1), score.argmax(axis=1), -1)
+
+    def index(self, board):
+        """Dense position index of ``board``."""
+        return self.rules.index(board)
+
+    def wins(self, board):
+        """True if the player to move on ``board`` wins with best play."""
+        return bool(self.win[self.index(board)])
+
+    def depth_to_end(self, board):
+        """Number of moves left in ``board`` under best play by both sides."""
+        return int(self.depth[self.index(board)])
+
+    def winning_moves(self, board):
+        """All ``[pile, count]`` moves that keep a won position won."""
+        return [index_to_action(a, self.max_take) for a in np.flatnonzero(self.winning[self.index(board)])]
+
+    def best_move(self, board):
+        """The solver's move for ``board``, or None if no move is legal."""
+        action = self.best_action[self.index(board)]
+        return None if action < 0 else index_to_action(action, self.max_take)
@@ -0,0 +1,287 @@
+"""Sparse, bounded-memory indexing of Nim positions.
+
+Dense tables index every board in mixed radix, which stops being feasible
+quickly: 40 piles of up to 300 pieces have ``301 ** 40`` boards. Most of
+them never occur in play, though, so tabular agents, caches and solvers
+only need rows for the positions they actually visit.
+
+:class:`SparseStateIndex` maps 64-bit position keys to row numbers
+``0 .. capacity - 1`` of caller-owned arrays. It is an open-addressing hash
+table with linear probing, stored in flat NumPy arrays instead of Python
+objects, and it never holds more than ``capacity`` keys: once full, new
+keys evict old ones with the CLOCK (second-chance) policy, which keeps
+recently used positions around.
+
+Keys come from :func:`board_key`, which ranks the board as a sorted
+multiset (see :func:`gym_nim.encoding.rank_multiset`), so boards that only
+differ by pile order share a key and a row.
+
+Example
+-------
+>>> index = SparseStateIndex(capacity=100000)
+>>> values = np.zeros(index.capacity)
+>>> row, evicted = index.insert(board_key([250, 3, 90]))
+>>> values[row] = 0.5
+>>> values[index.get(board_key([3, 90, 250]))]
+0.5
+"""
+import numpy as np
+
+from gym_nim.encoding import _MASK64, _splitmix64, rank_multiset, rank_multisets
+
+_FIBONACCI = 0x9E3779B97F4A7C15
+
+
+def board_key(board, on_move=None):
+    """64-bit key of a board, independent of pile order.
+
+    Parameters
+    ----------
+    board : sequence of int
+    on_move : int, optional
+        If given, the player on move goes into bit 0, so the two players'
+        positions get different keys.
+
+    Returns
+    -------
+    int
+        The multiset rank of the board (times two plus the player bit).
+        Ranks of 64 bits or more are folded into 64 bits with splitmix64;
+        distinct boards can then share a key, with probability about
+        ``2 ** -64`` per pair.
+    """
+    key = rank_multiset(board)
+    if on_move is not None:
+        key = key << 1 | int(on_move == 2)
+    if key > _MASK64:
+        folded = 0
+        while key:
+            folded = _splitmix64(folded ^ (key & _MASK64))
+            key >>= 64
+        key = folded
+    return key
+
+
+def board_keys(boards, on_move=None):
+    """Vectorized :func:`board_key`, as uint64 of shape ``(n,)``."""
+    boards = np.asarray(boards, dtype=np.int64)
+    max_pile = int(boards.max(initial=0))
+    try:
+        keys = rank_multisets(boards, max_pile)
+    except ValueError:  # ranks need more than 64 bits
+        players = [None] * len(boards) if on_move is None else on_move
+        return np.array([board_key(b, p) for b, p in zip(boards, players)], dtype=np.uint64)
+    if on_move is not None:
+        if keys.max(initial=0) >> np.uint64(63):
+            return np.array([board_key(b, p) for b, p in zip(boards, on_move)], dtype=np.uint64)
+        keys = keys << np.uint64(1) | (np.asarray(on_move) == 2).astype(np.uint64)
+    return keys
+
+
+class SparseStateIndex:
+    """Open-addressing hash index from 64-bit keys to a bounded set of rows.
+
+    Slots hold row numbers (-1 when empty) and rows hold their key, so the
+    whole index is three flat arrays: ``slots`` (int64, a power of two at
+    least ``capacity / max_load`` long), ``keys`` (uint64) and ``referenced``
+    (bool, the CLOCK bits), one entry per row. Keys are spread over the
+    slots by Fibonacci hashing and collisions are resolved by linear
+    probing; removal shifts later entries back instead of leaving
+    tombstones, so lookups stay short however many keys come and go.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of keys, and number of rows handed out.
+    max_load : float, optional
+        Largest fraction of slots in use (default 0.5).
+    evict : bool, optional
+        When the index is full, evict a row for a new key with the CLOCK
+        policy (default). Rows found by :meth:`get` or :meth:`lookup` since
+        the hand last passed are spared once. If False, inserting into a
+        full index raises OverflowError.
+
+    Attributes
+    ----------
+    evictions : int
+        Keys evicted so far.
+    """
+
+    def __init__(self, capacity, max_load=0.5, evict=True):
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if not 0 < max_load < 1:
+            raise ValueError(f"max_load must be between 0 and 1, got {max_load}")
+        self.capacity = capacity
+        self.evict = evict
+        self._bits = max(1, int(np.ceil(np.log2(capacity / max_load))))
+        self._mask = (1 << self._bits) - 1
+        self._shift = 64 - self._bits
+        self.slots = np.full(1 << self._bits, -1, dtype=np.int64)
+        self.keys = np.zeros(capacity, dtype=np.uint64)
+        self.referenced = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._issued = 0
+        self._free = []
+        self._hand = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._find(key)[1] >= 0
+
+    def _home(self, key):
+        return ((int(key) * _FIBONACCI) & _MASK64) >> self._shift
+
+    def _find(self, key):
+        """``(slot, row)`` of ``key``, or ``(first empty slot, -1)``."""
+        key = int(key)
+        slots, keys = self.slots, self.keys
+        slot = self._home(key)
+        while True:
+            row = int(slots[slot])
+            if row < 0 or int(keys[row]) == key:
+                return slot, row
+            slot = (slot + 1) & self._mask
+
+    def get(self, key, default=-1):
+        """Row of ``key``, or ``default`` if it is not in the index."""
+        row = self._find(key)[1]
+        if row < 0:
+            return default
+        self.referenced[row] = True
+        return row
+
+    def insert(self, key):
+        """Row of ``key``, adding the key if needed.
+
+        Returns
+        -------
+        row : int
+        evicted : int or None
+            The key whose row was taken over, if the index was full. Rows of
+            new keys are not cleared; owners of per-row data should reset
+            the row whenever ``row`` is new, e.g. when ``key not in index``
+            before the call or ``evicted`` is not None.
+        """
+        slot, row = self._find(key)
+        if row >= 0:
+            self.referenced[row] = True
+            return row, None
+        evicted = None
+        if self._free:
+            row = self._free.pop()
+        elif self._issued < self.capacity:
+            row = self._issued
+            self._issued += 1
+        elif self.evict:
+            row = self._victim()
+            evicted = int(self.keys[row])
+            self._delete(self._find(evicted)[0])
+            self.evictions += 1
+            slot = self._find(key)[0]
+        else:
+            raise OverflowError(f"SparseStateIndex is full ({self.capacity} keys)")
+        self.slots[slot] = row
+        self.keys[row] = key
+        self.referenced[row] = False
+        self._size += 1
+        return row, evicted
+
+    def remove(self, key):
+        """Drop ``key``; returns its former row, or -1 if it was absent."""
+        slot, row = self._find(key)
+        if row >= 0:
+            self._delete(slot)
+            self._free.append(row)
+        return row
+
+    def _victim(self):
+        referenced = self.referenced
+        while referenced[self._hand]:
+            referenced[self._hand] = False
+            self._hand = (self._hand + 1) % self.capacity
+        row = self._hand
+        self._hand = (self._hand + 1) % self.capacity
+        return row
+
+    def _delete(self, slot):
+        slots, keys, mask = self.slots, self.keys, self._mask
+        self._size -= 1
+        hole = slot
+        slot = (slot + 1) & mask
+        while slots[slot] >= 0:
+            # Move the entry back into the hole unless that would put it
+            # before its home slot
+            home = self._home(keys[slots[slot]])
+            if ((slot - home) & mask) >= ((slot - hole) & mask):
+                slots[hole] = slots[slot]
+                hole = slot
+            slot = (slot + 1) & mask
+        slots[hole] = -1
+
+    def lookup(self, keys):
+        """Rows of many keys at once, -1 for keys not in the index.
+
+        Probing runs in lockstep over all keys, one vectorized pass per
+        probe step.
+
+        Parameters
+        ----------
+        keys : array-like of uint64
+
+        Returns
+        -------
+        numpy.ndarray of int64
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        slot = ((keys * np.uint64(_FIBONACCI)) >> np.uint64(self._shift)).astype(np.int64)
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        pending = np.arange(len(keys))
+        while len(pending):
+            row = self.slots[slot[pending]]
+            hit = row >= 0
+            hit[hit] = self.keys[row[hit]] == keys[pending[hit]]
+            rows[pending[hit]] = row[hit]
+            pending = pending[(row >= 0) & ~hit]
+            slot[pending] = (slot[pending] + 1) & self._mask
+        found = rows[rows >= 0]
+        self.referenced[found] = True
+        return rows
+
+    def insert_many(self, keys):
+        """:meth:`insert` every key in turn; returns rows and a new-row mask.
+
+        Returns
+        -------
+        rows : numpy.ndarray of int64
+        new : numpy.ndarray of bool
+            True where the row was assigned to the key by this call. If more
+            new keys arrive than fit, later ones can evict earlier ones.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        rows = self.lookup(keys)
+        new = rows < 0
+        for i in np.flatnonzero(new):
+            row = self._find(keys[i])[1]
+            if row >= 0:  # a repeat of a key inserted earlier in the batch
+                rows[i], new[i] = row, False
+            else:
+                rows[i] = self.insert(keys[i])[0]
+        return rows, new
+
+    def clear(self):
+        """Remove every key."""
+        self.slots.fill(-1)
+        self.referenced.fill(False)
+        self._size = 0
+        self._issued = 0
+        self._free = []
+        self._hand = 0
+
+    @property
+    def nbytes(self):
+        """Memory held by the index arrays, in bytes."""
+        return self.slots.nbytes + self.keys.nbytes + self.referenced.nbytes
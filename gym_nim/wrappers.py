@@ -0,0 +1,142 @@
+"""Wrappers for the Nim environments."""
+import gymnasium as gym
+import numpy as np
+
+from gym_nim.encoding import MAX_TAKE, action_masks, index_to_action
+
+
+class ActionMasking(gym.Wrapper):
+    """Expose the legal-action mask of a :class:`NimEnv` and sample only legal moves.
+
+    The mask has one entry per ``action_space`` index
+    (``3 * pile + count - 1``) and is returned in ``info['action_mask']``
+    by ``reset()`` and ``step()`` as well as by :meth:`action_mask`.
+    ``step()`` accepts either an action index or a ``[pile, count]`` move.
+
+    With a rule set (``NimEnv(rules=...)``) the mask comes from the rule
+    tables and has ``rules.n_actions`` entries.
+
+    Parameters
+    ----------
+    env : gymnasium.Env
+        A NimEnv, possibly wrapped (e.g. from ``gym.make('nim-v0')``).
+    remap_invalid : bool, optional
+        If True, an illegal action is replaced by a random legal one before
+        it reaches the env, and ``info['action_remapped']`` is set. If False
+        (default), illegal actions keep their usual -2 reward.
+
+    Examples
+    --------
+    >>> env = ActionMasking(gym.make('nim-v0'))
+    >>> state, info = env.reset()
+    >>> action = env.sample()          # always legal
+    >>> state, reward, terminated, truncated, info = env.step(action)
+    """
+
+    def __init__(self, env, remap_invalid=False):
+        super().__init__(env)
+        self.remap_invalid = remap_invalid
+        rules = getattr(env.unwrapped, 'rules', None)
+        self._rules = rules
+        self._max_take = MAX_TAKE if rules is None else rules.max_take
+
+    def action_mask(self):
+        """Legal-action mask of the current position as ``int8`` (shape (9,) by default)."""
+        board = self.env.unwrapped.state['board']
+        if self._rules is not None:
+            return self._rules.mask(board).astype(np.int8)
+        return action_masks(board[None])[0].astype(np.int8)
+
+    def sample(self):
+        """Sample a legal action index, or None if no move is legal."""
+        mask = self.action_mask()
+        if not mask.any():
+            return None
+        return int(self.action_space.sample(mask=mask))
+
+    def reset(self, *, seed=None, options=None):
+        state, info = self.env.reset(seed=seed, options=options)
+        info['action_mask'] = self.action_mask()
+        return state, info
+
+    def step(self, action):
+        max_take = self._max_take
+        if np.isscalar(action):
+            action = index_to_action(action, max_take)
+        remapped = False
+        if self.remap_invalid:
+            mask = self.action_mask()
+            pile, count = action
+            legal = 0 <= pile < len(mask) // max_take and 0 < count <= max_take
+            if not (legal and mask[pile * max_take + count - 1]) and mask.any():
+                action = index_to_action(self.action_space.sample(mask=mask), max_take)
+                remapped = True
+        state, reward, terminated, truncated, info = self.env.step(action)
+        info['action_mask'] = self.action_mask()
+        if remapped:
+            info['action_remapped'] = True
+        return state, reward, terminated, truncated, info
+
+
+class VectorActionMasking(gym.vector.VectorWrapper):
+    """Vectorized counterpart of :class:`ActionMasking` for :class:`NimVectorEnv`.
+
+    Masks are ``(num_envs, 9)`` boolean arrays, returned in
+    ``info['action_mask']`` and by :meth:`action_masks`. Sampling draws
+    uniformly among each game's legal actions in one vectorized pass rather
+    than calling ``action_space.sample(mask=...)`` per game.
+
+    Parameters
+    ----------
+    env : NimVectorEnv
+        The vector env to wrap.
+    remap_invalid : bool, optional
+        If True, illegal actions are replaced by random legal ones and
+        ``info['action_remapped']`` flags the affected games.
+    """
+
+    def __init__(self, env, remap_invalid=False):
+        super().__init__(env)
+        self.remap_invalid = remap_invalid
+
+    def action_masks(self):
+        """Legal-action masks of all games."""
+        return self.env.unwrapped.action_masks()
+
+    def sample(self, masks=None):
+        """Sample one legal action index per game (0 where no move is legal)."""
+        if masks is None:
+            masks = self.action_masks()
+        scores = self.np_random.random(masks.shape)
+        scores[~masks] = -1.0
+        return scores.argmax(axis=1)
+
+    def reset(self, *, seed=None, options=None):
+        obs, info = self.env.reset(seed=seed, options=options)
+        info['action_mask'] = self.action_masks()
+        return obs, info
+
+    def step(self, actions):
+        info_remapped = None
+        if self.remap_invalid:
+            masks = self.action_masks()
+            actions = np.asarray(actions)
+            rules = self.env.unwrapped.rules
+            if actions.ndim == 2 and rules is not None:
+                actions = rules.action_indices(actions[:, 0], actions[:, 1])
+                in_range = actions >= 0
+                actions = np.where(in_range, actions, 0)
+            elif actions.ndim == 2:
+                pile, count = actions[:, 0], actions[:, 1]
+                in_range = (pile >= 0) & (pile < masks.shape[1] // MAX_TAKE) & (count > 0) & (count <= MAX_TAKE)
+                actions = np.where(in_range, pile * MAX_TAKE + count - 1, 0)
+            else:
+                in_range = (actions >= 0) & (actions < masks.shape[1])
+            legal = in_range & masks[np.arange(len(actions)), np.where(in_range, actions, 0)]
+            info_remapped = ~legal & masks.any(axis=1)
+            actions = np.where(info_remapped, self.sample(masks), actions)
+        obs, rewards, terminated, truncated, info = self.env.step(actions)
+        info['action_mask'] = self.action_masks()
+        if info_remapped is not None:
+            info['action_remapped'] = info_remapped
+        return obs, rewards, terminated, truncated, info
@@ -0,0 +1,239 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+from gym_nim.agents import CompiledPolicy, MLPAgent, SharedQTable, SparseQTable, compile_policy
+from gym_nim.encoding import action_masks, unpack_boards
+from gym_nim.rules import make_rules
+from gym_nim.solver import NimSolver
+
+
+def _add_ones(table, state, times):
+    for _ in range(times):
+        with table.lock_for(state):
+            table[state, 0] += 1
+    table.close()
+
+
+class TestSharedQTable:
+    """Test suite for the shared-memory Q-table."""
+
+    def test_starts_zeroed(self):
+        """Test that a new table is all zeros with the requested shape."""
+        with SharedQTable(1024, 9) as table:
+            assert table.table.shape == (1024, 9)
+            assert not table.table.any()
+
+    def test_update(self):
+        """Test the Q-learning update rule."""
+        with SharedQTable(4, 2) as table:
+            value = table.update(1, 1, target=2.0, lr=.5)
+            assert value == pytest.approx(1.0)
+            table.update(1, 1, target=2.0, lr=.5)
+            assert table[1, 1] == pytest.approx(1.5)
+            assert table.max(1) == pytest.approx(1.5)
+            assert table.argmax(1) == 1
+
+    @pytest.mark.parametrize('locking', ['striped', None])
+    def test_update_batch_matches_sequential(self, locking):
+        """Test that batched updates equal one-by-one updates, duplicates included."""
+        states = [0, 1, 0, 3, 0]
+        actions = [1, 1, 1, 0, 2]
+        targets = [1.0, 2.0, 3.0, 4.0, 5.0]
+        with SharedQTable(4, 3, locking=locking) as batched, \
+                SharedQTable(4, 3, locking=locking) as sequential:
+            batched.update_batch(states, actions, targets, lr=.5)
+            for s, a, t in zip(states, actions, targets):
+                sequential.update(s, a, t, lr=.5)
+            np.testing.assert_allclose(batched.table, sequential.table)
+
+    def test_invalid_locking(self):
+        """Test that an unknown locking mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown locking mode"):
+            SharedQTable(4, 2, locking='global')
+
+    def test_lock_free_has_no_locks(self):
+        """Test that Hogwild mode hands out no locks."""
+        with SharedQTable(4, 2, locking=None) as table:
+            assert table.lock_for(3) is None
+
+    def test_pickle_attaches_to_same_memory(self):
+        """Test that an unpickled table shares memory with the original."""
+        with SharedQTable(8, 9, locking=None) as table:
+            other = pickle.loads(pickle.dumps(table))
+            other[5, 3] = 7.0
+            assert table[5, 3] == 7.0
+            other.close()
+
+    def test_concurrent_workers(self):
+        """Test that striped-lock updates from several processes are not lost."""
+        ctx = multiprocessing.get_context()
+        with SharedQTable(16, 1, stripes=4, context=ctx) as table:
+            procs = [ctx.Process(target=_add_ones, args=(table, 3, 200)) for _ in range(3)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+            assert all(p.exitcode == 0 for p in procs)
+            assert table[3, 0] == 600
+
+
+class TestCompiledPolicy:
+    """Test suite for the policy lookup-table compiler."""
+
+    def test_compile_solver(self):
+        """Test that a compiled solver plays the solver's moves."""
+        solver = NimSolver()
+        frozen = compile_policy(solver)
+        assert frozen.best_action.shape == (1024,)
+        for board in ([7, 5, 3], [2, 1, 1], [1, 0, 0]):
+            state = {'board': np.array(board), 'on_move': 2}
+            assert frozen(state) == solver.best_move(board)
+        assert frozen({'board': np.array([0, 0, 0]), 'on_move': 1}) is None
+
+    def test_compile_solver_with_many_actions(self):
+        """Test that a rule set with more than 127 actions keeps every move intact."""
+        solver = NimSolver(rules=make_rules('wythoff', max_pile=63))
+        assert solver.n_actions > 127
+        frozen = compile_policy(solver, n_piles=2, bits=6)
+        boards, _ = unpack_boards(np.arange(len(frozen.best_action)), 2, 6)
+        expected = solver.best_action[boards @ solver.radix]
+        np.testing.assert_array_equal(frozen.best_action, expected)
+        assert frozen.best_action.max() > 127
+
+    def test_compile_qtable_respects_legality(self):
+        """Test that Q-table compilation never picks an illegal action."""
+        Q = np.zeros((1024, 9))
+        Q[:, 8] = 10.0  # the table prefers [2, 3] everywhere
+        frozen = compile_policy(Q)
+        assert frozen({'board': np.array([7, 5, 3]), 'on_move': 1}) == [2, 3]
+        assert frozen({'board': np.array([7, 5, 1]), 'on_move': 1}) != [2, 3]
+
+        boards, _ = unpack_boards(np.arange(1024))
+        legal = action_masks(boards)
+        has_move = legal.any(axis=1)
+        chosen = frozen.best_action[has_move]
+        assert legal[has_move][np.arange(len(chosen)), chosen].all()
+
+    def test_compile_callable(self):
+        """Test compiling an arbitrary callable policy."""
+        frozen = compile_policy(lambda state, moves: moves[-1])
+        assert frozen({'board': np.array([1, 2, 0]), 'on_move': 1}) == [1, 2]
+
+    def test_compile_callable_illegal(self):
+        """Test that a callable choosing an illegal move is rejected."""
+        with pytest.raises(ValueError, match="illegal move"):
+            compile_policy(lambda state, moves: [0, 3])
+
+    def test_save_load_and_diff(self, tmp_path):
+        """Test round-tripping through a memory-mapped file and diffing."""
+        frozen = compile_policy(NimSolver())
+        path = str(tmp_path / 'policy.npy')
+        frozen.save(path)
+        loaded = CompiledPolicy.load(path)
+        assert isinstance(loaded.best_action, np.memmap)
+        assert len(frozen.diff(loaded)) == 0
+
+        other = compile_policy(lambda state, moves: moves[0])
+        assert len(frozen.diff(other)) > 0
+
+
+class TestMLPAgent:
+    """Test suite for the NumPy MLP agent."""
+
+    def test_shapes_and_dtype(self):
+        """Test batched float32 Q-values and buffer growth past the capacity."""
+        agent = MLPAgent(batch_size=4, seed=0)
+        boards = np.array([[7, 5, 3]] * 10)
+        q = agent.q_values(boards)
+        assert q.shape == (10, 9) and q.dtype == np.float32
+        np.testing.assert_allclose(q, np.broadcast_to(q[0], q.shape), rtol=1e-5)
+
+    def test_act_respects_masks(self):
+        """Test that greedy and exploring actions are always legal."""
+        agent = MLPAgent(seed=0)
+        boards = np.random.default_rng(0).integers(0, 8, size=(500, 3))
+        masks = action_masks(boards)
+        for epsilon in (0.0, 0.5):
+            actions = agent.act(boards, masks, epsilon=epsilon)
+            has_move = masks.any(axis=1)
+            assert masks[np.arange(500), actions][has_move].all()
+
+    def test_td_targets(self):
+        """Test terminal rewards and negated bootstrapped values."""
+        agent = MLPAgent(gamma=0.5, seed=0)
+        boards = np.array([[0, 0, 0], [1, 0, 0]])
+        masks = action_masks(boards)
+        targets = agent.td_targets([-1, 0], boards, [True, False], masks)
+        assert targets[0] == -1
+        assert targets[1] == pytest.approx(-0.5 * agent.q_values(boards[1:])[0, 0])
+
+    def test_learns_solver_values(self):
+        """Test that supervised training on solver outcomes reaches optimal play."""
+        solver = NimSolver()
+        agent = MLPAgent(lr=3e-3, seed=0)
+        rng = np.random.default_rng(0)
+        positions = np.flatnonzero(~solver.terminal)
+        values = np.where(solver.win[solver.children], -1.0, 1.0)
+        losses = []
+        for _ in range(800):
+            batch = rng.choice(positions, 256)
+            scores = np.where(solver.legal[batch], rng.random((256, 9)), -1)
+            actions = scores.argmax(axis=1)
+            losses.append(agent.train_batch(solver.boards[batch], actions, values[batch, actions]))
+        assert np.mean(losses[-50:]) < 0.1 * np.mean(losses[:50])
+        won = positions[solver.win[positions]]
+        chosen = agent.act(solver.boards[won], solver.legal[won])
+        assert solver.winning[won, chosen].mean() > 0.95
+
+    def test_save_load(self, tmp_path):
+        """Test that saved weights reproduce the same Q-values."""
+        agent = MLPAgent(seed=0)
+        path = tmp_path / 'mlp.npz'
+        agent.save(path)
+        other = MLPAgent(seed=1).load(path)
+        boards = np.array([[7, 5, 3], [1, 2, 0]])
+        np.testing.assert_array_equal(agent.q_values(boards), other.q_values(boards))
+
+    def test_rules(self):
+        """Test that a rule set sizes the network."""
+        agent = MLPAgent(rules='wythoff', seed=0)
+        assert agent.n_inputs == 16 and agent.n_actions == 21
+
+
+class TestSparseQTable:
+    """Test suite for the sparse, bounded Q-table."""
+
+    def test_canonical_rows(self):
+        """Test that permuted boards share a row with their actions permuted."""
+        Q = SparseQTable(n_piles=3, capacity=10)
+        Q.update([5, 1, 3], 0, 1.0, lr=1.0)  # take 1 from the pile of 5
+        assert len(Q) == 1 and [3, 5, 1] in Q
+        assert Q.row([5, 1, 3])[0] == 1.0
+        assert Q.row([1, 3, 5])[6] == 1.0
+        assert Q.argmax([3, 1, 5]) == 6
+        assert Q.max([3, 1, 5], mask=[True] * 6 + [False] * 3) == 0.0
+
+    def test_batch_matches_single(self):
+        """Test that q_values and act agree with row and argmax on large boards."""
+        rng = np.random.default_rng(0)
+        Q = SparseQTable(n_piles=40, capacity=500)
+        boards = rng.integers(0, 300, (50, 40))
+        for board in boards[:25]:
+            Q.update(board, rng.integers(120), rng.normal(), lr=0.5)
+        expected = np.array([Q.row(board) for board in boards])
+        np.testing.assert_array_equal(Q.q_values(boards), expected)
+        masks = rng.random((50, 120)) < 0.5
+        assert list(Q.act(boards, masks)) == [Q.argmax(b, m) for b, m in zip(boards, masks)]
+
+    def test_eviction_resets_rows(self):
+        """Test that rows reused after eviction start from the initial value."""
+        Q = SparseQTable(n_piles=2, capacity=2, max_take=1, initial=0.5)
+        Q.update([1, 1], 0, 1.0, lr=1.0)
+        Q.update([2, 2], 0, 1.0, lr=1.0)
+        Q.update([3, 3], 1, 0.0, lr=0.0)
+        assert len(Q) == 2
+        assert Q.row([3, 3]).tolist() == [0.5, 0.5]
+        assert Q.values.shape == (2, 2)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from gym_nim.encoding import ZOBRIST, pack_board
+from gym_nim.envs import NimEnv
+from gym_nim.envs.core import NimCore, RuleSetCore
+from gym_nim.rules import make_rules
+
+
+class TestNimCore:
+    """Test suite for the pure-Python game core."""
+
+    def test_initial_position(self):
+        """Test the default starting position and derived values."""
+        core = NimCore()
+        assert core.board == [7, 5, 3]
+        assert core.on_move == 1
+        assert core.remaining == 15
+        assert core.nim_sum == 7 ^ 5 ^ 3
+        assert core.zobrist_hash == ZOBRIST.hash([7, 5, 3], 1)
+
+    def test_play(self):
+        """Test a legal move, an illegal move and the final move."""
+        core = NimCore([1, 2, 0])
+        assert core.play(1, 2) == (0, False)
+        assert core.board == [1, 0, 0]
+        assert core.on_move == 2
+        assert core.play(1, 1) == (-2, True)
+        assert core.board == [1, 0, 0]
+        assert core.on_move == 2
+        assert core.play(0, 1) == (-1, True)
+        assert core.on_move == 2  # no switch on the terminal move
+
+    def test_play_index(self):
+        """Test playing by action_space index."""
+        core = NimCore()
+        core.play_index(4)  # [1, 2]
+        assert core.board == [7, 3, 3]
+
+    def test_board_stays_plain_ints(self):
+        """Test that NumPy action values do not leak into the board."""
+        core = NimCore()
+        core.play(np.int64(0), np.int64(2))
+        assert all(type(pile) is int for pile in core.board)
+
+    def test_copy_is_independent(self):
+        """Test that copies do not share the board list."""
+        core = NimCore()
+        other = core.copy()
+        other.play(0, 1)
+        assert core.board == [7, 5, 3]
+        assert other.board == [6, 5, 3]
+
+    def test_observation_and_packing(self):
+        """Test materializing observations and packed ints on request."""
+        core = NimCore([2, 1, 0], on_move=2)
+        obs = core.observation()
+        assert obs['board'].dtype == np.int32
+        np.testing.assert_array_equal(obs['board'], [2, 1, 0])
+        assert obs['on_move'] == 2
+        assert core.packed() == pack_board([2, 1, 0], 2)
+
+    def test_matches_env_trajectories(self):
+        """Test that the core and NimEnv agree on random games, illegal moves included."""
+        rng = np.random.default_rng(0)
+        env = NimEnv()
+        for _ in range(200):
+            env.reset()
+            core = NimCore()
+            done = False
+            while not done:
+                pile, count = int(rng.integers(-1, 4)), int(rng.integers(0, 5))
+                state, reward, done, truncated, info = env.step([pile, count])
+                assert core.play(pile, count) == (reward, done)
+                assert core.board == state['board'].tolist()
+                assert core.on_move == state['on_move']
+                assert core.legal_moves() == env.move_generator()
+
+    def test_rule_set_core_copy_and_moves(self):
+        """Test RuleSetCore copies, index moves and legal moves."""
+        core = RuleSetCore(make_rules('normal', takes=(2, 3)), [3, 1, 0])
+        other = core.copy()
+        assert core.legal_moves() == [[0, 2], [0, 3]]
+        assert core.play_index(2) == (1, True)
+        assert core.board == [0, 1, 0]
+        assert other.board == [3, 1, 0] and other.position == core.rules.index([3, 1, 0])
+        assert other.is_legal(0, 2) and not other.is_legal(1, 1)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from gym_nim.curriculum import Curriculum
+from gym_nim.envs import NimEnv
+from gym_nim.solver import NimSolver
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return NimSolver()
+
+
+class TestCurriculum:
+    """Test suite for the difficulty-ordered start position scheduler."""
+
+    def test_levels_ordered_by_depth(self, solver):
+        """Test that boards are ranked easiest first and cover every non-empty board."""
+        curriculum = Curriculum(solver, n_levels=5)
+        assert len(curriculum.boards) == len(solver.boards) - 1
+        assert curriculum.boards.any(axis=1).all()
+        assert (np.diff(curriculum.depth) >= 0).all()
+        assert curriculum.bounds[0] == 0 and curriculum.bounds[-1] == len(curriculum.boards)
+
+    def test_rejects_empty_levels(self, solver):
+        """Test that more levels than boards are rejected, and one per board samples from every level."""
+        n_boards = len(solver.boards) - 1
+        with pytest.raises(ValueError, match='n_levels'):
+            Curriculum(solver, n_levels=n_boards + 1)
+        with pytest.raises(ValueError, match='n_levels'):
+            Curriculum(solver, n_levels=0)
+        curriculum = Curriculum(solver, n_levels=n_boards, review=0.0, seed=0)
+        assert (np.diff(curriculum.bounds) == 1).all()
+        curriculum.set_level(n_boards - 1)
+        np.testing.assert_array_equal(curriculum.sample(), curriculum.boards[-1])
+
+    def test_sample_stays_in_level(self, solver):
+        """Test that samples come from the current level when review is off."""
+        curriculum = Curriculum(solver, n_levels=5, review=0.0, seed=0)
+        curriculum.set_level(2)
+        lo, hi = curriculum.bounds[2], curriculum.bounds[3]
+        allowed = {tuple(board) for board in curriculum.boards[lo:hi]}
+        boards = curriculum.sample(500)
+        assert boards.shape == (500, 3)
+        assert all(tuple(board) in allowed for board in boards)
+        assert curriculum.sample().shape == (3,)
+
+    def test_review_draws_easier_boards(self, solver):
+        """Test that review samples come from levels below the current one."""
+        curriculum = Curriculum(solver, n_levels=5, review=1.0, seed=0)
+        curriculum.set_level(3)
+        easier = {tuple(board) for board in curriculum.boards[:curriculum.bounds[3]]}
+        assert all(tuple(board) in easier for board in curriculum.sample(200))
+
+    def test_promotion(self, solver):
+        """Test that a full window at the threshold promotes one level and clears history."""
+        curriculum = Curriculum(solver, n_levels=3, promote_at=0.75, window=8)
+        assert not curriculum.record_batch([True] * 5)
+        assert not curriculum.record_batch([False, False, False])
+        assert curriculum.level == 0
+        assert curriculum.record_batch([True] * 8)
+        assert curriculum.level == 1
+        assert curriculum.win_rate == 0.0
+        curriculum.set_level(10)
+        assert curriculum.level == 2
+        assert not curriculum.record_batch([True] * 8)
+
+    def test_options_reset_env(self, solver):
+        """Test that options() plugs into NimEnv.reset."""
+        curriculum = Curriculum(solver, seed=1)
+        env = NimEnv()
+        options = curriculum.options()
+        state, info = env.reset(options=options)
+        np.testing.assert_array_equal(state['board'], options['board'])
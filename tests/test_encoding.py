@@ -0,0 +1,84 @@
+import gymnasium as gym
+import gym_nim
+from itertools import combinations_with_replacement, product
+
+import numpy as np
+import pytest
+
+from gym_nim.encoding import (
+    ZobristTable, action_index, index_to_action, num_multisets, num_states, pack_board,
+    rank_multiset, rank_multisets, state_index, unpack_board, unrank_multiset
+)
+
+
+class TestEncoding:
+    """Test suite for state and action encodings."""
+
+    def test_matches_observation_space(self):
+        """Test that indices fit the env's declared table sizes."""
+        env = gym.make('nim-v0')
+        assert num_states() == env.observation_space.n
+        assert action_index([2, 3]) == env.action_space.n - 1
+        env.close()
+
+    def test_state_roundtrip(self):
+        """Test packing and unpacking boards."""
+        for board, on_move in [([7, 5, 3], 1), ([0, 0, 0], 2), ([1, 7, 0], 2)]:
+            index = pack_board(board, on_move)
+            assert 0 <= index < num_states()
+            assert unpack_board(index) == (board, on_move)
+
+    def test_state_index_of_observation(self):
+        """Test packing an observation dict."""
+        env = gym.make('nim-v0')
+        state, info = env.reset()
+        assert state_index(state) == pack_board([7, 5, 3], 1)
+        env.close()
+
+    def test_action_roundtrip(self):
+        """Test that all 9 action indices round-trip."""
+        for index in range(9):
+            assert action_index(index_to_action(index)) == index
+        assert index_to_action(0) == [0, 1]
+        assert index_to_action(4) == [1, 2]
+
+    def test_zobrist_keys_are_deterministic(self):
+        """Test that lazily grown keys do not depend on growth order."""
+        a = ZobristTable()
+        b = ZobristTable()
+        a.key(5, 200)
+        assert a.key(0, 3) == b.key(0, 3)
+        assert b.key(5, 200) == a.key(5, 200)
+        assert a.key(2, 0) == 0
+        assert a.hash([3, 0, 1], 2) == a.side ^ a.key(0, 3) ^ a.key(2, 1)
+
+
+class TestMultisetRank:
+    """Test suite for ranking boards as sorted multisets."""
+
+    def test_ranks_are_dense(self):
+        """Test that sorted boards rank to exactly 0 .. num_multisets - 1 and back."""
+        for n_piles, max_pile in [(3, 7), (4, 5), (1, 9)]:
+            boards = list(combinations_with_replacement(range(max_pile + 1), n_piles))
+            ranks = [rank_multiset(board) for board in boards]
+            assert sorted(ranks) == list(range(num_multisets(n_piles, max_pile)))
+            assert all(unrank_multiset(rank, n_piles) == list(board) for rank, board in zip(ranks, boards))
+
+    def test_order_independent(self):
+        """Test that permuting the piles keeps the rank."""
+        assert rank_multiset([7, 5, 3]) == rank_multiset([3, 7, 5]) == rank_multiset([5, 3, 7])
+
+    def test_large_boards(self):
+        """Test exact ranks beyond 64 bits."""
+        board = [300] * 39 + [299]
+        rank = rank_multiset(board)
+        assert rank.bit_length() > 64
+        assert unrank_multiset(rank, 40) == sorted(board)
+
+    def test_vectorized(self):
+        """Test that rank_multisets matches rank_multiset and refuses overflow."""
+        boards = np.array(list(product(range(6), repeat=3)))
+        expected = [rank_multiset(board) for board in boards]
+        np.testing.assert_array_equal(rank_multisets(boards, 5), expected)
+        with pytest.raises(ValueError):
+            rank_multisets(np.zeros((1, 40), dtype=int), 300)
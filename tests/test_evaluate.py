@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from gym_nim.agents import MLPAgent, compile_policy
+from gym_nim.evaluate import evaluate, format_report, main, reachable_positions
+from gym_nim.solver import NimSolver
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return NimSolver()
+
+
+class TestEvaluate:
+    """Test suite for bulk evaluation against the solver."""
+
+    def test_reachable_positions(self, solver):
+        """Test that every board at or below [7, 5, 3] is reachable."""
+        indices = reachable_positions(solver)
+        assert len(indices) == 8 * 6 * 4 - 1
+        assert (solver.boards[indices] <= [7, 5, 3]).all()
+
+    def test_solver_is_perfect(self, solver):
+        """Test that the solver and its compiled policy score 100%."""
+        for agent in (solver, compile_policy(solver)):
+            report = evaluate(agent, solver)
+            assert report['positions'] == 2 * 191
+            assert report['accuracy'] == 1.0 and report['illegal'] == 0.0
+
+    def test_breakdown(self, solver):
+        """Test that the class breakdowns partition the positions."""
+        report = evaluate(MLPAgent(seed=0), solver, positions='all')
+        for classes in report['by_class'].values():
+            assert sum(summary['positions'] for summary in classes.values()) == report['positions']
+        assert set(report['by_class']['outcome']) == {'won', 'lost'}
+        assert 'by depth' in format_report(report)
+
+    def test_illegal_and_callable(self, solver):
+        """Test that masked-out moves from callables and act() agents count as illegal."""
+        class FirstPile:
+            def act(self, boards, masks):
+                return np.zeros(len(boards), dtype=np.int64)
+
+        # Taking one from pile 0 is illegal exactly when pile 0 is empty: 6 * 4 - 1 boards
+        for agent in (lambda state, moves: [0, 1], FirstPile()):
+            report = evaluate(agent, solver, players=(1,))
+            assert report['illegal'] == pytest.approx(23 / 191)
+            by_pieces = report['by_class']['pieces']
+            assert sum(c['illegal'] * c['positions'] for c in by_pieces.values()) == pytest.approx(23)
+            assert by_pieces[1]['illegal'] == pytest.approx(2 / 3)
+            assert report['by_class']['outcome']['won']['illegal'] > 0
+        first_move = evaluate(lambda state, moves: moves[0], solver, players=(1,))
+        assert first_move['positions'] == 191
+        assert 0 < first_move['accuracy'] < 1
+
+    def test_sample(self, solver):
+        """Test sampled evaluation and bad position modes."""
+        report = evaluate(solver, solver, positions=50, players=(1,), seed=0)
+        assert report['positions'] == 50
+        with pytest.raises(ValueError):
+            evaluate(solver, solver, positions='some')
+
+    def test_cli(self, solver, tmp_path, capsys):
+        """Test the command line on a saved compiled policy."""
+        path = tmp_path / 'policy.npy'
+        compile_policy(solver).save(path)
+        main([str(path)])
+        assert '100.0% optimal' in capsys.readouterr().out
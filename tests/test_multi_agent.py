@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from gym_nim.envs import NimAECEnv, NimParallelEnv
+
+
+class TestNimAECEnv:
+    """Test suite for the two-agent turn-based environment."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.env = NimAECEnv()
+        self.env.reset()
+
+    def test_reset(self):
+        """Test that player 1 starts with a full mask."""
+        observation, reward, terminated, truncated, info = self.env.last()
+        assert self.env.agent_selection == 'player_1'
+        np.testing.assert_array_equal(observation['observation'], [7, 5, 3])
+        assert observation['action_mask'].all()
+        assert reward == 0 and not terminated
+
+    def test_observation_cached_and_shared(self):
+        """Test that both agents get the same read-only observation object."""
+        first = self.env.observe('player_1')
+        assert self.env.observe('player_2') is first
+        assert not first['observation'].flags.writeable
+        self.env.step([0, 1])
+        assert self.env.observe('player_1') is not first
+
+    def test_zero_sum_rewards_and_exit(self):
+        """Test per-agent rewards at the end and the None steps that follow."""
+        self.env.reset(options={'board': [0, 1, 1]})
+        self.env.step(1)           # [0, 2] on an empty pile: illegal
+        assert self.env.rewards == {'player_1': -2, 'player_2': 0}
+        self.env.reset(options={'board': [0, 1, 1]})
+        self.env.step([1, 1])
+        self.env.step(6)           # player_2 takes the last piece: [2, 1]
+        assert self.env.terminations == {'player_1': True, 'player_2': True}
+        assert self.env.rewards == {'player_1': 1, 'player_2': -1}
+        played = []
+        for agent in self.env.agent_iter():
+            observation, reward, terminated, truncated, info = self.env.last()
+            assert terminated
+            played.append((agent, reward))
+            self.env.step(None)
+        assert played == [('player_1', 1), ('player_2', -1)]
+        assert self.env.agents == []
+
+    def test_done_agent_needs_none(self):
+        """Test that a terminated agent cannot act."""
+        self.env.reset(options={'board': [1, 0, 0]})
+        self.env.step([0, 1])
+        with pytest.raises(ValueError):
+            self.env.step([0, 1])
+
+    def test_rules(self):
+        """Test that normal play flips the rewards."""
+        env = NimAECEnv(rules='normal')
+        env.reset(options={'board': [1, 0, 0]})
+        env.step([0, 1])
+        assert env.rewards == {'player_1': 1, 'player_2': -1}
+
+
+class TestNimParallelEnv:
+    """Test suite for the batched two-agent environment."""
+
+    def test_seats_pick_actions(self):
+        """Test that each game plays the action of the seat on move."""
+        envs = NimParallelEnv(2)
+        observations, infos = envs.reset(options={'board': [[1, 0, 0], [7, 5, 3]]})
+        assert observations['player_1'] is observations['player_2']
+        assert observations['player_1']['action_mask'].shape == (2, 9)
+        actions = {'player_1': np.array([0, 3]), 'player_2': np.array([8, 8])}
+        observations, rewards, terminations, truncations, infos = envs.step(actions)
+        np.testing.assert_array_equal(rewards['player_1'], [-1, 0])
+        np.testing.assert_array_equal(rewards['player_2'], [1, 0])
+        np.testing.assert_array_equal(terminations['player_1'], [True, False])
+        np.testing.assert_array_equal(observations['player_2']['board'][1], [7, 4, 3])
+        # game 1 now has player 2 on move and plays its action
+        actions = {'player_1': np.array([0, 0]), 'player_2': np.array([0, 8])}
+        observations, rewards, terminations, truncations, infos = envs.step(actions)
+        np.testing.assert_array_equal(observations['player_1']['board'][1], [7, 4, 0])
+
+    def test_self_play_rewards_sum_to_zero(self):
+        """Test zero-sum rewards for legal self-play with a joint action array."""
+        envs = NimParallelEnv(64)
+        observations, infos = envs.reset(seed=0)
+        rng = np.random.default_rng(0)
+        finished = 0
+        for _ in range(50):
+            masks = observations['player_1']['action_mask']
+            actions = np.where(masks, rng.random(masks.shape), -1).argmax(axis=1)
+            observations, rewards, terminations, truncations, infos = envs.step(actions)
+            np.testing.assert_array_equal(rewards['player_1'] + rewards['player_2'], 0)
+            finished += terminations['player_1'].sum()
+        assert finished > 0
+
+    def test_illegal_move_penalizes_mover_only(self):
+        """Test that an illegal move costs the mover -2 and the other seat nothing."""
+        envs = NimParallelEnv(1)
+        envs.reset(options={'board': [1, 0, 0]})
+        observations, rewards, terminations, truncations, infos = envs.step(
+            {'player_1': np.array([[1, 1]]), 'player_2': np.array([[0, 1]])})
+        assert rewards['player_1'][0] == -2 and rewards['player_2'][0] == 0
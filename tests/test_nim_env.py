@@ -2,6 +2,9 @@ import pytest
 import numpy as np
 import gymnasium as gym
 import gym_nim
+from gym_nim.encoding import pack_board
+from gym_nim.envs import NimEnv
+from gym_nim.rules import make_rules
 
 
 class TestNimEnv:
@@ -184,6 +187,17 @@ class TestNimEnv:
         assert reward == -2  # Penalty for illegal move
         assert terminated  # Game ends on illegal move
 
+    def test_verbose_illegal_move_messages(self, capsys):
+        """Test that illegal moves are printed by default and silent with verbose=False."""
+        self.env.reset()
+        self.env.step([0, 10])
+        assert 'Illegal move' in capsys.readouterr().out
+        env = gym.make('nim-v0', verbose=False)
+        env.reset()
+        state, reward, terminated, truncated, info = env.step([0, 10])
+        assert reward == -2 and terminated
+        assert capsys.readouterr().out == ''
+
     def test_state_immutability_after_illegal_move(self):
         """Test that state doesn't change after illegal move."""
         self.env.reset()
@@ -278,6 +292,13 @@ class TestNimEnv:
         obs_space = self.env.observation_space
         assert obs_space.n == 8 * 8 * 8 * 2
     
+    def test_observation_space_n_covers_packed_states(self):
+        """Test that .n covers every packed state when max_pile + 1 is not a power of two."""
+        env = NimEnv(make_rules('misere', max_pile=9))
+        Q = np.zeros((env.observation_space.n, env.action_space.n))
+        state, info = env.reset(options={'board': [9, 9, 9], 'on_move': 2})
+        assert Q[pack_board(state['board'], state['on_move'], bits=4)].shape == (env.action_space.n,)
+    
     def test_observation_within_space(self):
         """Test that observations are within the declared observation space."""
         # Reset and check initial observation
@@ -346,4 +367,113 @@ class TestNimEnv:
         self.env.reset()
         self.unwrapped.set_board([1, 0, 0])  # Only one piece left
         state, reward, terminated, truncated, info = self.env.step([0, 1])
-        assert reward == -1  # Losing player
\ No newline at end of file
+        assert reward == -1  # Losing player
+
+    def test_incremental_hash_matches_full_recompute(self):
+        """Test that the Zobrist hash and nim-sum stay in sync with the board."""
+        from gym_nim.encoding import ZOBRIST
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            self.env.reset()
+            terminated = False
+            while not terminated:
+                moves = self.unwrapped.move_generator()
+                action = moves[rng.integers(len(moves))]
+                state, reward, terminated, truncated, info = self.env.step(action)
+                board = state['board']
+                assert self.unwrapped.zobrist_hash == ZOBRIST.hash(board, state['on_move'])
+                assert self.unwrapped.nim_sum == int(board[0] ^ board[1] ^ board[2])
+
+    def test_hash_transpositions(self):
+        """Test that move orders reaching the same position hash alike."""
+        self.env.reset()
+        self.env.step([0, 1])
+        self.env.step([1, 2])
+        first = self.unwrapped.zobrist_hash
+
+        self.env.reset()
+        self.env.step([1, 2])
+        self.env.step([0, 1])
+        assert self.unwrapped.zobrist_hash == first
+
+        # Same board, other player on move
+        self.env.reset()
+        self.env.step([0, 1])
+        self.env.step([1, 1])
+        self.env.step([1, 1])
+        assert self.unwrapped.zobrist_hash != first
+
+    def test_hash_after_set_board_and_illegal_move(self):
+        """Test hash and nim-sum after set_board and an illegal move."""
+        self.env.reset()
+        self.unwrapped.set_board([1, 2, 3])
+        assert self.unwrapped.nim_sum == 0
+        before = self.unwrapped.zobrist_hash
+        self.env.step([0, 5])
+        assert self.unwrapped.zobrist_hash == before
+
+    def test_hash_before_reset(self):
+        """Test that hash and nim-sum are None before the game starts."""
+        new_env = gym.make('nim-v0')
+        assert new_env.unwrapped.zobrist_hash is None
+        assert new_env.unwrapped.nim_sum is None
+        new_env.close()
+
+    def test_reset_with_board_option(self):
+        """Test that reset options set a custom start position."""
+        state, info = self.env.reset(options={'board': [2, 0, 1], 'on_move': 2})
+        np.testing.assert_array_equal(state['board'], [2, 0, 1])
+        assert state['on_move'] == 2
+        assert self.env.unwrapped.nim_sum == 3
+        state, reward, terminated, truncated, info = self.env.step([0, 2])
+        assert not terminated
+        state, info = self.env.reset()
+        np.testing.assert_array_equal(state['board'], [7, 5, 3])
+
+    @pytest.mark.parametrize('rules', [None, 'misere'])
+    def test_reset_with_on_move_option(self, rules):
+        """Test that on_move alone keeps the start board and sets the player."""
+        env = NimEnv(rules)
+        state, info = env.reset(options={'on_move': 2})
+        np.testing.assert_array_equal(state['board'], [7, 5, 3])
+        assert state['on_move'] == 2
+        state, reward, terminated, truncated, info = env.step([0, 1])
+        assert state['on_move'] == 1
+        assert env.reset()[0]['on_move'] == 1
+
+    @pytest.mark.parametrize('mode', ['tuple', 'ring', 'packed'])
+    def test_observation_modes_are_snapshots(self, mode):
+        """Test that returned observations are not changed by later steps."""
+        env = gym.make('nim-v0', observation_mode=mode, ring_size=4)
+        first, info = env.reset()
+        assert env.observation_space.contains(first)
+        second, reward, terminated, truncated, info = env.step([0, 2])
+        assert env.observation_space.contains(second)
+        env.step([1, 1])
+        if mode == 'tuple':
+            assert first == ((7, 5, 3), 1) and second == ((5, 5, 3), 2)
+        elif mode == 'packed':
+            assert first == pack_board([7, 5, 3], 1) and second == pack_board([5, 5, 3], 2)
+        else:
+            np.testing.assert_array_equal(first['board'], [7, 5, 3])
+            np.testing.assert_array_equal(second['board'], [5, 5, 3])
+            assert second['on_move'] == 2
+            with pytest.raises(ValueError):
+                second['board'][0] = 0
+        # the live state is still available whatever the mode
+        np.testing.assert_array_equal(env.unwrapped.state['board'], [5, 4, 3])
+        env.close()
+
+    def test_ring_buffer_wraps(self):
+        """Test that a ring slot is reused after ring_size steps."""
+        env = NimEnv(observation_mode='ring', ring_size=2)
+        first, _ = env.reset()
+        env.step([0, 1])
+        third, _, _, _, _ = env.step([0, 1])
+        assert third is first
+        np.testing.assert_array_equal(first['board'], [5, 5, 3])
+
+    def test_invalid_observation_mode(self):
+        """Test that unknown observation modes are rejected."""
+        with pytest.raises(ValueError):
+            NimEnv(observation_mode='copy')
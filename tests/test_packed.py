@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from gym_nim.encoding import pack_boards
+from gym_nim.envs import NimVectorEnv, PackedNimBatch
+from gym_nim.parity import random_games, run_parity
+from gym_nim.rules import make_rules
+
+
+class TestPackedNimBatch:
+    """Test suite for the packed-word game batch."""
+
+    def test_layout(self):
+        """Test word dtypes, the pack_board layout and bytes per game."""
+        games = PackedNimBatch(1000)
+        words, info = games.reset()
+        assert words.dtype == np.uint16 and games.tables
+        assert (words == pack_boards([[7, 5, 3]], [1])[0]).all()
+        assert games.nbytes == 5 * 1000
+        assert PackedNimBatch(4, n_piles=10).dtype == np.uint32
+        big = PackedNimBatch(4, n_piles=21, start=[7] * 21)
+        assert big.dtype == np.uint64 and not big.tables
+        with pytest.raises(ValueError):
+            PackedNimBatch(4, n_piles=30)
+
+    def test_step(self):
+        """Test a legal move, an illegal move, the last move and autoreset."""
+        games = PackedNimBatch(3)
+        games.reset(options={'board': [[1, 0, 0], [0, 2, 0], [7, 5, 3]]})
+        words, rewards, terminated, truncated, info = games.step([0, 4, 0])
+        boards, on_move = games.unpack()
+        np.testing.assert_array_equal(boards, [[0, 0, 0], [0, 0, 0], [6, 5, 3]])
+        np.testing.assert_array_equal(on_move, [1, 1, 2])  # no switch on the terminal move
+        np.testing.assert_array_equal(rewards, [-1, -1, 0])
+        np.testing.assert_array_equal(terminated, [True, True, False])
+        assert not truncated.any()
+        words, rewards, terminated, *_ = games.step([0, 0, 11])
+        np.testing.assert_array_equal(games.unpack()[0], [[1, 0, 0], [0, 2, 0], [6, 5, 3]])
+        np.testing.assert_array_equal(rewards, [0, 0, -2])
+
+    @pytest.mark.parametrize('tables', [True, False])
+    def test_matches_vector_env(self, tables):
+        """Test that masks and steps follow NimVectorEnv, invalid indices included."""
+        rng = np.random.default_rng(0)
+        games = PackedNimBatch(500, tables=tables)
+        envs = NimVectorEnv(500)
+        games.reset(seed=0)
+        envs.reset()
+        for t in range(100):
+            np.testing.assert_array_equal(games.action_masks(), envs.action_masks())
+            actions = games.sample_actions() if t % 4 else rng.integers(-1, 10, 500)
+            _, rewards, terminated, _, _ = games.step(actions)
+            obs, expected_rewards, expected_terminated, _, _ = envs.step(actions)
+            boards, on_move = games.unpack()
+            np.testing.assert_array_equal(boards, obs['board'])
+            np.testing.assert_array_equal(on_move, obs['on_move'])
+            np.testing.assert_array_equal(rewards, expected_rewards)
+            np.testing.assert_array_equal(terminated, expected_terminated)
+
+    @pytest.mark.parametrize('tables', [True, False])
+    def test_sample_actions_are_legal(self, tables):
+        """Test that sampled actions are legal and cover every legal move."""
+        games = PackedNimBatch(2000, tables=tables)
+        games.reset(seed=1, options={'board': [2, 0, 1]})
+        actions = games.sample_actions()
+        masks = games.action_masks()
+        assert masks[np.arange(2000), actions].all()
+        assert set(actions.tolist()) == {0, 1, 6}
+
+    def test_sample_actions_with_many_actions(self):
+        """Test sampling under a rule set with more actions than fit in int8."""
+        rules = make_rules('wythoff', max_pile=63)
+        assert rules.n_actions > 127
+        games = PackedNimBatch(2000, rules=rules)
+        games.reset(seed=0)
+        sampled = []
+        for _ in range(20):
+            actions = games.sample_actions()
+            masks = games.action_masks()
+            has_move = masks.any(axis=1)
+            assert (actions >= 0).all() and (actions < rules.n_actions).all()
+            assert masks[np.arange(2000), actions][has_move].all()
+            sampled.append(actions[has_move])
+            games.step(actions)
+        assert np.concatenate(sampled).max() > 127
+
+    def test_parity_with_reference(self):
+        """Test both paths, and a rule set, against NimEnv through the parity harness."""
+        report = run_parity(random_games(1000, seed=3), backends=['PackedNimBatch', 'PackedNimBatch[bitwise]'])
+        assert report['ok']
+        report = run_parity(random_games(1000, 'wythoff', seed=3), backends=['PackedNimBatch'], rules='wythoff')
+        assert report['ok']
+        with pytest.raises(ValueError):
+            PackedNimBatch(4, rules='normal', tables=False)
+
+    def test_bitwise_large_board(self):
+        """Test the bitwise path on a 64-bit word: playing a whole game down to the end."""
+        games = PackedNimBatch(1, n_piles=21, start=[1] * 21)
+        games.reset()
+        for pile in range(20):
+            _, rewards, terminated, _, _ = games.step([pile * 3])
+            assert rewards[0] == 0 and not terminated[0]
+        _, rewards, terminated, _, _ = games.step([60])
+        assert rewards[0] == -1 and terminated[0]
+        assert games.unpack()[0].sum() == 0
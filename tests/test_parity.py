@@ -0,0 +1,84 @@
+import pytest
+
+from gym_nim import parity
+from gym_nim.parity import (
+    BACKENDS, Games, exhaustive_transitions, format_report, random_games, run_backend, run_parity
+)
+from gym_nim.rules import make_rules
+
+
+class TestParity:
+    """Test suite for the differential backend harness."""
+
+    def test_exhaustive_transitions_match(self):
+        """Test that every backend agrees on every single move from every position."""
+        games = exhaustive_transitions()
+        assert len(games) == 512 * 2 * 20
+        report = run_parity(games)
+        assert report['ok'], format_report(report)
+        assert set(report['backends']) == set(BACKENDS)
+
+    @pytest.mark.parametrize('rules', [None, 'normal', 'wythoff'])
+    def test_random_games_match(self, rules):
+        """Test that every backend agrees on random games, illegal moves included."""
+        rules = make_rules(rules) if rules else None
+        games = random_games(2000, rules, illegal_rate=0.1, seed=0)
+        report = run_parity(games, rules=rules, shards=3)
+        assert report['ok'], format_report(report)
+        assert report['moves'] > 2000
+
+    def test_reference_is_independent(self, monkeypatch):
+        """Test that a bug shared by NimCore and NimEnv is caught by the reference."""
+        def play(core, pile, count):
+            core.on_move = 3 - core.on_move
+            return -2, True
+
+        monkeypatch.setattr(parity.NimCore, 'play', play)
+        games = Games([[1, 0, 0]], [1], [[[0, 1]]])
+        report = run_parity(games, backends=['NimEnv', 'NimCore'])
+        assert report['backends']['NimEnv']['mismatch'] is not None
+        assert report['backends']['NimCore']['mismatch'] is not None
+
+    def test_shards_report_global_game(self, monkeypatch):
+        """Test that a mismatch in a later shard is reported with its index in all games."""
+        def broken(games, rules):
+            out = BACKENDS['NumpyStep'](games, rules)
+            out['rewards'][games.first == 2, 0] += 1
+            return out
+
+        monkeypatch.setitem(parity.BACKENDS, 'broken', broken)
+        games = Games([[7, 5, 3]] * 6, [1, 1, 1, 1, 2, 1], [[[0, 1]]] * 6)
+        report = run_parity(games, backends=['broken'], shards=3)
+        assert report['backends']['broken']['mismatch']['game'] == 4
+        assert report['moves'] == 6
+
+    def test_random_games_end(self):
+        """Test that generated games end within their plies and include illegal moves."""
+        games = random_games(500, seed=1)
+        trajectories, seconds = run_backend('NimEnv', games)
+        assert trajectories['terminated'].any(axis=1).all()
+        assert (trajectories['rewards'] == -2).any() and (trajectories['rewards'] == -1).any()
+        assert seconds > 0
+
+    def test_detects_divergence(self, monkeypatch):
+        """Test that a backend that switches on_move on the terminal move is caught."""
+        def broken(games, rules):
+            out = BACKENDS['NimCore'](games, rules)
+            ended = out['terminated'] & (out['rewards'] == -1)
+            out['on_move'][ended] = 3 - out['on_move'][ended]
+            return out
+
+        monkeypatch.setitem(parity.BACKENDS, 'broken', broken)
+        games = Games([[1, 0, 0]], [1], [[[0, 1]]])
+        report = run_parity(games, backends=['broken'])
+        assert not report['ok']
+        mismatch = report['backends']['broken']['mismatch']
+        assert mismatch == {'game': 0, 'ply': 0, 'field': 'on_move', 'expected': 1, 'actual': 2}
+        assert 'MISMATCH' in format_report(report)
+
+    def test_parallel_workers(self):
+        """Test running the backends in worker processes."""
+        games = random_games(300, seed=2)
+        report = run_parity(games, backends=['NimCore', 'NimVectorEnv'], workers=2)
+        assert report['ok'] and report['games'] == 300
+        assert list(report['backends']) == ['NumpyStep', 'NimCore', 'NimVectorEnv']
@@ -0,0 +1,83 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import gym_nim
+from gym_nim.envs import NimEnv
+
+
+class TestEnvPool:
+    """Test suite for pooled env reuse."""
+
+    def test_fast_and_checked_envs(self):
+        """Test that fast pools hold bare NimEnvs and others hold gym.make envs."""
+        fast = gym_nim.make_pool(3, fast=True)
+        assert len(fast) == 3 and all(type(env) is NimEnv for env in fast)
+        checked = gym_nim.make_pool(2)
+        assert all(isinstance(env, gym.Wrapper) for env in checked)
+        assert all(type(env.unwrapped) is NimEnv for env in checked)
+
+    def test_acquire_resets_and_reuses(self):
+        """Test that released envs come back reset and are not rebuilt."""
+        pool = gym_nim.make_pool(1, fast=True)
+        env = pool.acquire()
+        env.step([0, 3])
+        pool.release(env)
+        again = pool.acquire(options={'board': [1, 1, 0]})
+        assert again is env
+        np.testing.assert_array_equal(again.state['board'], [1, 1, 0])
+
+    def test_grows_when_exhausted(self):
+        """Test that acquiring past the size builds one more env."""
+        pool = gym_nim.make_pool(1, fast=True)
+        first, second = pool.acquire(), pool.acquire()
+        assert first is not second and len(pool) == 2
+        assert pool.available == 0
+
+    def test_release_checks_leases(self):
+        """Test that double and foreign releases raise instead of corrupting the pool."""
+        pool = gym_nim.make_pool(2, fast=True)
+        env = pool.acquire()
+        pool.release(env)
+        with pytest.raises(ValueError):
+            pool.release(env)
+        with pytest.raises(ValueError):
+            pool.release(NimEnv())
+        first, second = pool.acquire(), pool.acquire()
+        assert first is not second and pool.available == 0
+
+    def test_lease(self):
+        """Test that leased envs are returned even when the block raises."""
+        pool = gym_nim.make_pool(4, fast=True, observation_mode='tuple')
+        with pytest.raises(RuntimeError):
+            with pool.lease(3) as envs:
+                assert pool.available == 1
+                assert envs[0].step([0, 1])[0] == ((6, 5, 3), 2)
+                raise RuntimeError
+        assert pool.available == 4
+
+    def test_failed_reset_keeps_envs(self):
+        """Test that an env whose reset raises, and envs leased before it, stay in the pool."""
+        pool = gym_nim.make_pool(2, fast=True, rules='misere')
+        with pytest.raises(ValueError):
+            pool.acquire(options={'board': [9, 9, 9]})
+        assert pool.available == 2
+
+        def broken_reset(seed=None, options=None):
+            raise RuntimeError
+
+        pool.envs[1].reset = broken_reset
+        with pytest.raises(RuntimeError):
+            with pool.lease(2):
+                pass
+        assert pool.available == 2
+        del pool.envs[1].reset
+        with pool.lease(2) as envs:
+            assert set(envs) == set(pool.envs)
+
+    def test_reset_all_and_close(self):
+        """Test resetting the whole pool and closing it."""
+        with gym_nim.make_pool(2, fast=True, rules='wythoff') as pool:
+            observations = pool.reset_all()
+            np.testing.assert_array_equal(observations[1]['board'], [7, 5])
+        assert len(pool) == 0
@@ -0,0 +1,112 @@
+import json
+import pstats
+
+import gymnasium as gym
+import gym_nim
+from gym_nim.envs import NimEnv
+from gym_nim.profiling import EnvProfiler
+
+
+class TestEnvProfiler:
+    """Test suite for the opt-in environment profiler."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.env = gym.make('nim-v0')
+        self.profiler = EnvProfiler().attach(self.env)
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        self.profiler.detach()
+        self.env.close()
+
+    def test_call_counts(self):
+        """Test that step, reset and move_generator calls are counted."""
+        self.env.reset()
+        self.env.unwrapped.move_generator()
+        self.env.step([0, 1])
+        self.env.step([1, 1])
+
+        stats = self.profiler.to_dict()
+        assert stats['calls']['reset'] == 1
+        assert stats['calls']['step'] == 2
+        assert stats['calls']['move_generator'] == 1
+        assert stats['calls']['wrapper.step'] == 2
+
+    def test_wrapper_time_includes_core_time(self):
+        """Test that the wrapper's cumulative time contains the env's."""
+        self.env.reset()
+        for _ in range(5):
+            self.env.step([0, 1])
+        stats = self.profiler.to_dict()
+        assert stats['total_time']['wrapper.step'] >= stats['total_time']['step']
+        assert stats['own_time']['wrapper.step'] >= 0
+
+    def test_illegal_moves_and_episode_lengths(self):
+        """Test illegal-move counting and the episode length histogram."""
+        self.env.reset()
+        self.env.step([0, 10])  # illegal, ends the episode after 1 step
+
+        self.env.reset()
+        self.env.unwrapped.set_board([1, 0, 1])
+        self.env.step([0, 1])
+        self.env.step([2, 1])  # takes the last piece
+
+        stats = self.profiler.to_dict()
+        assert stats['illegal_moves'] == 1
+        assert stats['episodes'] == 2
+        assert stats['episode_lengths'] == {'1': 1, '2': 1}
+
+    def test_section_and_wrap(self):
+        """Test timing of agent code through section() and wrap()."""
+        self.env.reset()
+        with self.profiler.section('agent'):
+            self.env.unwrapped.move_generator()
+        pick = self.profiler.wrap(lambda moves: moves[0], name='pick')
+        pick([[0, 1]])
+
+        stats = self.profiler.to_dict()
+        assert stats['calls']['agent'] == 1
+        assert stats['calls']['pick'] == 1
+        assert stats['calls']['move_generator'] == 1
+        assert stats['total_time']['agent'] >= stats['total_time']['move_generator']
+
+    def test_json_export(self):
+        """Test that the statistics round-trip through JSON."""
+        self.env.reset()
+        self.env.step([0, 1])
+        data = json.loads(self.profiler.to_json())
+        assert data['calls']['step'] == 1
+
+    def test_pstats_compatible(self, tmp_path):
+        """Test that the report loads through pstats, directly and from a file."""
+        self.env.reset()
+        self.env.step([0, 1])
+
+        stats = pstats.Stats(self.profiler)
+        names = {func[2] for func in stats.stats}
+        assert {'step', 'reset', 'wrapper.step'} <= names
+
+        path = tmp_path / 'nim.prof'
+        self.profiler.dump_stats(str(path))
+        loaded = pstats.Stats(str(path))
+        assert loaded.total_calls == stats.total_calls
+
+    def test_detach_restores_methods(self):
+        """Test that detaching leaves no instance-level hooks behind."""
+        self.profiler.detach()
+        assert 'step' not in self.env.unwrapped.__dict__
+        assert 'step' not in self.env.__dict__
+        self.env.reset()
+        self.env.step([0, 1])
+        assert self.profiler.to_dict()['calls'] == {}
+
+    def test_unwrapped_env(self):
+        """Test attaching directly to a bare NimEnv."""
+        env = NimEnv()
+        profiler = EnvProfiler().attach(env)
+        env.reset()
+        env.step([0, 1])
+        stats = profiler.to_dict()
+        assert stats['calls']['step'] == 1
+        assert 'wrapper.step' not in stats['calls']
@@ -0,0 +1,131 @@
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+from gym_nim.encoding import index_to_action, pack_board
+from gym_nim.envs import NimEnv, NimVectorEnv
+from gym_nim.records import GameReplayer, iter_records, to_columnar
+
+
+def random_games(n, seed=0):
+    """Play ``n`` random legal games and return them as record dicts."""
+    rng = np.random.default_rng(seed)
+    envs = NimVectorEnv(n)
+    envs.reset()
+    moves = [[] for _ in range(n)]
+    done = np.zeros(n, dtype=bool)
+    while not done.all():
+        masks = envs.action_masks()
+        actions = np.where(masks, rng.random(masks.shape), -1).argmax(axis=1)
+        obs, rewards, terminated, truncated, info = envs.step(actions)
+        for i in np.flatnonzero(~done):
+            moves[i].append(index_to_action(actions[i]))
+        done |= terminated
+    return [{'moves': game} for game in moves]
+
+
+def write_jsonl(path, records, opener=open):
+    with opener(path, 'wt') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+class TestGameReplayer:
+    """Test suite for streaming game-record import and replay."""
+
+    def test_matches_env_replay(self, tmp_path):
+        """Test states, on_move and outcomes against stepping NimEnv."""
+        records = random_games(20)
+        path = tmp_path / 'games.jsonl'
+        write_jsonl(path, records)
+        batch = GameReplayer().load(path, chunk_size=7)
+        expected_states, expected_outcomes = [], []
+        env = NimEnv()
+        for record in records:
+            state, _ = env.reset()
+            movers = []
+            for move in record['moves']:
+                expected_states.append(pack_board(state['board'], state['on_move']))
+                movers.append(state['on_move'])
+                state, reward, terminated, truncated, info = env.step(move)
+            loser = movers[-1]
+            expected_outcomes += [-1 if mover == loser else 1 for mover in movers]
+        np.testing.assert_array_equal(batch['states'], expected_states)
+        np.testing.assert_array_equal(batch['outcomes'], expected_outcomes)
+        assert batch['games'][-1] == 19
+
+    def test_columnar_and_gzip_match(self, tmp_path):
+        """Test that gzip JSONL and the columnar format replay identically."""
+        records = random_games(30, seed=1)
+        plain, packed = tmp_path / 'games.jsonl', tmp_path / 'games.jsonl.gz'
+        write_jsonl(plain, records)
+        write_jsonl(packed, records, gzip.open)
+        meta = to_columnar(packed, tmp_path / 'columns', chunk_size=8)
+        assert meta['n_games'] == 30
+        expected = GameReplayer().load(plain)
+        for source in (packed, tmp_path / 'columns'):
+            batch = GameReplayer().load(source, chunk_size=11)
+            for key in expected:
+                np.testing.assert_array_equal(batch[key], expected[key])
+
+    def test_custom_start_indices_and_incomplete(self, tmp_path):
+        """Test start boards, action-index moves and unfinished games."""
+        path = tmp_path / 'games.jsonl'
+        write_jsonl(path, [{'board': [1, 1, 0], 'on_move': 2, 'moves': [0, 3]},
+                           {'board': [2, 2, 0], 'moves': [[0, 1]]}])
+        batch = GameReplayer().load(path)
+        np.testing.assert_array_equal(batch['on_move'], [2, 1, 1])
+        np.testing.assert_array_equal(batch['outcomes'], [1, -1, 0])
+        np.testing.assert_array_equal(batch['boards'][1], [0, 1, 0])
+
+    def test_illegal_games(self, tmp_path):
+        """Test that illegal moves raise or are skipped."""
+        path = tmp_path / 'games.jsonl'
+        write_jsonl(path, [{'moves': [[0, 1]]},
+                           {'board': [1, 0, 0], 'moves': [[0, 1], [0, 1]]},
+                           {'moves': [[5, 1]]},
+                           {'board': [9, 0, 0], 'moves': []}])
+        with pytest.raises(ValueError, match='Game 1: illegal move at ply 1'):
+            GameReplayer().load(path)
+        replayer = GameReplayer(errors='skip')
+        batch = replayer.load(path)
+        assert replayer.skipped == 3 and replayer.games == 1
+        np.testing.assert_array_equal(batch['games'], [0])
+
+    @pytest.mark.parametrize('bad, reason', [
+        ({'board': [7, 5], 'moves': [[0, 1]]}, 'does not have 3 piles'),
+        ({'moves': [[0, 1, 1]]}, 'neither action indices nor'),
+        ({'moves': [[0, 1], 4]}, 'malformed record'),
+    ])
+    def test_malformed_records(self, tmp_path, bad, reason):
+        """Test that a malformed record raises with its game number or is skipped."""
+        path = tmp_path / 'games.jsonl'
+        write_jsonl(path, [{'moves': [[0, 1]]}, {'moves': [2, 4]}, bad, {'moves': [[1, 2]]}])
+        with pytest.raises(ValueError, match=f'Game 2: .*{reason}'):
+            GameReplayer().load(path, chunk_size=3)
+        replayer = GameReplayer(errors='skip')
+        batch = replayer.load(path, chunk_size=3)
+        assert replayer.skipped == 1 and replayer.games == 3
+        np.testing.assert_array_equal(batch['games'], [0, 1, 1, 3])
+        np.testing.assert_array_equal(batch['actions'], [0, 2, 4, 4])
+        meta = to_columnar(path, tmp_path / 'columns')
+        assert meta['n_games'] == 4
+        replayer = GameReplayer(errors='skip')
+        replayer.load(tmp_path / 'columns')
+        assert replayer.skipped == 1 and replayer.games == 3
+
+    def test_rules(self, tmp_path):
+        """Test replay under normal-play Wythoff rules."""
+        path = tmp_path / 'games.jsonl'
+        write_jsonl(path, [{'moves': [[2, 5], [0, 2]]}])
+        batch = GameReplayer(rules='wythoff').load(path)
+        np.testing.assert_array_equal(batch['boards'], [[7, 5], [2, 0]])
+        np.testing.assert_array_equal(batch['outcomes'], [-1, 1])
+
+    def test_iter_records_chunks(self, tmp_path):
+        """Test lazy chunking and blank-line handling."""
+        path = tmp_path / 'games.jsonl'
+        path.write_text('{"moves": []}\n\n' * 5)
+        assert [len(chunk) for chunk in iter_records(path, chunk_size=4)] == [2, 2, 1]
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from gym_nim.encoding import pack_board, pack_boards, unpack_boards
+from gym_nim.envs import NimEnv
+from gym_nim.replay import ReplayBuffer, SumTree
+
+
+class TestSumTree:
+    """Test suite for the array-backed sum tree."""
+
+    def test_total_and_find(self):
+        """Test prefix-sum lookup over a handful of priorities."""
+        tree = SumTree(5)
+        tree.update(np.arange(5), [1.0, 2.0, 0.0, 3.0, 4.0])
+        assert tree.total == pytest.approx(10.0)
+        found = tree.find([0.5, 1.5, 2.9, 3.0, 5.9, 6.0, 9.99])
+        np.testing.assert_array_equal(found, [0, 1, 1, 3, 3, 4, 4])
+
+    def test_update_refreshes_ancestors(self):
+        """Test that updating one leaf changes the total accordingly."""
+        tree = SumTree(8)
+        tree.update(np.arange(8), np.ones(8))
+        tree.update([6], [5.0])
+        assert tree.total == pytest.approx(12.0)
+        assert tree[[6]][0] == 5.0
+
+
+class TestReplayBuffer:
+    """Test suite for the ring-array replay buffer."""
+
+    def test_add_from_env(self):
+        """Test storing a real env transition as packed ints."""
+        env = NimEnv()
+        buffer = ReplayBuffer(10, seed=0)
+        state, info = env.reset()
+        packed = pack_board(state['board'], state['on_move'])
+        next_state, reward, terminated, truncated, info = env.step([0, 2])
+        buffer.add(packed, [0, 2], reward, next_state, terminated)
+
+        assert len(buffer) == 1
+        batch = buffer.sample(4)
+        assert np.all(batch['states'] == pack_board([7, 5, 3], 1))
+        assert np.all(batch['next_states'] == pack_board([5, 5, 3], 2))
+        assert np.all(batch['actions'] == 1)
+        assert not batch['dones'].any()
+
+    def test_ring_overwrites_oldest(self):
+        """Test that the buffer wraps around at capacity."""
+        buffer = ReplayBuffer(4)
+        for i in range(6):
+            buffer.add(i, 0, float(i), i, False)
+        assert len(buffer) == 4
+        assert sorted(buffer.rewards.tolist()) == [2.0, 3.0, 4.0, 5.0]
+
+    def test_add_batch(self):
+        """Test batched inserts of observation dicts and move arrays."""
+        buffer = ReplayBuffer(5)
+        boards = np.array([[7, 5, 3], [1, 0, 0], [0, 2, 1]])
+        states = {'board': boards, 'on_move': np.array([1, 2, 1])}
+        actions = np.array([[0, 1], [0, 1], [2, 1]])
+        buffer.add_batch(states, actions, [0, -1, 0], states, [False, True, False])
+        buffer.add_batch(states, actions, [0, -1, 0], states, [False, True, False])
+
+        assert len(buffer) == 5
+        # The second batch wraps around: slots 3, 4, 0
+        np.testing.assert_array_equal(buffer.actions, [6, 0, 6, 0, 0])
+        np.testing.assert_array_equal(buffer.states[1:2], pack_boards(boards, [1, 2, 1])[1:2])
+        restored, on_move = unpack_boards(buffer.states[2:5])
+        np.testing.assert_array_equal(restored, boards[[2, 0, 1]])
+        np.testing.assert_array_equal(on_move, [1, 1, 2])
+
+    def test_batch_larger_than_capacity(self):
+        """Test that an oversized batch is rejected."""
+        buffer = ReplayBuffer(2)
+        with pytest.raises(ValueError, match="exceeds capacity"):
+            buffer.add_batch(np.zeros(3), np.zeros(3), np.zeros(3), np.zeros(3), np.zeros(3))
+
+    def test_sample_empty(self):
+        """Test that sampling an empty buffer raises."""
+        with pytest.raises(ValueError, match="empty"):
+            ReplayBuffer(4).sample(1)
+
+    def test_prioritized_sampling(self):
+        """Test that high-priority transitions dominate prioritized samples."""
+        buffer = ReplayBuffer(8, prioritized=True, alpha=1.0, seed=0)
+        buffer.add_batch(np.arange(8), np.zeros(8), np.zeros(8), np.arange(8), np.zeros(8))
+        buffer.update_priorities(np.arange(8), [0.0] * 7 + [100.0])
+
+        batch = buffer.sample(64)
+        assert (batch['indices'] == 7).mean() > 0.9
+        assert batch['weights'].max() == pytest.approx(1.0)
+
+    def test_update_priorities_requires_prioritized(self):
+        """Test that uniform buffers reject priority updates."""
+        buffer = ReplayBuffer(4)
+        buffer.add(0, 0, 0.0, 0, False)
+        with pytest.raises(ValueError, match="prioritized"):
+            buffer.update_priorities([0], [1.0])
+
+    def test_memmap_backing(self, tmp_path):
+        """Test that memory-mapped storage is written to .npy files."""
+        buffer = ReplayBuffer(16, path=str(tmp_path))
+        buffer.add(5, 3, 1.0, 6, True)
+        buffer.flush()
+        rewards = np.load(tmp_path / 'rewards.npy')
+        assert rewards[0] == 1.0
+        assert isinstance(buffer.states, np.memmap)
+
+    def test_memmap_reopen_resumes(self, tmp_path):
+        """Test that resume=True restores the size and write position of a memmap directory."""
+        buffer = ReplayBuffer(4, prioritized=True, path=str(tmp_path))
+        for first in (0, 3):
+            states = np.arange(first, first + 3)
+            buffer.add_batch(states, np.zeros(3), np.ones(3), states + 1, np.zeros(3, dtype=bool))
+        buffer.flush()
+        del buffer
+        reopened = ReplayBuffer(4, prioritized=True, path=str(tmp_path), resume=True, seed=0)
+        assert len(reopened) == 4
+        np.testing.assert_array_equal(reopened.states, [4, 5, 2, 3])
+        assert reopened.tree.total > 0
+        assert set(reopened.sample(50)['indices'].tolist()) <= {0, 1, 2, 3}
+        reopened.add(9, 0, 0.0, 10, True)
+        np.testing.assert_array_equal(reopened.states, [4, 5, 9, 3])
+        with pytest.raises(ValueError, match='expected'):
+            ReplayBuffer(8, path=str(tmp_path), resume=True)
+        with pytest.raises(ValueError, match='path'):
+            ReplayBuffer(8, resume=True)
+
+    def test_memmap_reopen_starts_fresh_by_default(self, tmp_path):
+        """Test that reopening a memmap directory without resume overwrites the old buffer."""
+        buffer = ReplayBuffer(4, path=str(tmp_path))
+        buffer.add(5, 3, 1.0, 6, True)
+        buffer.flush()
+        del buffer
+        fresh = ReplayBuffer(8, path=str(tmp_path))
+        assert len(fresh) == 0 and fresh.states.shape == (8,)
+        assert not fresh.states.any()
+        assert ReplayBuffer(8)._counters is None
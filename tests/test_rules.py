@@ -0,0 +1,147 @@
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from gym_nim.envs import NimEnv, NimVectorEnv
+from gym_nim.rules import RuleSet, make_rules
+from gym_nim.solver import NimSolver
+
+
+def brute_force_wins(rules):
+    """Reference solver that enumerates moves with plain Python."""
+    moves = [(a, rules.moves[a]) for a in np.flatnonzero(rules.valid_action)]
+
+    @lru_cache(maxsize=None)
+    def wins(board):
+        children = [tuple(np.subtract(board, move)) for _, move in moves
+                    if all(p >= m for p, m in zip(board, move))]
+        if not children:
+            return rules.misere
+        return any(not wins(child) for child in children)
+    return wins
+
+
+class TestRuleSet:
+    """Test suite for table-driven rule sets."""
+
+    def test_default_matches_nim_masks(self):
+        """Test that the misère rule set reproduces the plain Nim tables."""
+        rules = make_rules()
+        solver = NimSolver()
+        assert rules.n_actions == 9
+        assert rules.terminal.sum() == 1 and rules.terminal[0]
+        np.testing.assert_array_equal(rules.legal, solver.legal)
+
+    def test_subtraction_set(self):
+        """Test legal moves and stuck positions with takes {2, 3}."""
+        rules = make_rules('normal', takes=(2, 3))
+        assert rules.legal_moves([3, 1, 0]) == [[0, 2], [0, 3]]
+        assert rules.terminal[rules.index([1, 1, 1])]
+        assert rules.action_of(0, 1) == -1
+        np.testing.assert_array_equal(rules.action_indices([0, 0, 2, 5], [1, 2, 3, 2]), [-1, 1, 8, -1])
+
+    def test_wythoff_moves(self):
+        """Test that Wythoff adds take-from-both actions."""
+        rules = make_rules('wythoff', max_pile=5)
+        assert rules.n_actions == 15
+        assert [2, 2] in rules.legal_moves([2, 3])
+        assert [2, 3] not in rules.legal_moves([2, 3])
+        with pytest.raises(ValueError):
+            RuleSet('bad', n_piles=3, wythoff=True)
+
+    def test_cached_and_validated(self):
+        """Test that equal arguments share tables and bad boards are rejected."""
+        assert make_rules('normal', takes=[1, 2]) is make_rules('normal', takes=(1, 2))
+        with pytest.raises(ValueError):
+            make_rules('no-such-rules')
+        with pytest.raises(ValueError):
+            make_rules().index([8, 0, 0])
+
+    @pytest.mark.parametrize('rules', [
+        make_rules('normal'),
+        make_rules('misere', takes=(1, 3, 4)),
+        make_rules('normal', takes=(2, 3)),
+        make_rules('wythoff', max_pile=6),
+        make_rules('wythoff-misere', max_pile=6),
+    ], ids=repr)
+    def test_solver_against_brute_force(self, rules):
+        """Test the solver on each variant against plain enumeration."""
+        solver = NimSolver(rules=rules)
+        wins = brute_force_wins(rules)
+        for board, won in zip(solver.boards, solver.win):
+            assert won == wins(tuple(board))
+
+    def test_wythoff_cold_positions(self):
+        """Test that the losing Wythoff positions are the known pairs."""
+        solver = NimSolver(rules='wythoff')
+        lost = {tuple(board) for board in solver.boards[~solver.win]}
+        assert {(0, 0), (1, 2), (2, 1), (3, 5), (5, 3), (4, 7), (7, 4)} == lost
+
+
+class TestRuleSetEnvs:
+    """Test the envs playing under rule sets."""
+
+    def test_normal_play_reward(self):
+        """Test that the last mover wins under normal play."""
+        env = NimEnv(rules='normal')
+        env.reset(options={'board': [0, 0, 2]})
+        state, reward, terminated, truncated, info = env.step([2, 2])
+        assert reward == 1 and terminated
+        assert state['on_move'] == 1
+
+    def test_subtraction_illegal_and_stuck(self, capsys):
+        """Test rejected counts and a game ending with pieces left."""
+        env = NimEnv(rules=make_rules('misere', takes=(2, 3)))
+        assert env.action_space.n == 9
+        env.reset(options={'board': [3, 1, 0]})
+        state, reward, terminated, truncated, info = env.step([1, 1])
+        assert reward == -2 and terminated
+        assert 'not allowed' in capsys.readouterr().out
+        env.reset(options={'board': [3, 1, 0]})
+        state, reward, terminated, truncated, info = env.step([0, 2])
+        np.testing.assert_array_equal(state['board'], [1, 1, 0])
+        assert reward == -1 and terminated
+        assert env.move_generator() == []
+
+    def test_wythoff_env(self):
+        """Test a take-from-both move and the hash bookkeeping."""
+        env = NimEnv(rules='wythoff')
+        state, info = env.reset()
+        np.testing.assert_array_equal(state['board'], [7, 5])
+        state, reward, terminated, truncated, info = env.step([2, 4])
+        np.testing.assert_array_equal(state['board'], [3, 1])
+        assert env.nim_sum == 3 ^ 1
+        copy = NimEnv(rules='wythoff')
+        copy.reset(options={'board': [3, 1], 'on_move': 2})
+        assert env.zobrist_hash == copy.zobrist_hash
+
+    def test_vector_env_matches_single(self):
+        """Test NimVectorEnv with rules against NimEnv game by game."""
+        rules = make_rules('wythoff-misere', max_pile=7)
+        rng = np.random.default_rng(3)
+        n = 16
+        envs = NimVectorEnv(n, rules=rules)
+        envs.reset()
+        singles = [NimEnv(rules) for _ in range(n)]
+        for env in singles:
+            env.reset()
+        done = np.zeros(n, dtype=bool)
+        for _ in range(30):
+            masks = envs.action_masks()
+            random_legal = np.where(masks, rng.random(masks.shape), -1).argmax(axis=1)
+            actions = np.where(rng.random(n) < 0.1, rng.integers(0, rules.n_actions, n), random_legal)
+            obs, rewards, terminated, truncated, info = envs.step(actions)
+            for i, env in enumerate(singles):
+                if done[i]:
+                    env.reset()
+                    expected = (env.state['board'], 0, False)
+                else:
+                    move = [actions[i] // rules.max_take, actions[i] % rules.max_take + 1]
+                    state, reward, term, _, _ = env.step(move)
+                    expected = (state['board'], reward, term)
+                np.testing.assert_array_equal(obs['board'][i], expected[0])
+                assert obs['on_move'][i] == env.state['on_move']
+                assert rewards[i] == expected[1]
+                assert terminated[i] == expected[2]
+            done = terminated
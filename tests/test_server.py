@@ -0,0 +1,120 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from gym_nim.envs import NimEnv
+from gym_nim.server import FLAG_ERROR, NimClient, NimServer
+
+
+def run_with_server(tmp_path, scenario):
+    """Run ``scenario(client)`` against a server on a temporary Unix socket."""
+    path = str(tmp_path / 'nim.sock')
+
+    async def main():
+        server = await NimServer().start_unix(path)
+        client = await NimClient.open_unix(path)
+        try:
+            return await scenario(client)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+class TestNimServer:
+    """Test suite for the asyncio game server and client stubs."""
+
+    def test_reset_and_step(self, tmp_path):
+        """Test a reset and a legal move through the socket."""
+        async def scenario(client):
+            game = client.game(7)
+            state, info = await game.reset()
+            np.testing.assert_array_equal(state['board'], [7, 5, 3])
+            assert state['on_move'] == 1
+
+            state, reward, terminated, truncated, info = await game.step([0, 2])
+            np.testing.assert_array_equal(state['board'], [5, 5, 3])
+            assert state['on_move'] == 2
+            assert reward == 0
+            assert not terminated
+
+        run_with_server(tmp_path, scenario)
+
+    def test_illegal_move(self, tmp_path):
+        """Test that illegal moves keep the -2 reward and end the game."""
+        async def scenario(client):
+            await client.reset(1)
+            return await client.step(1, [2, 4])
+
+        state, reward, terminated, truncated, info = run_with_server(tmp_path, scenario)
+        assert reward == -2
+        assert terminated
+        np.testing.assert_array_equal(state['board'], [7, 5, 3])
+
+    def test_unknown_game(self, tmp_path):
+        """Test that stepping a game that was never reset raises."""
+        async def scenario(client):
+            with pytest.raises(ValueError, match="Unknown game"):
+                await client.step(99, [0, 1])
+
+        run_with_server(tmp_path, scenario)
+
+    def test_closed_game(self, tmp_path):
+        """Test that a closed game can no longer be stepped."""
+        async def scenario(client):
+            game = client.game(3)
+            await game.reset()
+            await game.close()
+            with pytest.raises(ValueError, match="Unknown game"):
+                await game.step([0, 1])
+
+        run_with_server(tmp_path, scenario)
+
+    def test_unknown_op(self, tmp_path):
+        """Test that an unknown op is answered with an error and keeps the game."""
+        async def scenario(client):
+            await client.reset(5)
+            response = await client._request(9, 5)
+            state, reward, terminated, truncated, info = await client.step(5, [0, 2])
+            return response, state
+
+        response, state = run_with_server(tmp_path, scenario)
+        assert response[-1] & FLAG_ERROR
+        np.testing.assert_array_equal(state['board'], [5, 5, 3])
+
+    def test_illegal_move_is_silent(self, tmp_path, capsys):
+        """Test that illegal remote moves print nothing on the server."""
+        async def scenario(client):
+            await client.reset(1)
+            await client.step(1, [2, 4])
+
+        run_with_server(tmp_path, scenario)
+        assert capsys.readouterr().out == ''
+
+    def test_concurrent_games_match_local_env(self, tmp_path):
+        """Test many pipelined games against local reference envs."""
+        moves = [[0, 3], [1, 3], [2, 2], [0, 3], [1, 2], [2, 1], [0, 1]]
+
+        async def play(client, game_id):
+            game = client.game(game_id)
+            await game.reset()
+            results = []
+            for move in moves:
+                state, reward, terminated, truncated, info = await game.step(move)
+                results.append((state['board'].tolist(), state['on_move'], reward, terminated))
+            return results
+
+        async def scenario(client):
+            return await asyncio.gather(*(play(client, i) for i in range(200)))
+
+        all_results = run_with_server(tmp_path, scenario)
+
+        env = NimEnv()
+        env.reset()
+        expected = []
+        for move in moves:
+            state, reward, terminated, truncated, info = env.step(move)
+            expected.append((state['board'].tolist(), state['on_move'], reward, terminated))
+        assert all(results == expected for results in all_results)
@@ -0,0 +1,85 @@
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from gym_nim.envs import NimEnv
+from gym_nim.solver import NimSolver
+
+
+@lru_cache(maxsize=None)
+def brute_force_wins(board):
+    """Reference: does the player to move on ``board`` win (last piece loses)?"""
+    if sum(board) == 0:
+        return True
+    for pile, size in enumerate(board):
+        for count in range(1, min(3, size) + 1):
+            child = board[:pile] + (size - count,) + board[pile + 1:]
+            if not brute_force_wins(child):
+                return True
+    return False
+
+
+class TestNimSolver:
+    """Test suite for the exact retrograde solver."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.solver = NimSolver()
+
+    def test_matches_brute_force(self):
+        """Test every position against a recursive reference search."""
+        for board in self.solver.boards:
+            assert self.solver.wins(board) == brute_force_wins(tuple(int(b) for b in board))
+
+    def test_single_pile_pattern(self):
+        """Test the known single-pile pattern: lost exactly when n % 4 == 1."""
+        for n in range(1, 8):
+            assert self.solver.wins([n, 0, 0]) == (n % 4 != 1)
+
+    def test_winning_moves_lead_to_lost_positions(self):
+        """Test that every winning move leaves the opponent lost."""
+        for move in self.solver.winning_moves([7, 5, 3]):
+            board = [7, 5, 3]
+            board[move[0]] -= move[1]
+            assert not self.solver.wins(board)
+
+    def test_best_move_wins_against_env(self):
+        """Test that solver self-play from a won position ends with the loser taking the last piece."""
+        env = NimEnv()
+        env.reset()
+        env.set_board([2, 1, 1])
+        assert self.solver.wins([2, 1, 1])
+        first = env.state['on_move']
+        while True:
+            mover = env.state['on_move']
+            state, reward, terminated, truncated, info = env.step(self.solver.best_move(env.state['board']))
+            if terminated:
+                break
+        assert reward == -1
+        assert mover != first
+
+    def test_depth(self):
+        """Test depth-to-end for trivial positions."""
+        assert self.solver.depth_to_end([0, 0, 0]) == 0
+        assert self.solver.depth_to_end([1, 0, 0]) == 1
+        assert self.solver.depth_to_end([2, 0, 0]) == 2
+
+    def test_no_move_on_empty_board(self):
+        """Test that the empty board has no best move."""
+        assert self.solver.best_move([0, 0, 0]) is None
+
+    @pytest.mark.parametrize('max_take', [1, 2, 4])
+    def test_other_move_limits(self, max_take):
+        """Test solving with a different maximum take per move."""
+        solver = NimSolver(n_piles=2, max_pile=5, max_take=max_take)
+        for n in range(1, 6):
+            assert solver.wins([n, 0]) == (n % (max_take + 1) != 1)
+        assert solver.legal.shape == (36, 2 * max_take)
+        np.testing.assert_array_equal(solver.legal[0], False)
+
+    def test_grundy(self):
+        """Test Grundy values against pile % 4 XOR."""
+        solver = NimSolver()
+        assert solver.grundy[solver.index([7, 5, 3])] == 3 ^ 1 ^ 3
+        assert solver.grundy[solver.index([4, 4, 0])] == 0
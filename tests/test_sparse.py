@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from gym_nim.sparse import SparseStateIndex, board_key, board_keys
+
+
+class TestBoardKey:
+    """Test suite for canonical board keys."""
+
+    def test_pile_order(self):
+        """Test that permuted boards share a key and players do not."""
+        assert board_key([250, 3, 90]) == board_key([3, 90, 250])
+        assert board_key([7, 5, 3], 1) != board_key([7, 5, 3], 2)
+        assert board_key([7, 5, 3], 2) == board_key([7, 5, 3]) * 2 + 1
+
+    def test_fits_64_bits(self):
+        """Test that huge boards are folded into 64-bit keys."""
+        key = board_key([300] * 40)
+        assert 0 <= key < 2 ** 64
+        assert key != board_key([300] * 39 + [299])
+
+    def test_vectorized(self):
+        """Test that board_keys matches board_key, with and without players."""
+        rng = np.random.default_rng(0)
+        for boards in (rng.integers(0, 8, (50, 3)), rng.integers(0, 300, (20, 40))):
+            np.testing.assert_array_equal(board_keys(boards), [board_key(board) for board in boards])
+            on_move = rng.integers(1, 3, len(boards))
+            np.testing.assert_array_equal(board_keys(boards, on_move),
+                                          [board_key(b, p) for b, p in zip(boards, on_move)])
+
+
+class TestSparseStateIndex:
+    """Test suite for the open-addressing state index."""
+
+    def test_insert_get_remove(self):
+        """Test the index against a dict through inserts and removals."""
+        rng = np.random.default_rng(0)
+        keys = [int(k) for k in rng.integers(0, 2 ** 63, 1200, dtype=np.uint64)]
+        index = SparseStateIndex(1000)
+        rows = {}
+        for key in keys[:800]:
+            rows[key] = index.insert(key)[0]
+        for key in keys[:300]:
+            assert index.remove(key) == rows.pop(key)
+        for key in keys[800:]:
+            row, evicted = index.insert(key)
+            assert evicted is None
+            rows[key] = row
+        assert len(index) == len(rows) == 900
+        assert len(set(rows.values())) == 900
+        assert all(index.get(key) == row for key, row in rows.items())
+        assert index.get(keys[0]) == -1 and keys[0] not in index
+        assert index.remove(keys[0]) == -1
+
+    def test_lookup(self):
+        """Test batched lookup of present and absent keys."""
+        index = SparseStateIndex(64)
+        rows = [index.insert(key)[0] for key in range(0, 200, 4)]
+        found = index.lookup(np.arange(0, 200, 4, dtype=np.uint64))
+        np.testing.assert_array_equal(found, rows)
+        assert (index.lookup(np.arange(1, 200, 4, dtype=np.uint64)) == -1).all()
+
+    def test_insert_many(self):
+        """Test that insert_many reports which rows are new."""
+        index = SparseStateIndex(16)
+        index.insert(5)
+        rows, new = index.insert_many([5, 6, 6, 7])
+        np.testing.assert_array_equal(new, [False, True, False, True])
+        assert rows[1] == rows[2] and len(index) == 3
+
+    def test_bounded(self):
+        """Test that a full index evicts instead of growing."""
+        index = SparseStateIndex(100)
+        nbytes = index.nbytes
+        evicted = [index.insert(key)[1] for key in range(1000)]
+        assert len(index) == 100 and index.evictions == 900
+        assert index.nbytes == nbytes
+        assert sorted(key for key in evicted if key is not None) == list(range(900))
+
+    def test_clock_spares_recent(self):
+        """Test that keys used since the last sweep survive one eviction round."""
+        index = SparseStateIndex(4)
+        for key in range(4):
+            index.insert(key)
+        index.get(0)
+        assert index.insert(10)[1] == 1
+        assert 0 in index
+
+    def test_full_without_eviction(self):
+        """Test that evict=False refuses new keys once full."""
+        index = SparseStateIndex(2, evict=False)
+        index.insert(1)
+        index.insert(2)
+        assert index.insert(1)[1] is None
+        with pytest.raises(OverflowError):
+            index.insert(3)
@@ -0,0 +1,118 @@
+import numpy as np
+
+from gym_nim.encoding import index_to_action
+from gym_nim.envs import NimEnv, NimVectorEnv
+
+
+class TestNimVectorEnv:
+    """Test suite for the NumPy-batched Nim environment."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.envs = NimVectorEnv(4)
+
+    def test_reset(self):
+        """Test that every game starts from [7, 5, 3] with player 1."""
+        obs, info = self.envs.reset(seed=0)
+        assert obs['board'].shape == (4, 3)
+        np.testing.assert_array_equal(obs['board'], [[7, 5, 3]] * 4)
+        np.testing.assert_array_equal(obs['on_move'], 1)
+        assert isinstance(info, dict)
+
+    def test_spaces(self):
+        """Test batched spaces derived from the single env."""
+        assert self.envs.single_action_space.n == 9
+        assert self.envs.action_space.shape == (4,)
+        assert self.envs.observation_space['board'].shape == (4, 3)
+
+    def test_step_index_and_move_actions(self):
+        """Test that index actions and [pile, count] actions agree."""
+        self.envs.reset()
+        obs_a, *_ = self.envs.step(np.array([0, 4, 8, 2]))
+        other = NimVectorEnv(4)
+        other.reset()
+        obs_b, *_ = other.step(np.array([[0, 1], [1, 2], [2, 3], [0, 3]]))
+        np.testing.assert_array_equal(obs_a['board'], obs_b['board'])
+        np.testing.assert_array_equal(obs_a['on_move'], [2, 2, 2, 2])
+
+    def test_illegal_moves(self):
+        """Test -2 rewards, unchanged boards and no player switch on illegal moves."""
+        self.envs.reset()
+        obs, rewards, terminated, truncated, info = self.envs.step(
+            np.array([[3, 1], [0, 0], [2, 4], [-1, 1]])
+        )
+        np.testing.assert_array_equal(rewards, [-2, -2, -2, -2])
+        assert terminated.all()
+        assert not truncated.any()
+        np.testing.assert_array_equal(obs['board'], [[7, 5, 3]] * 4)
+        np.testing.assert_array_equal(obs['on_move'], 1)
+
+    def test_last_piece_and_autoreset(self):
+        """Test the losing reward, no switch on the final move, and next-step autoreset."""
+        self.envs.reset()
+        self.envs.boards[:] = [1, 0, 0]
+        obs, rewards, terminated, truncated, info = self.envs.step(np.zeros(4, dtype=int))
+        np.testing.assert_array_equal(rewards, -1)
+        assert terminated.all()
+        np.testing.assert_array_equal(obs['on_move'], 1)
+        np.testing.assert_array_equal(obs['board'], 0)
+
+        obs, rewards, terminated, truncated, info = self.envs.step(np.zeros(4, dtype=int))
+        np.testing.assert_array_equal(obs['board'], [[7, 5, 3]] * 4)
+        np.testing.assert_array_equal(rewards, 0)
+        assert not terminated.any()
+
+    def test_matches_single_env(self):
+        """Test random legal-and-illegal trajectories against NimEnv."""
+        rng = np.random.default_rng(1)
+        n = 16
+        envs = NimVectorEnv(n)
+        envs.reset()
+        singles = [NimEnv() for _ in range(n)]
+        for env in singles:
+            env.reset()
+        done = np.zeros(n, dtype=bool)
+        for _ in range(40):
+            actions = rng.integers(0, 9, size=n)
+            obs, rewards, terminated, truncated, info = envs.step(actions)
+            for i, env in enumerate(singles):
+                if done[i]:
+                    env.reset()
+                    expected = (env.state['board'], env.state['on_move'], 0, False)
+                else:
+                    state, reward, term, _, _ = env.step(index_to_action(actions[i]))
+                    expected = (state['board'], state['on_move'], reward, term)
+                np.testing.assert_array_equal(obs['board'][i], expected[0])
+                assert obs['on_move'][i] == expected[1]
+                assert rewards[i] == expected[2]
+                assert terminated[i] == expected[3]
+            done = terminated
+
+    def test_action_masks(self):
+        """Test legal-action masks for a partially empty board."""
+        self.envs.reset()
+        self.envs.boards[0] = [1, 0, 2]
+        masks = self.envs.action_masks()
+        assert masks.shape == (4, 9)
+        np.testing.assert_array_equal(np.flatnonzero(masks[0]), [0, 6, 7])
+        assert masks[1].all()
+
+    def test_reset_with_boards_option(self):
+        """Test that per-game start boards are used on reset and autoreset."""
+        starts = np.array([[1, 0, 0], [0, 2, 0], [7, 5, 3], [0, 0, 3]])
+        obs, info = self.envs.reset(options={'board': starts})
+        np.testing.assert_array_equal(obs['board'], starts)
+        obs, rewards, terminated, truncated, info = self.envs.step(np.zeros(4, dtype=int))
+        assert terminated[0] and rewards[0] == -1
+        obs, rewards, terminated, truncated, info = self.envs.step(np.zeros(4, dtype=int))
+        np.testing.assert_array_equal(obs['board'][0], [1, 0, 0])
+
+    def test_reset_with_on_move_option(self):
+        """Test that per-game first players are used on reset and autoreset."""
+        obs, info = self.envs.reset(options={'board': [1, 0, 0], 'on_move': [1, 2, 2, 1]})
+        np.testing.assert_array_equal(obs['on_move'], [1, 2, 2, 1])
+        self.envs.step(np.zeros(4, dtype=int))
+        obs, *_ = self.envs.step(np.zeros(4, dtype=int))
+        np.testing.assert_array_equal(obs['on_move'], [1, 2, 2, 1])
+        obs, info = self.envs.reset(options={'board': [1, 0, 0]})
+        assert (obs['on_move'] == 1).all()
@@ -0,0 +1,82 @@
+import gymnasium as gym
+import numpy as np
+
+import gym_nim
+from gym_nim.envs import NimVectorEnv
+from gym_nim.wrappers import ActionMasking, VectorActionMasking
+
+
+class TestActionMasking:
+    """Test suite for the single-env action masking wrapper."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.env = ActionMasking(gym.make('nim-v0'))
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        self.env.close()
+
+    def test_mask_in_info(self):
+        """Test that reset and step report the legal-action mask."""
+        state, info = self.env.reset()
+        assert info['action_mask'].dtype == np.int8
+        assert info['action_mask'].all()
+        state, reward, terminated, truncated, info = self.env.step([2, 3])
+        np.testing.assert_array_equal(info['action_mask'][6:], [0, 0, 0])
+
+    def test_sample_only_legal(self):
+        """Test that random play with sample() never makes an illegal move."""
+        self.env.action_space.seed(0)
+        for _ in range(50):
+            self.env.reset()
+            terminated = False
+            while not terminated:
+                state, reward, terminated, truncated, info = self.env.step(self.env.sample())
+                assert reward != -2
+
+    def test_sample_without_moves(self):
+        """Test that sample() returns None when no move is legal."""
+        self.env.reset()
+        self.env.unwrapped.set_board([0, 0, 0])
+        assert self.env.sample() is None
+
+    def test_illegal_move_kept_without_remap(self):
+        """Test that opting out of remapping keeps the -2 reward."""
+        self.env.reset()
+        self.env.unwrapped.set_board([0, 5, 3])
+        state, reward, terminated, truncated, info = self.env.step(0)
+        assert reward == -2
+        assert terminated
+
+    def test_remap_invalid(self):
+        """Test that remapping turns illegal actions into legal ones."""
+        env = ActionMasking(gym.make('nim-v0'), remap_invalid=True)
+        env.reset()
+        env.unwrapped.set_board([0, 1, 0])
+        state, reward, terminated, truncated, info = env.step([0, 2])
+        assert info['action_remapped']
+        assert reward == -1  # the only legal move takes the last piece
+        env.close()
+
+
+class TestVectorActionMasking:
+    """Test suite for the vectorized action masking wrapper."""
+
+    def test_sample_only_legal(self):
+        """Test that vectorized masked sampling never picks illegal actions."""
+        envs = VectorActionMasking(NimVectorEnv(64))
+        obs, info = envs.reset(seed=0)
+        assert info['action_mask'].shape == (64, 9)
+        for _ in range(30):
+            obs, rewards, terminated, truncated, info = envs.step(envs.sample())
+            assert (rewards != -2).all()
+
+    def test_remap_invalid(self):
+        """Test that illegal actions are remapped per game."""
+        envs = VectorActionMasking(NimVectorEnv(3), remap_invalid=True)
+        envs.reset(seed=0)
+        envs.unwrapped.boards[:] = [[0, 1, 0], [7, 5, 3], [0, 1, 0]]
+        obs, rewards, terminated, truncated, info = envs.step(np.array([[0, 1], [0, 1], [1, 1]]))
+        np.testing.assert_array_equal(info['action_remapped'], [True, False, False])
+        np.testing.assert_array_equal(rewards, [-1, 0, -1])